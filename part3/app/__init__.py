@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 
+import os
 from flask import Flask
 from flask_restx import Api
 from flask_sqlalchemy import SQLAlchemy
@@ -9,23 +10,26 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from config import config
 from app.models.BaseModel import Base
+from app.persistence.routing import RoutingSession
 
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={'class_': RoutingSession})
 bcrypt = Bcrypt()
 jwt = JWTManager()
 
-def create_app(config_name="default"):
+def create_app(config_name=None):
     app = Flask(__name__)
     api = Api(app, version='1.0', title='HBnB API', description='HBnB Application API', doc='/api/v1/')
 
-    app.config.from_object(config[config_name])
+    app.config.from_object(config[config_name or os.getenv('HBNB_CONFIG', 'default')])
     
     # Enable CORS for frontend integration
     CORS(app, origins=['http://127.0.0.1:5500', 'http://localhost:5500', 'http://127.0.0.1:8000', 'http://localhost:8000', 'file://'], supports_credentials=True)
     
-    # Database configuration
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///hbnb.db'
+    # Database configuration: pool sizing comes from the config profile
+    from app.persistence.engine import engine_options, install_sqlite_pragmas
+    from app.persistence.routing import create_read_replicas
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
     
     # JWT Configuration
     app.config['JWT_SECRET_KEY'] = 'your-secret-key-change-this-in-production'
@@ -37,6 +41,15 @@ def create_app(config_name="default"):
     
     # Create database tables
     with app.app_context():
+        replicas = create_read_replicas(app, db.engine)
+        engines = [db.engine] + (replicas.engines if replicas else [])
+        for engine in engines:
+            install_sqlite_pragmas(engine, app.config.get('SQLITE_PRAGMAS'))
+
+        # Per-request query counts, Server-Timing and query budgets
+        from app.services.query_stats import init_query_stats
+        init_query_stats(app, engines)
+
         # Import all models to ensure they are registered
         from app.models.user import User
         from app.models.place import Place
@@ -44,12 +57,39 @@ def create_app(config_name="default"):
         from app.models.amenity import Amenity
         
         db.create_all()
+
+        # Read replicas; the SQLite stand-in copies the schema over up front
+        if replicas and replicas.replicable:
+            replicas.sync()
+        app.extensions['hbnb_replicas'] = replicas
+
+        # Worker pool for password hashing, kept off the request threads
+        from app.utils.password_hasher import create_password_hasher
+        app.extensions['hbnb_password_hasher'] = create_password_hasher(app.config)
+
+        # Verified access tokens and the token blocklist
+        from app.services.identity_cache import IdentityCache, create_revocation_store
+        app.extensions['hbnb_identity_cache'] = IdentityCache(
+            app.config.get('IDENTITY_CACHE_TTL_SECONDS', 60), app.config.get('CACHE_MAX_SIZE', 10000),
+            create_revocation_store(app.config)
+        )
+
+        # Entity cache consulted by the facade for single-entity reads
+        from app.services.cache import EntityCache, create_cache_backend
+        app.extensions['hbnb_cache'] = EntityCache(create_cache_backend(app.config))
+
+        # Build the nearest-place index up front so the first query is fast
+        from app.persistence.place_index import PlaceIndex
+        from app.persistence.place_repository import PlaceRepository
+        app.extensions['hbnb_place_index'] = PlaceIndex(app.config.get('PLACE_INDEX_REFRESH_SECONDS'))
+        PlaceRepository().refresh_index()
     
     # Import and register API namespaces
     from app.api.v1.users import api as users_api
     from app.api.v1.amenities import api as amenities_api
     from app.api.v1.places import api as places_api
     from app.api.v1.reviews import api as reviews_api
+    from app.api.v1.export import api as export_api
     import importlib.util
     spec = importlib.util.spec_from_file_location("auth_api", "app/api/v1/auth-login-protection.py")
     auth_module = importlib.util.module_from_spec(spec)
@@ -62,5 +102,18 @@ def create_app(config_name="default"):
     api.add_namespace(places_api, path='/api/v1/places')
     api.add_namespace(reviews_api, path='/api/v1/reviews')
     api.add_namespace(auth_api, path='/api/v1/auth')
+    api.add_namespace(export_api, path='/api/v1/export')
+
+    # Register maintenance CLI commands
+    from app.cli import hbnb_cli
+    app.cli.add_command(hbnb_cli)
+
+    # Request, repository, pool and cache metrics at /metrics
+    from app.services.metrics import init_metrics
+    init_metrics(app, api)
+
+    # Opt-in sampling profiler around the whole WSGI app
+    from app.services.profiler import init_profiler
+    init_profiler(app)
 
     return app
@@ -3,6 +3,9 @@
 from flask import request, jsonify
 from flask_restx import Namespace, Resource, fields
 from app.services.facade import HBnBFacade
+from app.api.v1.conditional import collection_conditional, entity_conditional
+from app.api.v1.bulk import BulkTooLarge, bulk_response, read_bulk_items
+from app.api.v1.identity import identity_required, get_current_identity
 
 # Create namespace
 api = Namespace('amenities', description='Amenity operations')
@@ -18,6 +21,11 @@ amenity_model = api.model('Amenity', {
     'updated_at': fields.DateTime(readonly=True, description='Last update timestamp')
 })
 
+amenity_page_model = api.model('AmenityPage', {
+    'items': fields.List(fields.Nested(amenity_model), description='Amenities on this page'),
+    'next_cursor': fields.String(description='Cursor of the next page, null on the last page')
+})
+
 amenity_create_model = api.model('AmenityCreate', {
     'name': fields.String(required=True, description='Amenity name')
 })
@@ -28,13 +36,19 @@ amenity_update_model = api.model('AmenityUpdate', {
 
 @api.route('/')
 class AmenityList(Resource):
-    @api.doc('list_amenities')
-    @api.marshal_list_with(amenity_model)
+    @api.doc('list_amenities', params={'limit': 'Page size', 'cursor': 'Cursor returned by the previous page'})
+    @api.response(200, 'Success', amenity_page_model)
     def get(self):
-        """List all amenities"""
+        """List amenities one page at a time"""
         try:
-            amenities = facade.get_all_amenities()
-            return amenities, 200
+            # Marshalled by hand so a 304 skips serialization entirely
+            not_modified, headers = collection_conditional(facade.get_amenities_fingerprint())
+            if not_modified:
+                return not_modified
+            amenities, next_cursor = facade.get_amenities_page(request.args.get('limit'), request.args.get('cursor'))
+            return api.marshal({'items': amenities, 'next_cursor': next_cursor}, amenity_page_model), 200, headers
+        except ValueError as e:
+            api.abort(400, str(e))
         except Exception as e:
             api.abort(500, f"Internal server error: {str(e)}")
 
@@ -59,18 +73,39 @@ class AmenityList(Resource):
         except Exception as e:
             api.abort(500, f"Internal server error: {str(e)}")
 
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    @api.doc('bulk_create_amenities')
+    @api.expect([amenity_create_model])
+    @identity_required()
+    def post(self):
+        """Create many amenities at once, with a result per item (admin only)"""
+        if not get_current_identity().get('is_admin'):
+            api.abort(403, "Admin privileges required")
+        try:
+            return bulk_response(facade.bulk_create_amenities(read_bulk_items()))
+        except BulkTooLarge as e:
+            api.abort(413, str(e))
+        except ValueError as e:
+            api.abort(400, str(e))
+        except Exception as e:
+            api.abort(500, f"Internal server error: {str(e)}")
+
 @api.route('/<string:amenity_id>')
 @api.param('amenity_id', 'The amenity identifier')
 class AmenityResource(Resource):
     @api.doc('get_amenity')
-    @api.marshal_with(amenity_model)
+    @api.response(200, 'Success', amenity_model)
     def get(self, amenity_id):
         """Get an amenity by ID"""
         try:
             amenity = facade.get_amenity(amenity_id)
             if not amenity:
                 api.abort(404, "Amenity not found")
-            return amenity, 200
+            not_modified, headers = entity_conditional(amenity)
+            if not_modified:
+                return not_modified
+            return api.marshal(amenity, amenity_model), 200, headers
         except Exception as e:
             if "not found" in str(e).lower():
                 api.abort(404, str(e))
@@ -2,8 +2,11 @@
 
 from flask import request
 from flask_restx import Namespace, Resource
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token
+from app.api.v1.identity import identity_required, get_current_identity
+from app.services.identity_cache import get_identity_cache
 from app.services.facade import HBnBFacade
+from app.utils.password_hasher import PasswordHasherBusy
 
 api = Namespace('auth')
 facade = HBnBFacade()
@@ -18,15 +21,28 @@ class Login(Resource):
             return {'error': 'Email and password are required'}, 400
 
         user = facade.get_user_by_email(email)
-        if not user or not user.verify_password(password):
-            return {'error': 'Invalid credentials'}, 401
+        try:
+            if not user or not user.verify_password(password):
+                return {'error': 'Invalid credentials'}, 401
+        except PasswordHasherBusy as error:
+            return {'error': str(error)}, 503, {'Retry-After': str(error.retry_after)}
+        facade.upgrade_password_hash(user, password)
 
-        token = create_access_token(identity={'id': str(user.id), 'is_admin': bool(user.is_admin)})
+        token = create_access_token(identity=str(user.id), additional_claims={'is_admin': bool(user.is_admin)})
         return {'access_token': token}, 200
 
 @api.route('/protected')
 class ProtectedResource(Resource):
-    @jwt_required()
+    @identity_required()
     def get(self):
-        current_identity = get_jwt_identity()
+        current_identity = get_current_identity()
         return {'message': f'Hello, user {current_identity["id"]}'}, 200
+
+@api.route('/logout')
+class Logout(Resource):
+    @identity_required()
+    def post(self):
+        """Revoke the access token used for this request"""
+        current_identity = get_current_identity()
+        get_identity_cache().revoke(current_identity['jti'], current_identity['exp'])
+        return {'message': 'Successfully logged out'}, 200
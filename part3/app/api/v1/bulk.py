@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""
+Request parsing and per-item responses shared by the bulk create endpoints
+"""
+
+from flask import current_app, request
+
+
+class BulkTooLarge(ValueError):
+    """Raised when a bulk request has more items than BULK_MAX_ITEMS"""
+
+
+def read_bulk_items():
+    """Return the JSON array of items posted to a bulk endpoint"""
+    items = request.get_json(silent=True)
+    if isinstance(items, dict):
+        items = items.get('items')
+    if not isinstance(items, list) or not items:
+        raise ValueError('Expected a non-empty JSON array of items')
+    max_items = current_app.config.get('BULK_MAX_ITEMS', 5000)
+    if len(items) > max_items:
+        raise BulkTooLarge(f'At most {max_items} items can be created at once')
+    return items
+
+
+def bulk_response(results):
+    """Per-item results: 201 with the new id, or 400 with the error
+
+    The response is 201 when every item was created and 207 otherwise.
+    """
+    items = []
+    for index, (instance, error) in enumerate(results):
+        if error is None:
+            items.append({'index': index, 'status': 201, 'id': instance.id})
+        else:
+            items.append({'index': index, 'status': 400, 'error': error})
+    created = sum(1 for item in items if item['status'] == 201)
+    body = {'created': created, 'failed': len(items) - created, 'items': items}
+    return body, 201 if created == len(items) else 207
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+ETag and Last-Modified validators for conditional GET requests
+"""
+
+import hashlib
+from flask import Response, request
+from werkzeug.http import http_date, quote_etag
+
+
+def _digest(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _timestamp(value):
+    return value.isoformat() if value is not None else ''
+
+
+def evaluate(tag, last_modified=None, weak=False, honor_modified_since=True):
+    """Check the request's validators against the current representation
+
+    Returns (not_modified, headers): a bodyless 304 response when the
+    client's copy is still current, else None, and the validator headers to
+    send with the full response. If-None-Match takes precedence over
+    If-Modified-Since, which only has one-second resolution.
+    """
+    headers = {'ETag': quote_etag(tag, weak), 'Cache-Control': 'no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+
+    if request.if_none_match:
+        current = request.if_none_match.contains_weak(tag)
+    elif honor_modified_since and last_modified is not None and request.if_modified_since:
+        current = last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    else:
+        current = False
+    return (Response(status=304, headers=headers) if current else None), headers
+
+
+def entity_conditional(instance, *related):
+    """Strong validators of one entity, derived from its id and updated_at
+
+    `related` are extra version markers (e.g. collection fingerprints) for
+    representations that embed other rows.
+    """
+    tag = _digest(instance.id, _timestamp(instance.updated_at), *related)
+    return evaluate(tag, instance.updated_at, honor_modified_since=not related)
+
+
+def embedded_versions(instances):
+    """(id, updated_at) markers of embedded rows for entity_conditional"""
+    return [f'{instance.id}@{_timestamp(instance.updated_at)}' for instance in instances if instance is not None]
+
+
+def combine_fingerprints(*fingerprints):
+    """One (count, latest updated_at) fingerprint covering several collections"""
+    counts = '/'.join(str(count) for count, _ in fingerprints)
+    latest = max((latest for _, latest in fingerprints if latest is not None), default=None)
+    return counts, latest
+
+
+def collection_conditional(fingerprint):
+    """Weak validators of a collection from its (count, max updated_at) fingerprint
+
+    The query string is part of the tag, so each page, filter and cursor
+    has its own. If-Modified-Since is not honoured: deleting a row lowers
+    the count without moving max(updated_at), which only the ETag catches.
+    """
+    count, latest = fingerprint
+    tag = _digest(count, _timestamp(latest), request.path, request.query_string.decode())
+    return evaluate(tag, latest, weak=True, honor_modified_since=False)
@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+
+from flask import Response, request, stream_with_context
+from flask_restx import Namespace, Resource
+from app.services.facade import HBnBFacade
+from app.services.export import ndjson_chunks
+from app.api.v1.identity import identity_required, get_current_identity
+
+api = Namespace('export', description='Streaming exports of whole tables')
+facade = HBnBFacade()
+
+@api.route('/<string:entity>')
+@api.param('entity', 'users, places, amenities, reviews or place_amenities')
+class Export(Resource):
+    @api.doc(params={'format': 'Output format, only ndjson is supported'})
+    @identity_required()
+    def get(self, entity):
+        """Stream every row of an entity as NDJSON (admin only)
+
+        Rows are read in batches from a server-side cursor and written out
+        as they arrive, so memory stays flat. Password hashes are never
+        exported over HTTP; use `flask hbnb export --include-secrets`.
+        """
+        try:
+            if not get_current_identity().get('is_admin', False):
+                return {'error': 'Admin privileges required'}, 403
+            if request.args.get('format', 'ndjson') != 'ndjson':
+                return {'error': 'format must be ndjson'}, 400
+            rows = facade.export_rows(entity)
+            return Response(stream_with_context(ndjson_chunks(rows)), mimetype='application/x-ndjson',
+                            headers={'Content-Disposition': f'attachment; filename={entity}.ndjson'})
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        except Exception as error:
+            return {'error': f'Internal server error: {str(error)}'}, 500
@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""
+Access-token authentication backed by the verified identity cache
+"""
+
+from functools import wraps
+import jwt
+from flask import g, request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from app.services.identity_cache import TokenRevoked, UnknownIdentity, get_identity_cache
+
+
+def identity_required():
+    """Require a valid bearer token, like flask_jwt_extended's jwt_required
+
+    The token is resolved through the identity cache, so repeated requests
+    with the same token skip signature verification and the user lookup.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            header = request.headers.get('Authorization', '')
+            scheme, _, token = header.partition(' ')
+            if scheme != 'Bearer' or not token:
+                return {'error': 'Missing Authorization header'}, 401
+            try:
+                g.hbnb_identity = get_identity_cache().resolve(token.strip())
+            except jwt.ExpiredSignatureError:
+                return {'error': 'Token has expired'}, 401
+            except TokenRevoked:
+                return {'error': 'Token has been revoked'}, 401
+            except UnknownIdentity:
+                return {'error': 'User not found'}, 401
+            except (jwt.InvalidTokenError, JWTExtendedException):
+                return {'error': 'Invalid token'}, 401
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_current_identity():
+    """Identity of the authenticated user: id, is_admin, names, jti and exp"""
+    return g.hbnb_identity
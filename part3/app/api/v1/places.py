@@ -3,7 +3,11 @@
 from flask import request
 from flask_restx import Namespace, Resource
 from app.services.facade import HBnBFacade
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.v1.reviews import review_to_dict
+from app.api.v1.conditional import (collection_conditional, combine_fingerprints, embedded_versions,
+                                    entity_conditional)
+from app.api.v1.identity import identity_required, get_current_identity
+from app.api.v1.bulk import BulkTooLarge, bulk_response, read_bulk_items
 
 api = Namespace('places')
 facade = HBnBFacade()
@@ -16,22 +20,106 @@ def place_to_dict(place):
         'price': getattr(place, 'price', None),
         'latitude': getattr(place, 'latitude', None),
         'longitude': getattr(place, 'longitude', None),
-        'owner_id': getattr(getattr(place, 'owner', None), 'id', None) or getattr(place, 'owner_id', None),
+        # owner_id is a column; going through place.owner lazy-loads a user per place
+        'owner_id': getattr(place, 'owner_id', None) or getattr(getattr(place, 'owner', None), 'id', None),
+        'rating_average': round(getattr(place, 'rating_average', None) or 0, 2),
+        'review_count': getattr(place, 'review_count', None) or 0,
+    }
+
+DEFAULT_RADIUS_KM = 10.0
+
+def parse_coordinates(value, name, count):
+    """Parse a comma-separated list of `count` floats from a query parameter"""
+    try:
+        numbers = [float(part) for part in value.split(',')]
+    except ValueError:
+        raise ValueError(f'{name} must be {count} comma-separated numbers')
+    if len(numbers) != count:
+        raise ValueError(f'{name} must be {count} comma-separated numbers')
+    for latitude in numbers[0::2]:
+        if not -90 <= latitude <= 90:
+            raise ValueError(f'{name} has an invalid latitude')
+    for longitude in numbers[1::2]:
+        if not -180 <= longitude <= 180:
+            raise ValueError(f'{name} has an invalid longitude')
+    return tuple(numbers)
+
+def search_nearest_places(args):
+    """Run a ?near=lat,lon&nearest=k search"""
+    if 'near' not in args:
+        raise ValueError('nearest requires near=lat,lon')
+    latitude, longitude = parse_coordinates(args['near'], 'near', 2)
+    try:
+        k = int(args['nearest'])
+    except ValueError:
+        raise ValueError('nearest must be a positive integer')
+    if k < 1:
+        raise ValueError('nearest must be a positive integer')
+    results = facade.get_nearest_places(latitude, longitude, k)
+    return [dict(place_to_dict(place), distance_km=round(distance, 3)) for place, distance in results]
+
+def search_places_by_area(args):
+    """Run a ?near=lat,lon&radius_km=&bbox=min_lat,min_lon,max_lat,max_lon search"""
+    near = parse_coordinates(args['near'], 'near', 2) if 'near' in args else None
+    bbox = parse_coordinates(args['bbox'], 'bbox', 4) if 'bbox' in args else None
+    radius_km = None
+    if near is not None:
+        try:
+            radius_km = float(args.get('radius_km', DEFAULT_RADIUS_KM))
+        except ValueError:
+            raise ValueError('radius_km must be a valid number')
+        if radius_km <= 0:
+            raise ValueError('radius_km must be positive')
+    results = facade.search_places_by_area(near, radius_km, bbox, args.get('limit'))
+    return [dict(place_to_dict(place), distance_km=round(distance, 3)) for place, distance in results]
+
+def parse_search_filters(args):
+    """Read the filters of GET /api/v1/places/search"""
+    filters = {}
+    for name in ('min_price', 'max_price', 'min_rating'):
+        if args.get(name):
+            try:
+                filters[name] = float(args[name])
+            except ValueError:
+                raise ValueError(f'{name} must be a valid number')
+    if 'min_rating' in filters and not 1 <= filters['min_rating'] <= 5:
+        raise ValueError('min_rating must be between 1 and 5')
+    if args.get('amenities'):
+        filters['amenity_ids'] = [i.strip() for i in args['amenities'].split(',') if i.strip()]
+    if args.get('q'):
+        filters['text'] = args['q']
+    return filters
+
+def user_summary(user):
+    return {
+        'id': getattr(user, 'id', None),
+        'first_name': getattr(user, 'first_name', None),
+        'last_name': getattr(user, 'last_name', None),
     }
 
 @api.route('/')
 class PlaceList(Resource):
     def get(self):
         try:
-            places = facade.get_all_places()
-            return [place_to_dict(place) for place in places], 200
+            not_modified, headers = collection_conditional(facade.get_places_fingerprint())
+            if not_modified:
+                return not_modified
+            if 'nearest' in request.args:
+                return {'items': search_nearest_places(request.args), 'next_cursor': None}, 200, headers
+            if 'near' in request.args or 'bbox' in request.args:
+                return {'items': search_places_by_area(request.args), 'next_cursor': None}, 200, headers
+
+            places, next_cursor = facade.get_places_page(request.args.get('limit'), request.args.get('cursor'))
+            return {'items': [place_to_dict(place) for place in places], 'next_cursor': next_cursor}, 200, headers
+        except ValueError as error:
+            return {'error': str(error)}, 400
         except Exception as error:
             return {'error': f'Internal server error: {str(error)}'}, 500
 
-    @jwt_required()
+    @identity_required()
     def post(self):
         try:
-            current_identity = get_jwt_identity()
+            current_identity = get_current_identity()
             data = request.get_json() or {}
 
             for field in ['title', 'description', 'price', 'latitude', 'longitude']:
@@ -53,6 +141,65 @@ class PlaceList(Resource):
         except Exception as error:
             return {'error': f'Internal server error: {str(error)}'}, 500
 
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    @identity_required()
+    def post(self):
+        """Create many places at once; admins may set owner_id per item"""
+        try:
+            current_identity = get_current_identity()
+            items = read_bulk_items()
+            is_admin = bool(current_identity.get('is_admin', False))
+            for item in items:
+                if isinstance(item, dict) and not (is_admin and item.get('owner_id')):
+                    item['owner_id'] = current_identity['id']
+            return bulk_response(facade.bulk_create_places(items))
+        except BulkTooLarge as error:
+            return {'error': str(error)}, 413
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        except Exception as error:
+            return {'error': f'Internal server error: {str(error)}'}, 500
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    def get(self):
+        """Filter by price, rating, amenities and text, with facet counts"""
+        try:
+            not_modified, headers = collection_conditional(facade.get_place_search_fingerprint())
+            if not_modified:
+                return not_modified
+            places, next_cursor, facets = facade.search_places(
+                parse_search_filters(request.args), request.args.get('limit'), request.args.get('cursor')
+            )
+            result = {'items': [place_to_dict(place) for place in places], 'next_cursor': next_cursor}
+            if facets is not None:
+                result['facets'] = facets
+            return result, 200, headers
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        except Exception as error:
+            return {'error': f'Internal server error: {str(error)}'}, 500
+
+@api.route('/top-rated')
+class TopRatedPlaceList(Resource):
+    def get(self):
+        """Best rated places, read from the denormalized rating aggregates"""
+        try:
+            not_modified, headers = collection_conditional(facade.get_places_fingerprint())
+            if not_modified:
+                return not_modified
+            try:
+                min_reviews = int(request.args.get('min_reviews', 1))
+            except ValueError:
+                return {'error': 'min_reviews must be a valid integer'}, 400
+            places = facade.get_top_rated_places(request.args.get('limit'), min_reviews)
+            return {'items': [place_to_dict(place) for place in places], 'next_cursor': None}, 200, headers
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        except Exception as error:
+            return {'error': f'Internal server error: {str(error)}'}, 500
+
 @api.route('/<string:place_id>')
 class PlaceResource(Resource):
     def get(self, place_id):
@@ -60,14 +207,17 @@ class PlaceResource(Resource):
             place = facade.get_place(place_id)
             if not place:
                 return {'error': 'Place not found'}, 404
-            return place_to_dict(place), 200
+            not_modified, headers = entity_conditional(place)
+            if not_modified:
+                return not_modified
+            return place_to_dict(place), 200, headers
         except Exception as error:
             return {'error': f'Internal server error: {str(error)}'}, 500
 
-    @jwt_required()
+    @identity_required()
     def put(self, place_id):
         try:
-            current_identity = get_jwt_identity()
+            current_identity = get_current_identity()
             data = request.get_json() or {}
 
             if 'price' in data:
@@ -104,3 +254,63 @@ class PlaceResource(Resource):
             return {'error': message}, 400
         except Exception as error:
             return {'error': f'Internal server error: {str(error)}'}, 500
+
+@api.route('/<string:place_id>/reviews')
+class PlaceReviewList(Resource):
+    def get(self, place_id):
+        """One page of a place's reviews; ?embed=author adds each review's author"""
+        try:
+            if not facade.get_place(place_id):
+                return {'error': 'Place not found'}, 404
+            with_authors = request.args.get('embed') == 'author'
+            fingerprint = facade.get_reviews_fingerprint(place_id)
+            if with_authors:
+                # Author names change without touching the reviews
+                fingerprint = combine_fingerprints(fingerprint, facade.get_users_fingerprint())
+            not_modified, headers = collection_conditional(fingerprint)
+            if not_modified:
+                return not_modified
+            reviews, next_cursor = facade.get_reviews_by_place_page(
+                place_id, request.args.get('limit'), request.args.get('cursor'), with_authors=with_authors
+            )
+            items = [review_to_dict(review) for review in reviews]
+            if with_authors:
+                items = [dict(item, author=user_summary(review.user)) for item, review in zip(items, reviews)]
+            return {'items': items, 'next_cursor': next_cursor}, 200, headers
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        except Exception as error:
+            return {'error': f'Internal server error: {str(error)}'}, 500
+
+@api.route('/<string:place_id>/detail')
+class PlaceDetail(Resource):
+    def get(self, place_id):
+        """Place, owner, amenities, rating summary and first review page in one response"""
+        try:
+            place = facade.get_place_with_details(place_id)
+            if not place:
+                return {'error': 'Place not found'}, 404
+            reviews, next_cursor = facade.get_reviews_by_place_page(
+                place_id, request.args.get('limit'), with_authors=True
+            )
+            # Embedded rows change without touching the place, so the tag
+            # covers every row already loaded for the response
+            not_modified, headers = entity_conditional(
+                place, request.query_string.decode(), place.review_count, place.rating_sum,
+                *embedded_versions([place.owner, *place.amenities, *reviews, *(review.user for review in reviews)])
+            )
+            if not_modified:
+                return not_modified
+            result = place_to_dict(place)
+            result['owner'] = user_summary(place.owner)
+            result['amenities'] = [{'id': amenity.id, 'name': amenity.name} for amenity in place.amenities]
+            result['rating'] = place.rating_summary
+            result['reviews'] = {
+                'items': [dict(review_to_dict(review), author=user_summary(review.user)) for review in reviews],
+                'next_cursor': next_cursor
+            }
+            return result, 200, headers
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        except Exception as error:
+            return {'error': f'Internal server error: {str(error)}'}, 500
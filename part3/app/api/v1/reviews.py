@@ -3,36 +3,46 @@
 from flask import request
 from flask_restx import Namespace, Resource
 from app.services.facade import HBnBFacade
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.v1.conditional import collection_conditional, entity_conditional
+from app.api.v1.identity import identity_required, get_current_identity
+from app.api.v1.bulk import BulkTooLarge, bulk_response, read_bulk_items
+from datetime import datetime
 
 api = Namespace('reviews')
 facade = HBnBFacade()
 
 def review_to_dict(review):
+    def convert_datetime(value):
+        return value.isoformat() if isinstance(value, datetime) else value
     return {
         'id': getattr(review, 'id', None),
         'title': getattr(review, 'title', None),
-        'comment': getattr(review, 'comment', None),
+        'comment': getattr(review, 'text', None),
         'rating': getattr(review, 'rating', None),
         'place_id': getattr(review, 'place_id', None),
         'user_id': getattr(review, 'user_id', None),
-        'created_at': getattr(review, 'created_at', None),
-        'updated_at': getattr(review, 'updated_at', None),
+        'created_at': convert_datetime(getattr(review, 'created_at', None)),
+        'updated_at': convert_datetime(getattr(review, 'updated_at', None)),
     }
 
 @api.route('/')
 class ReviewList(Resource):
     def get(self):
         try:
-            reviews = facade.get_all_reviews()
-            return [review_to_dict(review) for review in reviews], 200
+            not_modified, headers = collection_conditional(facade.get_reviews_fingerprint())
+            if not_modified:
+                return not_modified
+            reviews, next_cursor = facade.get_reviews_page(request.args.get('limit'), request.args.get('cursor'))
+            return {'items': [review_to_dict(review) for review in reviews], 'next_cursor': next_cursor}, 200, headers
+        except ValueError as error:
+            return {'error': str(error)}, 400
         except Exception as error:
             return {'error': f'Internal server error: {str(error)}'}, 500
 
-    @jwt_required()
+    @identity_required()
     def post(self):
         try:
-            current_identity = get_jwt_identity()
+            current_identity = get_current_identity()
             data = request.get_json() or {}
 
             for field in ['title', 'comment', 'rating', 'place_id']:
@@ -64,6 +74,21 @@ class ReviewList(Resource):
         except Exception as error:
             return {'error': f'Internal server error: {str(error)}'}, 500
 
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    @identity_required()
+    def post(self):
+        """Create many reviews by the current user at once"""
+        try:
+            current_identity = get_current_identity()
+            return bulk_response(facade.bulk_create_reviews(read_bulk_items(), current_identity['id']))
+        except BulkTooLarge as error:
+            return {'error': str(error)}, 413
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        except Exception as error:
+            return {'error': f'Internal server error: {str(error)}'}, 500
+
 @api.route('/<string:review_id>')
 class ReviewResource(Resource):
     def get(self, review_id):
@@ -71,14 +96,17 @@ class ReviewResource(Resource):
             review = facade.get_review(review_id)
             if not review:
                 return {'error': 'Review not found'}, 404
-            return review_to_dict(review), 200
+            not_modified, headers = entity_conditional(review)
+            if not_modified:
+                return not_modified
+            return review_to_dict(review), 200, headers
         except Exception as error:
             return {'error': f'Internal server error: {str(error)}'}, 500
 
-    @jwt_required()
+    @identity_required()
     def put(self, review_id):
         try:
-            current_identity = get_jwt_identity()
+            current_identity = get_current_identity()
             data = request.get_json() or {}
 
             if 'rating' in data:
@@ -108,10 +136,10 @@ class ReviewResource(Resource):
         except Exception as error:
             return {'error': f'Internal server error: {str(error)}'}, 500
 
-    @jwt_required()
+    @identity_required()
     def delete(self, review_id):
         try:
-            current_identity = get_jwt_identity()
+            current_identity = get_current_identity()
             
             review = facade.get_review(review_id)
             if not review:
@@ -3,13 +3,16 @@
 from flask import request
 from flask_restx import Namespace, Resource
 from app.services.facade import HBnBFacade
-from app import bcrypt
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.v1.conditional import collection_conditional, entity_conditional
+from app.utils.password_hasher import PasswordHasherBusy
+from app.api.v1.identity import identity_required, get_current_identity
 from datetime import datetime
 
 api = Namespace('users')
 facade = HBnBFacade()
 
+MAX_BATCH_IDS = 1000
+
 def user_to_dict(user):
     def convert_datetime(value):
         return value.isoformat() if isinstance(value, datetime) else value
@@ -27,15 +30,29 @@ def user_to_dict(user):
 class UserList(Resource):
     def get(self):
         try:
-            users = facade.get_all_users()
-            return [user_to_dict(user) for user in users], 200
+            not_modified, headers = collection_conditional(facade.get_users_fingerprint())
+            if not_modified:
+                return not_modified
+            if 'ids' in request.args:
+                user_ids = [i.strip() for i in request.args['ids'].split(',') if i.strip()]
+                if not user_ids:
+                    return {'error': 'ids must list at least one user id'}, 400
+                if len(user_ids) > MAX_BATCH_IDS:
+                    return {'error': f'At most {MAX_BATCH_IDS} ids can be requested at once'}, 400
+                users, missing = facade.get_users_by_ids(user_ids)
+                return {'items': [user_to_dict(user) for user in users], 'missing': missing}, 200, headers
+
+            users, next_cursor = facade.get_users_page(request.args.get('limit'), request.args.get('cursor'))
+            return {'items': [user_to_dict(user) for user in users], 'next_cursor': next_cursor}, 200, headers
+        except ValueError as error:
+            return {'error': str(error)}, 400
         except Exception as error:
             return {'error': f'Internal server error: {str(error)}'}, 500
 
-    @jwt_required()
+    @identity_required()
     def post(self):
         try:
-            current_identity = get_jwt_identity()
+            current_identity = get_current_identity()
             if not current_identity.get('is_admin'):
                 return {'error': 'Admin privileges required'}, 403
 
@@ -47,9 +64,12 @@ class UserList(Resource):
             if facade.get_user_by_email(data['email']):
                 return {'error': 'Email already registered'}, 400
 
-            data['password'] = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+            # Clients always send plaintext; precomputed hashes are for imports only
+            data.pop('password_hash', None)
             user = facade.create_user(data)
             return {'id': user.id, 'message': 'User registered successfully'}, 201
+        except PasswordHasherBusy as error:
+            return {'error': str(error)}, 503, {'Retry-After': str(error.retry_after)}
         except ValueError as error:
             return {'error': str(error)}, 400
         except Exception as error:
@@ -62,14 +82,17 @@ class UserResource(Resource):
             user = facade.get_user(user_id)
             if not user:
                 return {'error': 'User not found'}, 404
-            return user_to_dict(user), 200
+            not_modified, headers = entity_conditional(user)
+            if not_modified:
+                return not_modified
+            return user_to_dict(user), 200, headers
         except Exception as error:
             return {'error': f'Internal server error: {str(error)}'}, 500
 
-    @jwt_required()
+    @identity_required()
     def put(self, user_id):
         try:
-            current_identity = get_jwt_identity()
+            current_identity = get_current_identity()
             data = request.get_json() or {}
 
             if current_identity.get('is_admin'):
@@ -88,6 +111,8 @@ class UserResource(Resource):
 
             user = facade.update_user(user_id, data)
             return user_to_dict(user), 200
+        except PasswordHasherBusy as error:
+            return {'error': str(error)}, 503, {'Retry-After': str(error.retry_after)}
         except ValueError as error:
             message = str(error)
             if 'not found' in message.lower():
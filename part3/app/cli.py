@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""
+Maintenance commands, available as `flask --app run hbnb <command>`
+"""
+
+import json
+import time
+import click
+from flask.cli import AppGroup
+
+hbnb_cli = AppGroup('hbnb', help='HBnB maintenance commands.')
+
+
+@hbnb_cli.command('rebuild-ratings')
+def rebuild_ratings():
+    """Recompute the denormalized rating aggregates of every place."""
+    from app.services.facade import HBnBFacade
+    count = HBnBFacade().rebuild_rating_aggregates()
+    click.echo(f'Rebuilt rating aggregates for {count} places')
+
+
+@hbnb_cli.command('upgrade-db')
+def upgrade_db():
+    """Upgrade a database created by an earlier release in place.
+
+    Adds the tables, columns and indexes introduced since, then backfills
+    place geohashes and rating aggregates. Running it twice is harmless.
+    """
+    from app.services.facade import HBnBFacade
+    added, geohashed, rated = HBnBFacade().upgrade_schema()
+    click.echo(f'Added columns: {", ".join(added) or "none"}')
+    click.echo(f'Backfilled geohash for {geohashed} places, rating aggregates for {rated} places')
+
+
+@hbnb_cli.command('import-users')
+@click.argument('path', type=click.File('r'))
+def import_users(path):
+    """Create users from a JSON array of user objects.
+
+    Each object needs first_name, last_name, email and either a plaintext
+    password or a precomputed password_hash.
+    """
+    from app.services.facade import HBnBFacade
+    started = time.perf_counter()
+    users, errors = HBnBFacade().import_users(json.load(path))
+    for index, message in errors:
+        click.echo(f'Row {index}: {message}', err=True)
+    click.echo(f'Imported {len(users)} users in {time.perf_counter() - started:.2f}s, {len(errors)} rejected')
+
+
+@hbnb_cli.command('export')
+@click.argument('entity')
+@click.option('--output', '-o', type=click.File('w'), default='-', help='File to write, stdout by default.')
+@click.option('--batch-size', type=int, default=None, help='Rows fetched per round trip.')
+@click.option('--include-secrets', is_flag=True, help='Include password hashes in a users export.')
+def export(entity, output, batch_size, include_secrets):
+    """Stream every row of ENTITY as NDJSON.
+
+    ENTITY is one of users, places, amenities, reviews or place_amenities.
+    """
+    from app.services.facade import HBnBFacade
+    from app.services.export import ndjson_chunks
+    started = time.perf_counter()
+    try:
+        rows = HBnBFacade().export_rows(entity, batch_size, include_secrets)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint='ENTITY')
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    for chunk in ndjson_chunks(counted(rows)):
+        output.write(chunk)
+    output.flush()
+    click.echo(f'Exported {count} {entity} in {time.perf_counter() - started:.2f}s', err=True)
+
+
+@hbnb_cli.command('import')
+@click.option('--users', type=click.Path(exists=True, dir_okay=False), help='Users file.')
+@click.option('--amenities', type=click.Path(exists=True, dir_okay=False), help='Amenities file.')
+@click.option('--places', type=click.Path(exists=True, dir_okay=False), help='Places file.')
+@click.option('--reviews', type=click.Path(exists=True, dir_okay=False), help='Reviews file.')
+@click.option('--place-amenities', type=click.Path(exists=True, dir_okay=False), help='Place/amenity links file.')
+@click.option('--format', 'file_format', type=click.Choice(['ndjson', 'csv']), default=None,
+              help='File format, from the extension by default.')
+@click.option('--chunk-size', type=int, default=5000, show_default=True, help='Rows per transaction.')
+@click.option('--drop-indexes', is_flag=True, help='Drop secondary indexes during the load and rebuild them after.')
+@click.option('--max-errors', type=int, default=20, show_default=True, help='Rejected rows printed per file.')
+def import_data(users, amenities, places, reviews, place_amenities, file_format, chunk_size, drop_indexes, max_errors):
+    """Bulk load NDJSON or CSV files, one per entity.
+
+    Files are imported in dependency order. Rows keep the field names of
+    the API (or of `hbnb export`); an `id` field lets later files refer to
+    the row through owner_id, user_id, place_id or amenity_id.
+    """
+    from app.services.importer import BulkImporter
+    paths = {entity: path for entity, path in (('users', users), ('amenities', amenities), ('places', places),
+                                               ('reviews', reviews), ('place_amenities', place_amenities)) if path}
+    if not paths:
+        raise click.UsageError('Give at least one file, e.g. --places places.ndjson')
+    started = time.perf_counter()
+    results = BulkImporter(chunk_size=chunk_size).import_files(paths, file_format, drop_indexes)
+    total = 0
+    for result in results:
+        for line_number, message in result.errors[:max_errors]:
+            click.echo(f'{result.path}:{line_number}: {message}', err=True)
+        if len(result.errors) > max_errors:
+            click.echo(f'{result.path}: {len(result.errors) - max_errors} more rejected rows', err=True)
+        click.echo(f'{result.entity}: {result.imported} of {result.rows} rows imported in '
+                   f'{result.seconds:.2f}s ({result.rows_per_second:.0f} rows/s)')
+        total += result.rows
+    elapsed = time.perf_counter() - started
+    click.echo(f'Total: {total} rows in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} rows/s)')
+
+
+@hbnb_cli.command('generate')
+@click.option('--scale', type=click.Choice(['1k', '10k', '100k', '1m']), default='10k', show_default=True,
+              help='Approximate total number of rows.')
+@click.option('--seed', type=int, default=42, show_default=True, help='Same seed, same dataset.')
+@click.option('--users', type=int, help='Override the number of users.')
+@click.option('--places', type=int, help='Override the number of places.')
+@click.option('--amenities', type=int, help='Override the number of amenities.')
+@click.option('--reviews', type=int, help='Override the number of reviews.')
+def generate(scale, seed, users, places, amenities, reviews):
+    """Fill an empty database with a deterministic synthetic dataset.
+
+    Every generated user logs in as userN@example.com with password123;
+    user0 is an admin.
+    """
+    from app.services.generator import SCALES, DatasetGenerator
+    counts = dict(SCALES[scale])
+    overrides = {'users': users, 'places': places, 'amenities': amenities, 'reviews': reviews}
+    counts.update({name: value for name, value in overrides.items() if value is not None})
+    started = time.perf_counter()
+    try:
+        written = DatasetGenerator(seed).generate(**counts)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    elapsed = time.perf_counter() - started
+    total = sum(written.values())
+    click.echo(', '.join(f'{count} {name}' for name, count in written.items()))
+    click.echo(f'Generated {total} rows in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} rows/s)')
@@ -3,8 +3,9 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import declared_attr
 
 Base = declarative_base()
 
@@ -16,11 +17,22 @@ class BaseModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # Extra indexes declared by subclasses, appended to __table_args__
+    _table_indexes = ()
+
+    @declared_attr
+    def __table_args__(cls):
+        """Indexes backing the keyset pagination order and max(updated_at)"""
+        return (
+            Index(f'ix_{cls.__tablename__}_created_at_id', 'created_at', 'id'),
+            Index(f'ix_{cls.__tablename__}_updated_at', 'updated_at'),
+        ) + tuple(cls._table_indexes)
+
     def save(self):
         """updates updated_at whenever object is modified"""
-        from app import db
+        from app.persistence.unit_of_work import commit
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit()
 
     def update(self, data):
         """updates attributes of object based on provided dict"""
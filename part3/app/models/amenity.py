@@ -2,6 +2,7 @@
 
 
 from app.models.BaseModel import BaseModel
+from app.models.place_amenity import place_amenity
 from sqlalchemy import Column, String
 from sqlalchemy.orm import relationship
 
@@ -12,7 +13,7 @@ class Amenity(BaseModel):
     name = Column(String(50), nullable=False, unique=True)
 
     # Relationships
-    # places = relationship("Place", secondary="place_amenities", back_populates="amenities")
+    places = relationship("Place", secondary=place_amenity, back_populates="amenities")
 
     def __init__(self, name, **kwargs):
         """Initialize amenity with validation"""
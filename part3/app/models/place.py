@@ -2,7 +2,9 @@
 
 
 from app.models.BaseModel import BaseModel
-from sqlalchemy import Column, String, Text, Float, ForeignKey
+from app.models.place_amenity import place_amenity
+from app.utils.geo import encode as geohash_encode
+from sqlalchemy import Column, String, Text, Float, Integer, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 
 class Place(BaseModel):
@@ -15,11 +17,29 @@ class Place(BaseModel):
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     owner_id = Column(String(36), ForeignKey('users.id'), nullable=False)
+    # Maintained from latitude/longitude on every flush, see sync_geohash
+    geohash = Column(String(12), nullable=True, index=True)
+
+    # Rating aggregates, maintained by the facade on every review write
+    review_count = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Integer, default=0, nullable=False)
+    rating_average = Column(Float, default=0.0, nullable=False)
+    rating_count_1 = Column(Integer, default=0, nullable=False)
+    rating_count_2 = Column(Integer, default=0, nullable=False)
+    rating_count_3 = Column(Integer, default=0, nullable=False)
+    rating_count_4 = Column(Integer, default=0, nullable=False)
+    rating_count_5 = Column(Integer, default=0, nullable=False)
+
+    # Serves price-range filters and top-rated ordering of the place search
+    _table_indexes = (
+        Index('ix_places_price', 'price'),
+        Index('ix_places_rating_average_review_count', 'rating_average', 'review_count'),
+    )
 
     # Relationships
     owner = relationship("User", back_populates="places")
     reviews = relationship("Review", back_populates="place", cascade="all, delete-orphan")
-    # amenities = relationship("Amenity", secondary="place_amenities", back_populates="places")
+    amenities = relationship("Amenity", secondary=place_amenity, back_populates="places")
 
     def __init__(self, title, description, price, latitude, longitude, owner_id=None, **kwargs):
         """Initialize place with validation"""
@@ -48,8 +68,24 @@ class Place(BaseModel):
         """Get the owner ID for API responses"""
         return self.owner_id
 
+    @property
+    def rating_summary(self):
+        """Review count, average rating and per-star histogram"""
+        return {
+            'count': self.review_count or 0,
+            'average': round(self.rating_average or 0, 2),
+            'histogram': {str(star): getattr(self, f'rating_count_{star}') or 0 for star in range(1, 6)}
+        }
+
     def to_dict(self):
         """Override to_dict to include owner_id"""
         result = super().to_dict()
         result['owner_id'] = self.owner_id
         return result
+
+
+@event.listens_for(Place, 'before_insert')
+@event.listens_for(Place, 'before_update')
+def sync_geohash(mapper, connection, target):
+    """Keep the indexed geohash cell in step with the coordinates"""
+    target.geohash = geohash_encode(target.latitude, target.longitude)
@@ -0,0 +1,15 @@
+#!/usr/bin/python3
+
+
+from app.models.BaseModel import Base
+from sqlalchemy import Table, Column, String, ForeignKey, Index
+
+# Association table for the Place <-> Amenity many-to-many relationship
+place_amenity = Table(
+    'place_amenities',
+    Base.metadata,
+    Column('place_id', String(36), ForeignKey('places.id'), primary_key=True),
+    Column('amenity_id', String(36), ForeignKey('amenities.id'), primary_key=True),
+    # The primary key serves place -> amenities; this serves amenity -> places
+    Index('ix_place_amenities_amenity_id_place_id', 'amenity_id', 'place_id')
+)
@@ -2,7 +2,7 @@
 
 
 from app.models.BaseModel import BaseModel
-from sqlalchemy import Column, String, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 class Review(BaseModel):
@@ -14,6 +14,13 @@ class Review(BaseModel):
     place_id = Column(String(36), ForeignKey('places.id'), nullable=False)
     user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
 
+    # Serves the per-place review listing newest first without a sort step
+    _table_indexes = (
+        Index('ix_reviews_place_id_created_at_id', 'place_id', 'created_at', 'id'),
+        # Covers per-place rating aggregates without touching the table
+        Index('ix_reviews_place_id_rating', 'place_id', 'rating'),
+    )
+
     # Relationships
     place = relationship("Place", back_populates="reviews")
     user = relationship("User", back_populates="reviews")
@@ -24,10 +31,15 @@ class Review(BaseModel):
 
         if not isinstance(text, str) or not text or not text.strip():
             raise ValueError("Are we rating without reasons now..")
-        if not isinstance(rating, int) or not (1 <= rating <= 5):
-            raise ValueError("choose from 1-5 only")
+        self.validate_rating(rating)
 
         self.text = text
         self.rating = rating
         self.place_id = place_id
         self.user_id = user_id
+
+    @staticmethod
+    def validate_rating(rating):
+        """Raise ValueError unless rating is an integer from 1 to 5"""
+        if not isinstance(rating, int) or not (1 <= rating <= 5):
+            raise ValueError("choose from 1-5 only")
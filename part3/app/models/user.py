@@ -4,12 +4,11 @@
 from app.models.BaseModel import BaseModel
 from sqlalchemy import Column, String, Boolean, DateTime
 from sqlalchemy.orm import relationship
-from flask_bcrypt import Bcrypt
+from app.utils.password_hasher import get_password_hasher
 from datetime import datetime
 import uuid
 import re
 
-bcrypt = Bcrypt()
 EMAIL_REGEX = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
 
 class User(BaseModel):
@@ -43,13 +42,33 @@ class User(BaseModel):
         if password:
             self.set_password(password)
 
+    @classmethod
+    def from_plaintext(cls, first_name, last_name, email, password, is_admin=False, **kwargs):
+        """Create a user from a plaintext password, hashed exactly once"""
+        if not password:
+            raise ValueError("Password is required")
+        return cls(first_name, last_name, email, password=password, is_admin=is_admin, **kwargs)
+
+    @classmethod
+    def from_hash(cls, first_name, last_name, email, password_hash, is_admin=False, **kwargs):
+        """Create a user from an already computed password hash, without rehashing"""
+        if not password_hash or not password_hash.startswith('$'):
+            raise ValueError("password_hash must be a modular crypt hash")
+        user = cls(first_name, last_name, email, is_admin=is_admin, **kwargs)
+        user.password_hash = password_hash
+        return user
+
     def set_password(self, password):
-        """Hash and set password"""
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        """Hash and set password on the application's password hasher"""
+        self.password_hash = get_password_hasher().hash(password)
 
     def check_password(self, password):
         """Check if provided password matches hash"""
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return get_password_hasher().verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """Check if the stored hash is weaker than the configured algorithm and cost"""
+        return get_password_hasher().needs_rehash(self.password_hash)
 
     def verify_password(self, password):
         """Verify password - alias for check_password"""
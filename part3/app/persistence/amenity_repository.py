@@ -17,3 +17,7 @@ class AmenityRepository(SQLAlchemyRepository):
     def name_exists(self, name):
         """Check if amenity name already exists"""
         return self.get_by_name(name) is not None
+
+    def get_existing_names(self, names):
+        """Return which of the given amenity names are already taken"""
+        return self._existing_values(Amenity.name, names)
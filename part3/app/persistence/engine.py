@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""
+Engine options and SQLite connection pragmas built from the app config
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+def is_sqlite(uri):
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+
+def is_sqlite_memory(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database
+
+    Server databases get a sized pool that pings connections before use
+    and recycles them before the server's idle timeout. In-memory SQLite
+    keeps its single shared connection, so it gets no pool options.
+    """
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    if is_sqlite_memory(uri):
+        return {}
+    options = {
+        'pool_size': config.get('DB_POOL_SIZE', 5),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+    }
+    if not is_sqlite(uri):
+        options['pool_recycle'] = config.get('DB_POOL_RECYCLE', 1800)
+    return options
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Run `PRAGMA name = value` for each pragma on every new SQLite connection"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
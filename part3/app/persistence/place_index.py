@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+"""
+In-process k-nearest-neighbour index over place coordinates
+"""
+
+import heapq
+import math
+import threading
+import time
+import numpy as np
+from flask import current_app
+from app.utils.geo import EARTH_RADIUS_KM
+
+LEAF_SIZE = 32
+# Pending writes are folded into the tree once they reach this share of it
+REBUILD_RATIO = 0.1
+REBUILD_MIN_PENDING = 256
+
+
+def to_unit_vectors(latitudes, longitudes):
+    """Map coordinates onto the unit sphere as (N, 3) xyz vectors
+
+    Euclidean (chord) distance between these vectors grows monotonically
+    with great-circle distance, so a plain KD-tree gives exact neighbours.
+    """
+    phi = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lam = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_phi = np.cos(phi)
+    return np.column_stack((cos_phi * np.cos(lam), cos_phi * np.sin(lam), np.sin(phi)))
+
+
+def chord_to_km(squared_chord):
+    """Convert a squared chord length on the unit sphere to kilometres"""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(squared_chord) / 2))
+
+
+def get_place_index():
+    """Return the place index of the current application"""
+    return current_app.extensions['hbnb_place_index']
+
+
+class _Node:
+    """KD-tree node; leaves hold row indexes, inner nodes hold two children"""
+    __slots__ = ('low', 'high', 'rows', 'children')
+
+    def __init__(self, low, high, rows=None, children=None):
+        self.low = low
+        self.high = high
+        self.rows = rows
+        self.children = children
+
+
+class PlaceIndex:
+    """KD-tree of place coordinates with an incrementally maintained delta
+
+    The tree is immutable once built. Inserts and moves go to a small
+    pending buffer that is scanned with one vectorized NumPy pass, and the
+    stale tree entries are masked out; the tree is rebuilt when the buffer
+    grows past REBUILD_RATIO of its size. A full reload from the database
+    every `refresh_seconds` picks up writes made by other processes.
+    """
+
+    def __init__(self, refresh_seconds=300):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._built_at = None
+        self._set_tree([], np.empty((0, 3)))
+        self._set_pending({})
+
+    @property
+    def is_stale(self):
+        """Whether the index has never been loaded or is due for a reload"""
+        if self._built_at is None:
+            return True
+        return self.refresh_seconds is not None and time.monotonic() - self._built_at > self.refresh_seconds
+
+    def __len__(self):
+        return len(self._positions) - len(self._removed) + len(self._pending)
+
+    def load(self, rows):
+        """Rebuild the index from (place_id, latitude, longitude) rows"""
+        rows = list(rows)
+        ids = [row[0] for row in rows]
+        vectors = to_unit_vectors([row[1] for row in rows], [row[2] for row in rows]) if rows else np.empty((0, 3))
+        with self._lock:
+            self._set_tree(ids, vectors)
+            self._set_pending({})
+            self._built_at = time.monotonic()
+
+    def upsert(self, place_id, latitude, longitude):
+        """Add a place or move it to new coordinates"""
+        vector = to_unit_vectors([latitude], [longitude])[0]
+        with self._lock:
+            if place_id in self._positions:
+                self._removed = self._removed | {place_id}
+            self._set_pending({**self._pending, place_id: vector})
+            if len(self._pending) >= max(REBUILD_MIN_PENDING, REBUILD_RATIO * len(self._ids)):
+                self._compact()
+
+    def upsert_many(self, rows):
+        """Add or move many places from (place_id, latitude, longitude) rows"""
+        rows = list(rows)
+        if not rows:
+            return
+        vectors = to_unit_vectors([row[1] for row in rows], [row[2] for row in rows])
+        with self._lock:
+            moved = {row[0] for row in rows if row[0] in self._positions}
+            if moved:
+                self._removed = self._removed | moved
+            pending = dict(self._pending)
+            pending.update(zip((row[0] for row in rows), vectors))
+            self._set_pending(pending)
+            if len(self._pending) >= max(REBUILD_MIN_PENDING, REBUILD_RATIO * len(self._ids)):
+                self._compact()
+
+    def remove(self, place_id):
+        """Drop a place from the index"""
+        with self._lock:
+            if place_id in self._pending:
+                self._set_pending({key: value for key, value in self._pending.items() if key != place_id})
+            if place_id in self._positions:
+                self._removed = self._removed | {place_id}
+
+    def nearest(self, latitude, longitude, k):
+        """Return up to k (place_id, distance_km) pairs, closest first"""
+        if k < 1:
+            return []
+        query = to_unit_vectors([latitude], [longitude])[0]
+        # Writers replace these objects instead of mutating them, so a
+        # reference snapshot taken under the lock stays consistent
+        with self._lock:
+            ids, vectors, root, removed = self._ids, self._vectors, self._root, self._removed
+            pending_ids, pending_vectors = self._pending_ids, self._pending_vectors
+
+        # Max-heap of the k best (negated squared distance, place_id) pairs
+        best = []
+        if pending_ids:
+            distances = ((pending_vectors - query) ** 2).sum(axis=1)
+            for row in np.argsort(distances)[:k]:
+                self._offer(best, k, float(distances[row]), pending_ids[row])
+        if root is not None:
+            self._search(root, query, k, best, ids, vectors, removed)
+        return [(place_id, chord_to_km(-negated)) for negated, place_id in sorted(best, reverse=True)]
+
+    def _offer(self, best, k, distance, place_id):
+        if len(best) < k:
+            heapq.heappush(best, (-distance, place_id))
+        elif distance < -best[0][0]:
+            heapq.heapreplace(best, (-distance, place_id))
+
+    def _search(self, node, query, k, best, ids, vectors, removed):
+        if node.rows is not None:
+            distances = ((vectors[node.rows] - query) ** 2).sum(axis=1)
+            for position in np.argsort(distances):
+                if len(best) == k and distances[position] >= -best[0][0]:
+                    break
+                place_id = ids[node.rows[position]]
+                if place_id not in removed:
+                    self._offer(best, k, float(distances[position]), place_id)
+            return
+        children = sorted(node.children, key=lambda child: self._box_distance(child, query))
+        for child in children:
+            if len(best) == k and self._box_distance(child, query) >= -best[0][0]:
+                break
+            self._search(child, query, k, best, ids, vectors, removed)
+
+    @staticmethod
+    def _box_distance(node, query):
+        """Squared distance from the query to a node's bounding box"""
+        gap = np.maximum(np.maximum(node.low - query, query - node.high), 0.0)
+        return float(gap @ gap)
+
+    def _compact(self):
+        """Fold pending writes into a freshly built tree (lock held)"""
+        keep = [row for row, place_id in enumerate(self._ids) if place_id not in self._removed]
+        ids = [self._ids[row] for row in keep] + list(self._pending)
+        vectors = self._vectors[keep]
+        if self._pending:
+            vectors = np.vstack([vectors, np.array(list(self._pending.values()))])
+        self._set_tree(ids, vectors)
+        self._set_pending({})
+
+    def _set_pending(self, pending):
+        self._pending = pending
+        self._pending_ids = list(pending)
+        self._pending_vectors = np.array(list(pending.values())) if pending else np.empty((0, 3))
+
+    def _set_tree(self, ids, vectors):
+        self._ids = ids
+        self._vectors = vectors
+        self._positions = {place_id: row for row, place_id in enumerate(ids)}
+        self._removed = set()
+        self._root = self._build(np.arange(len(ids))) if len(ids) else None
+
+    def _build(self, rows):
+        points = self._vectors[rows]
+        low, high = points.min(axis=0), points.max(axis=0)
+        if len(rows) <= LEAF_SIZE:
+            return _Node(low, high, rows=rows)
+        axis = int(np.argmax(high - low))
+        middle = len(rows) // 2
+        rows = rows[np.argpartition(points[:, axis], middle)]
+        return _Node(low, high, children=(self._build(rows[:middle]), self._build(rows[middle:])))
@@ -1,8 +1,24 @@
 #!/usr/bin/python3
 
 
-from app.persistence.repository import SQLAlchemyRepository
+from collections import Counter
+from sqlalchemy import Float, and_, bindparam, or_, case, cast, func, insert, literal, select, union_all, update
+from sqlalchemy.orm import joinedload
+from app import db
+from app.persistence.unit_of_work import commit
+from app.persistence.repository import (EXPORT_BATCH_SIZE, SQLAlchemyRepository, clamp_page_size, iter_table_rows,
+                                       replica_read)
+from app.persistence.place_index import get_place_index
 from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.models.place_amenity import place_amenity
+from app.utils import geo
+
+# First character after 'z' in the geohash alphabet, closes a prefix range
+PREFIX_END = '{'
+# Lower bounds of the price facet buckets; the last bucket is open-ended
+PRICE_BUCKETS = (0, 50, 100, 200, 500)
 
 class PlaceRepository(SQLAlchemyRepository):
     """Place-specific repository with additional methods"""
@@ -10,13 +26,362 @@ class PlaceRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Place)
     
+    @replica_read
+    def get_with_details(self, place_id):
+        """Get a place with its owner and amenities loaded in one query"""
+        return self.model.query.options(
+            joinedload(Place.owner),
+            joinedload(Place.amenities)
+        ).filter_by(id=place_id).first()
+    
+    @replica_read
     def get_by_owner(self, owner_id):
         """Get all places owned by a specific user"""
         return self.model.query.filter_by(owner_id=owner_id).all()
     
+    @replica_read
     def get_by_price_range(self, min_price, max_price):
         """Get places within a price range"""
         return self.model.query.filter(
             Place.price >= min_price,
             Place.price <= max_price
         ).all()
+    
+    @replica_read
+    def get_top_rated(self, limit=None, min_reviews=1):
+        """Get the best rated places, read in rating_average index order"""
+        return self.model.query.filter(Place.review_count >= min_reviews).order_by(
+            Place.rating_average.desc(), Place.review_count.desc()
+        ).limit(clamp_page_size(limit)).all()
+    
+    def adjust_rating_aggregates(self, place_id, added=None, removed=None):
+        """Apply review ratings being added, removed or changed
+
+        `added` and `removed` are one rating or a list of ratings. Runs as a
+        single UPDATE relative to the stored values, so concurrent review
+        writes cannot lose each other's increments. Does not commit: it
+        joins the transaction of the review write it accompanies.
+        """
+        added = self._as_ratings(added)
+        removed = self._as_ratings(removed)
+        count_delta = len(added) - len(removed)
+        sum_delta = sum(added) - sum(removed)
+        values = {
+            'review_count': Place.review_count + count_delta,
+            'rating_sum': Place.rating_sum + sum_delta,
+            'rating_average': case(
+                (Place.review_count + count_delta > 0,
+                 cast(Place.rating_sum + sum_delta, Float) / (Place.review_count + count_delta)),
+                else_=0.0
+            )
+        }
+        star_deltas = Counter(added)
+        star_deltas.subtract(removed)
+        for rating, delta in star_deltas.items():
+            if delta:
+                column = getattr(Place, f'rating_count_{rating}')
+                values[column.key] = column + delta
+        db.session.execute(
+            update(Place).where(Place.id == place_id).values(**values),
+            execution_options={'synchronize_session': 'fetch'}
+        )
+
+    def replace_review_rating(self, review_id, rating=None):
+        """Swap a review's stored rating for `rating` in its place's aggregates
+
+        With `rating` None the review is taken out of the aggregates, as
+        when it is deleted. The stored rating is read by subqueries of the
+        same UPDATE, so the change comes from the current row rather than
+        a cached or replica copy. Call it before the review itself is
+        written; like adjust_rating_aggregates, it does not commit.
+        """
+        stored = select(Review.rating).where(Review.id == review_id).scalar_subquery()
+        place_id = select(Review.place_id).where(Review.id == review_id).scalar_subquery()
+        count_delta = 0 if rating is not None else -1
+        sum_delta = (rating or 0) - stored
+        values = {
+            'review_count': Place.review_count + count_delta,
+            'rating_sum': Place.rating_sum + sum_delta,
+            'rating_average': case(
+                (Place.review_count + count_delta > 0,
+                 cast(Place.rating_sum + sum_delta, Float) / (Place.review_count + count_delta)),
+                else_=0.0
+            )
+        }
+        for star in range(1, 6):
+            column = getattr(Place, f'rating_count_{star}')
+            values[column.key] = column - case((stored == star, 1), else_=0) + int(rating == star)
+        db.session.execute(
+            update(Place).where(Place.id == place_id).values(**values),
+            execution_options={'synchronize_session': 'fetch'}
+        )
+
+    def add_rating_aggregates(self, ratings_by_place):
+        """Apply the ratings of newly added reviews to many places at once
+
+        `ratings_by_place` maps a place id to a list of ratings. Runs one
+        executemany UPDATE relative to the stored values and, like
+        adjust_rating_aggregates, does not commit.
+        """
+        if not ratings_by_place:
+            return
+        table = Place.__table__
+        columns = table.c
+        values = {
+            'review_count': columns.review_count + bindparam('count_delta'),
+            'rating_sum': columns.rating_sum + bindparam('sum_delta'),
+            'rating_average': cast(columns.rating_sum + bindparam('sum_delta'), Float)
+            / (columns.review_count + bindparam('count_delta')),
+        }
+        for star in range(1, 6):
+            values[f'rating_count_{star}'] = columns[f'rating_count_{star}'] + bindparam(f'star_{star}')
+        rows = []
+        for place_id, ratings in ratings_by_place.items():
+            stars = Counter(ratings)
+            row = {'place_id': place_id, 'count_delta': len(ratings), 'sum_delta': sum(ratings)}
+            row.update({f'star_{star}': stars[star] for star in range(1, 6)})
+            rows.append(row)
+        db.session.execute(update(table).where(columns.id == bindparam('place_id')).values(**values), rows)
+        # A Core executemany does not refresh loaded places, so expire them
+        for place in db.session.identity_map.values():
+            if isinstance(place, Place) and place.id in ratings_by_place:
+                db.session.expire(place)
+
+    @staticmethod
+    def _as_ratings(ratings):
+        if ratings is None:
+            return []
+        return [ratings] if isinstance(ratings, int) else list(ratings)
+
+    def bulk_insert(self, instances):
+        """Insert places with one executemany, setting the geohash sync_geohash would"""
+        for place in instances:
+            place.geohash = geo.encode(place.latitude, place.longitude)
+        return super().bulk_insert(instances)
+    
+    def rebuild_rating_aggregates(self):
+        """Recompute every place's rating aggregates from the reviews table"""
+        def per_place(aggregate, *conditions):
+            return select(aggregate).where(Review.place_id == Place.id, *conditions).scalar_subquery()
+        values = {
+            'review_count': per_place(func.count(Review.id)),
+            'rating_sum': per_place(func.coalesce(func.sum(Review.rating), 0)),
+        }
+        for star in range(1, 6):
+            values[f'rating_count_{star}'] = per_place(func.count(Review.id), Review.rating == star)
+        result = db.session.execute(update(Place).values(**values))
+        db.session.execute(update(Place).values(rating_average=case(
+            (Place.review_count > 0, cast(Place.rating_sum, Float) / Place.review_count),
+            else_=0.0
+        )))
+        commit()
+        return result.rowcount
+    
+    @replica_read
+    def get_search_fingerprint(self):
+        """Return the places fingerprint with the amenity link count folded in
+
+        add_amenity_links inserts links without touching places.updated_at,
+        so amenity filters and facets would otherwise keep a stale version.
+        """
+        link_count = select(func.count()).select_from(place_amenity).scalar_subquery()
+        count, latest, links = db.session.query(func.count(Place.id), func.max(Place.updated_at), link_count).one()
+        return f'{count}/{links}', latest
+    
+    def backfill_geohash(self):
+        """Fill the geohash of places stored before the column existed"""
+        rows = db.session.execute(select(Place.id, Place.latitude, Place.longitude)
+                                  .where(Place.geohash.is_(None))).all()
+        if rows:
+            table = Place.__table__
+            db.session.execute(update(table).where(table.c.id == bindparam('place_id')),
+                               [{'place_id': place_id, 'geohash': geo.encode(latitude, longitude)}
+                                for place_id, latitude, longitude in rows])
+        commit()
+        return len(rows)
+    
+    @replica_read
+    def search(self, min_price=None, max_price=None, min_rating=None, amenity_ids=None,
+               text=None, limit=None, cursor=None):
+        """Get one page of places matching every given filter"""
+        conditions = self._search_conditions(min_price, max_price, min_rating, amenity_ids, text)
+        return self._paginate(self.model.query.filter(*conditions), limit, cursor)
+    
+    @replica_read
+    def search_facets(self, min_price=None, max_price=None, min_rating=None, amenity_ids=None, text=None):
+        """Count the places matching the filters per price bucket and per amenity
+
+        Both facets are computed by one UNION ALL query over a shared CTE of
+        the matching places, so the filters are evaluated once.
+        """
+        conditions = self._search_conditions(min_price, max_price, min_rating, amenity_ids, text)
+        matches = select(Place.id, Place.price).where(*conditions).cte('matches')
+
+        bucket = self._price_bucket(matches.c.price)
+        price_counts = select(
+            literal('price').label('facet'), bucket.label('key'),
+            literal(None).label('name'), func.count().label('count')
+        ).group_by(bucket)
+        amenity_counts = select(
+            literal('amenity'), Amenity.id, Amenity.name, func.count()
+        ).select_from(
+            matches.join(place_amenity, place_amenity.c.place_id == matches.c.id)
+                   .join(Amenity, Amenity.id == place_amenity.c.amenity_id)
+        ).group_by(Amenity.id, Amenity.name)
+
+        price, amenities = {}, []
+        for facet, key, name, count in db.session.execute(union_all(price_counts, amenity_counts)):
+            if facet == 'price':
+                price[key] = count
+            else:
+                amenities.append({'id': key, 'name': name, 'count': count})
+        buckets = [self._bucket_label(index) for index in range(len(PRICE_BUCKETS))]
+        amenities.sort(key=lambda facet: (-facet['count'], facet['name']))
+        return {
+            'total': sum(price.values()),
+            'price': [{'range': label, 'count': price.get(label, 0)} for label in buckets],
+            'amenities': amenities
+        }
+    
+    @staticmethod
+    def _bucket_label(index):
+        if index + 1 < len(PRICE_BUCKETS):
+            return f'{PRICE_BUCKETS[index]}-{PRICE_BUCKETS[index + 1]}'
+        return f'{PRICE_BUCKETS[index]}+'
+    
+    def _price_bucket(self, price):
+        """SQL expression labelling a price with its facet bucket"""
+        whens = [(price >= PRICE_BUCKETS[index], self._bucket_label(index))
+                 for index in range(len(PRICE_BUCKETS) - 1, 0, -1)]
+        return case(*whens, else_=self._bucket_label(0))
+    
+    @staticmethod
+    def _search_conditions(min_price, max_price, min_rating, amenity_ids, text):
+        """Translate search filters into SQL conditions on places"""
+        conditions = []
+        if min_price is not None:
+            conditions.append(Place.price >= min_price)
+        if max_price is not None:
+            conditions.append(Place.price <= max_price)
+        if min_rating is not None:
+            conditions.append(Place.rating_average >= min_rating)
+        if amenity_ids:
+            amenity_ids = set(amenity_ids)
+            equipped = select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(amenity_ids)
+            ).group_by(place_amenity.c.place_id).having(func.count() == len(amenity_ids))
+            conditions.append(Place.id.in_(equipped))
+        if text:
+            conditions.append(or_(
+                Place.title.icontains(text, autoescape=True),
+                Place.description.icontains(text, autoescape=True)
+            ))
+        return conditions
+    
+    @replica_read
+    def search_area(self, near=None, radius_km=None, bbox=None, limit=None):
+        """Get places inside a radius and/or bounding box, sorted by distance
+
+        Candidates are read from the geohash index with one range scan per
+        covering cell, then filtered exactly with the haversine distance.
+        Returns a list of (place, distance_km) pairs; distance is measured
+        from `near`, or from the box centre when only a box is given.
+        """
+        limit = clamp_page_size(limit)
+        if near and radius_km is not None:
+            circle = geo.bounding_box(near[0], near[1], radius_km)
+            box = circle if bbox is None else self._intersect(circle, bbox)
+            if box is None:
+                return []
+        elif bbox is not None:
+            box = bbox
+        else:
+            raise ValueError("A radius or bounding box is required")
+        if near is None:
+            near = ((box[0] + box[2]) / 2, self._box_center_longitude(box))
+
+        query = self.model.query
+        prefixes = geo.covering_prefixes(box)
+        if prefixes != ['']:
+            query = query.filter(or_(*[
+                and_(Place.geohash >= prefix, Place.geohash < prefix + PREFIX_END)
+                for prefix in prefixes
+            ]))
+
+        results = []
+        for place in query.all():
+            if bbox is not None and not geo.in_bounding_box(place.latitude, place.longitude, bbox):
+                continue
+            distance = geo.haversine_km(near[0], near[1], place.latitude, place.longitude)
+            if radius_km is not None and distance > radius_km:
+                continue
+            results.append((place, distance))
+        results.sort(key=lambda result: result[1])
+        return results[:limit]
+    
+    @replica_read
+    def nearest(self, latitude, longitude, k):
+        """Get the k places closest to a point as (place, distance_km) pairs
+
+        Served by the in-process KD-tree index, reloaded from the table when
+        it is older than PLACE_INDEX_REFRESH_SECONDS; the matched places are
+        then fetched with a single IN query.
+        """
+        index = get_place_index()
+        if index.is_stale:
+            self.refresh_index()
+        matches = index.nearest(latitude, longitude, clamp_page_size(k))
+        places, _ = self.get_many([place_id for place_id, _ in matches])
+        by_id = {place.id: place for place in places}
+        return [(by_id[place_id], distance) for place_id, distance in matches if place_id in by_id]
+    
+    def refresh_index(self):
+        """Reload the nearest-neighbour index from the places table"""
+        rows = self.model.query.with_entities(Place.id, Place.latitude, Place.longitude).yield_per(10000)
+        get_place_index().load(rows)
+    
+    def index_place(self, place):
+        """Add or move a place in the nearest-neighbour index"""
+        get_place_index().upsert(place.id, place.latitude, place.longitude)
+    
+    def get_existing_amenity_links(self, links):
+        """Return which of the given (place_id, amenity_id) links already exist"""
+        return self._existing_pairs(place_amenity.c.place_id, place_amenity.c.amenity_id, links)
+
+    def add_amenity_links(self, links):
+        """Insert (place_id, amenity_id) links with one executemany"""
+        if links:
+            db.session.execute(insert(place_amenity),
+                               [{'place_id': place_id, 'amenity_id': amenity_id} for place_id, amenity_id in links])
+        commit()
+
+    def iter_amenity_links(self, batch_size=EXPORT_BATCH_SIZE):
+        """Stream every (place_id, amenity_id) link as a dict"""
+        return iter_table_rows(select(place_amenity.c.place_id, place_amenity.c.amenity_id), batch_size)
+    
+    def index_places(self, places):
+        """Add or move many places in the nearest-neighbour index at once"""
+        get_place_index().upsert_many((place.id, place.latitude, place.longitude) for place in places)
+    
+    @staticmethod
+    def _intersect(box, other):
+        """Intersect two boxes, used to narrow a radius by a bbox
+
+        Returns None when they do not overlap. Wrapping boxes are not
+        intersected; candidates are still checked against the bbox exactly.
+        """
+        if box[1] > box[3] or other[1] > other[3]:
+            return box
+        result = (max(box[0], other[0]), max(box[1], other[1]),
+                  min(box[2], other[2]), min(box[3], other[3]))
+        if result[0] > result[2] or result[1] > result[3]:
+            return None
+        return result
+    
+    @staticmethod
+    def _box_center_longitude(box):
+        """Centre longitude of a box, accounting for antimeridian wrap"""
+        min_lon, max_lon = box[1], box[3]
+        if min_lon > max_lon:
+            max_lon += 360
+        return ((min_lon + max_lon) / 2 + 180) % 360 - 180
@@ -1,7 +1,190 @@
 #!/usr/bin/python3
 
+import base64
+import inspect
+import json
+import threading
+import time
+import uuid
 from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import wraps
+from sqlalchemy import func, insert, inspect as inspect_schema, select, text, tuple_
 from app import db
+from app.persistence.routing import READ_KEY
+from app.persistence.unit_of_work import commit, in_unit_of_work
+from app.utils.metrics import MetricsRegistry
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Rows fetched from the cursor per round trip while streaming an export
+EXPORT_BATCH_SIZE = 1000
+# Stays below SQLite's historical 999 bound-parameter limit
+IN_QUERY_CHUNK_SIZE = 500
+REPOSITORY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def clamp_page_size(limit):
+    """Validate a requested page size and cap it at MAX_PAGE_SIZE"""
+    if limit is None or limit == '':
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        raise ValueError("limit must be a positive integer")
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def encode_cursor(instance):
+    """Encode the (created_at, id) position of an instance as an opaque token"""
+    raw = json.dumps([instance.created_at.isoformat(), instance.id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode an opaque cursor token back into a (created_at, id) tuple"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, instance_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), str(instance_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def replica_read(method):
+    """Let the queries a repository read method runs go to a read replica
+
+    Reads inside a unit of work, and any read by a session that has already
+    written, stay on the primary (see RoutingSession). Attributes loaded
+    lazily after the method returns are read from the primary.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        info = db.session.info
+        if info.get(READ_KEY) or in_unit_of_work():
+            return method(*args, **kwargs)
+        info[READ_KEY] = True
+        try:
+            return method(*args, **kwargs)
+        finally:
+            info.pop(READ_KEY, None)
+    return wrapper
+
+
+# Repositories are process-wide (the facade is a module-level singleton),
+# so their metrics are too; /metrics renders them with the app's own
+repository_metrics = MetricsRegistry()
+repository_duration = repository_metrics.histogram(
+    'hbnb_repository_operation_duration_seconds', 'Time spent in a repository call',
+    ('model', 'operation'), REPOSITORY_BUCKETS)
+repository_errors = repository_metrics.counter(
+    'hbnb_repository_errors_total', 'Repository calls that raised', ('model', 'operation'))
+
+
+class _ActiveOperation(threading.local):
+    busy = False
+
+
+_active_operation = _ActiveOperation()
+
+
+def timed_operation(method):
+    """Time a repository method per model and operation
+
+    Only the outermost repository call on a thread is recorded, so a
+    method built on others (email_exists on get_by_email) counts once.
+    """
+    operation = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if _active_operation.busy:
+            return method(self, *args, **kwargs)
+        _active_operation.busy = True
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        except BaseException:
+            repository_errors.inc((self.model.__name__, operation))
+            raise
+        finally:
+            _active_operation.busy = False
+            repository_duration.observe(time.perf_counter() - started, (self.model.__name__, operation))
+    return wrapper
+
+
+def time_public_methods(cls):
+    """Wrap the public methods `cls` defines with timed_operation"""
+    for name, attribute in list(vars(cls).items()):
+        if not name.startswith('_') and inspect.isfunction(attribute):
+            setattr(cls, name, timed_operation(attribute))
+    return cls
+
+
+def iter_table_rows(statement, batch_size=EXPORT_BATCH_SIZE):
+    """Execute a Core select and yield its rows as dicts, batch by batch"""
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    for partition in result.mappings().partitions():
+        for row in partition:
+            yield dict(row)
+
+
+def drop_secondary_indexes(tables, keep=()):
+    """Drop the non-unique indexes of `tables` ahead of a large load
+
+    Returns the dropped indexes, to be passed to create_indexes once the
+    rows are in; building an index once is far cheaper than maintaining it
+    row by row. Primary keys, unique constraints and the indexes named in
+    `keep` stay in place.
+    """
+    connection = db.session.connection()
+    dropped = []
+    for table in tables:
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if not index.unique and index.name not in keep:
+                index.drop(connection, checkfirst=True)
+                dropped.append(index)
+    db.session.commit()
+    return dropped
+
+
+def create_indexes(indexes):
+    """Recreate indexes dropped by drop_secondary_indexes"""
+    connection = db.session.connection()
+    for index in indexes:
+        index.create(connection, checkfirst=True)
+    db.session.commit()
+
+
+def add_missing_columns(tables):
+    """ALTER existing tables to add the mapped columns they still lack
+
+    create_all only creates missing tables, so a database built by an
+    earlier release keeps its old columns. Each missing column is added
+    with its scalar default as the DEFAULT clause, which also fills the
+    existing rows. Returns the added columns as 'table.column' names.
+    """
+    connection = db.session.connection()
+    dialect = connection.dialect
+    existing = inspect_schema(connection)
+    added = []
+    for table in tables:
+        present = {column['name'] for column in existing.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            definition = f'{dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect)}'
+            default = column.default.arg if column.default is not None and column.default.is_scalar else None
+            if default is not None:
+                definition += f' NOT NULL DEFAULT {default!r}' if not column.nullable else f' DEFAULT {default!r}'
+            connection.execute(text(f'ALTER TABLE {dialect.identifier_preparer.quote(table.name)} '
+                                    f'ADD COLUMN {definition}'))
+            added.append(f'{table.name}.{column.name}')
+    db.session.commit()
+    return added
+
 
 class Repository(ABC):
     @abstractmethod
@@ -16,6 +199,14 @@ class Repository(ABC):
     def get_all(self):
         pass
 
+    @abstractmethod
+    def get_page(self, limit=None, cursor=None):
+        pass
+
+    @abstractmethod
+    def get_fingerprint(self, **filters):
+        pass
+
     @abstractmethod
     def update(self, instance_id, data):
         pass
@@ -41,8 +232,32 @@ class InMemoryRepository(Repository):
     def get_all(self):
         return list(self.storage.values())
 
+    def get_many(self, instance_ids):
+        instance_ids = list(dict.fromkeys(instance_ids))
+        instances = [self.storage[i] for i in instance_ids if i in self.storage]
+        missing = [i for i in instance_ids if i not in self.storage]
+        return instances, missing
+
+    def get_page(self, limit=None, cursor=None):
+        limit = clamp_page_size(limit)
+        items = sorted(self.storage.values(), key=lambda i: (i.created_at, i.id))
+        if cursor:
+            position = decode_cursor(cursor)
+            items = [i for i in items if (i.created_at, i.id) > position]
+        if len(items) > limit:
+            return items[:limit], encode_cursor(items[limit - 1])
+        return items, None
+
+    def get_fingerprint(self, **filters):
+        items = [i for i in self.storage.values()
+                 if all(getattr(i, key) == value for key, value in filters.items())]
+        return len(items), max((i.updated_at for i in items), default=None)
+
+    def get_for_update(self, instance_id):
+        return self.storage.get(instance_id)
+
     def update(self, instance_id, data):
-        instance = self.get(instance_id)
+        instance = self.get_for_update(instance_id)
         if instance:
             instance.update(data)
 
@@ -54,33 +269,182 @@ class InMemoryRepository(Repository):
         return next((instance for instance in self.storage.values() if getattr(instance, attribute_name) == attribute_value), None)
 
 class SQLAlchemyRepository(Repository):
+    # Columns iter_rows leaves out unless asked for them
+    secret_columns = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        time_public_methods(cls)
+
     def __init__(self, model):
         self.model = model
 
     def add(self, instance):
         db.session.add(instance)
-        db.session.commit()
+        commit()
 
+    @replica_read
     def get(self, instance_id):
         return self.model.query.get(instance_id)
 
+    @replica_read
     def get_all(self):
         return self.model.query.all()
 
+    @replica_read
+    def get_many(self, instance_ids):
+        """Get instances by id in request order, plus the ids that were not found
+
+        Ids are resolved with chunked WHERE id IN (...) queries, so a batch
+        costs one round trip per IN_QUERY_CHUNK_SIZE ids rather than one per id.
+        """
+        instance_ids = list(dict.fromkeys(instance_ids))
+        found = {}
+        for start in range(0, len(instance_ids), IN_QUERY_CHUNK_SIZE):
+            chunk = instance_ids[start:start + IN_QUERY_CHUNK_SIZE]
+            for instance in self.model.query.filter(self.model.id.in_(chunk)).all():
+                found[instance.id] = instance
+        instances = [found[i] for i in instance_ids if i in found]
+        missing = [i for i in instance_ids if i not in found]
+        return instances, missing
+
+    @replica_read
+    def get_page(self, limit=None, cursor=None):
+        """Get one page of instances in (created_at, id) order"""
+        return self._paginate(self.model.query, limit, cursor)
+
+    def bulk_insert(self, instances):
+        """Insert new, validated instances with one executemany INSERT
+
+        Bypasses the session's per-object bookkeeping, so ids and timestamps
+        are assigned here and ORM events (before_insert) do not run; callers
+        fill in any column such events would have set.
+        """
+        now = datetime.utcnow()
+        table = self.model.__table__
+        # Every row carries every column so the INSERT is one executemany;
+        # unset values fall back to the column's scalar default
+        defaults = {column.key: column.default.arg if column.default is not None and column.default.is_scalar else None
+                    for column in table.columns}
+        rows = []
+        for instance in instances:
+            instance.id = instance.id or str(uuid.uuid4())
+            instance.created_at = instance.created_at or now
+            instance.updated_at = instance.updated_at or now
+            values = instance.__dict__
+            rows.append({key: default if values.get(key) is None else values[key] for key, default in defaults.items()})
+        self.insert_rows(rows)
+        return instances
+
+    def insert_rows(self, rows):
+        """Insert prepared column dicts with one executemany, unvalidated
+
+        For rows built by trusted code such as the data generator; every
+        row must carry the same keys, including id and the timestamps.
+        """
+        if rows:
+            db.session.execute(insert(self.model.__table__), rows)
+        commit()
+
+    def iter_rows(self, batch_size=EXPORT_BATCH_SIZE, include_secrets=False):
+        """Stream every row as a column dict, without building ORM objects
+
+        Rows are fetched `batch_size` at a time from a server-side cursor
+        where the driver supports one, so memory stays flat however large
+        the table is. Columns listed in `secret_columns` are left out
+        unless `include_secrets` is set.
+        """
+        columns = [column for column in self.model.__table__.columns
+                   if include_secrets or column.key not in self.secret_columns]
+        return iter_table_rows(select(*columns), batch_size)
+
+    def get_existing_ids(self, instance_ids):
+        """Return which of the given ids exist, without loading the rows"""
+        return self._existing_values(self.model.id, instance_ids)
+
+    def _existing_pairs(self, first, second, pairs):
+        """Return which (first, second) value pairs already occur
+
+        Rows are looked up by `first` alone, which should lead an index, in
+        chunked IN queries and matched against the pairs here; SQLite does
+        not use an index for a row-value IN over both columns.
+        """
+        pairs = set(pairs)
+        firsts = list({pair[0] for pair in pairs})
+        existing = set()
+        for start in range(0, len(firsts), IN_QUERY_CHUNK_SIZE):
+            chunk = firsts[start:start + IN_QUERY_CHUNK_SIZE]
+            query = db.session.query(first, second).filter(first.in_(chunk))
+            existing.update(pair for pair in ((row[0], row[1]) for row in query) if pair in pairs)
+        return existing
+
+    def _existing_values(self, column, values, *criteria):
+        """Return which of `values` already occur in `column`, in chunked IN queries"""
+        values = list(set(values))
+        existing = set()
+        for start in range(0, len(values), IN_QUERY_CHUNK_SIZE):
+            chunk = values[start:start + IN_QUERY_CHUNK_SIZE]
+            query = db.session.query(column).filter(column.in_(chunk), *criteria)
+            existing.update(row[0] for row in query)
+        return existing
+
+    @replica_read
+    def get_fingerprint(self, **filters):
+        """Return (row count, latest updated_at) of the matching rows
+
+        Any insert, update or delete changes one of the two values, so the
+        pair identifies a version of the collection for conditional GETs.
+        """
+        query = db.session.query(func.count(self.model.id), func.max(self.model.updated_at))
+        return tuple(query.filter_by(**filters).one())
+
+    def _paginate(self, query, limit=None, cursor=None, descending=False):
+        """Apply keyset pagination to a query and return (items, next_cursor)
+
+        The cursor is compared against the (created_at, id) pair rather than
+        using OFFSET, so every page is an index range scan of the same cost.
+        """
+        limit = clamp_page_size(limit)
+        key = tuple_(self.model.created_at, self.model.id)
+        if cursor:
+            position = tuple_(*decode_cursor(cursor))
+            query = query.filter(key < position if descending else key > position)
+        if descending:
+            query = query.order_by(self.model.created_at.desc(), self.model.id.desc())
+        else:
+            query = query.order_by(self.model.created_at, self.model.id)
+        items = query.limit(limit + 1).all()
+        if len(items) > limit:
+            return items[:limit], encode_cursor(items[limit - 1])
+        return items, None
+
+    def get_for_update(self, instance_id):
+        """Load a row about to be written from the primary
+
+        Unlike get(), this is never routed to a replica, and a copy already
+        in the session (from a replica read or the entity cache) is
+        refreshed, so the write starts from the primary's current values.
+        """
+        return db.session.get(self.model, instance_id, populate_existing=True)
+
     def update(self, instance_id, data):
-        instance = self.get(instance_id)
+        instance = self.get_for_update(instance_id)
         if instance:
             for key, value in data.items():
                 setattr(instance, key, value)
-            db.session.commit()
+            commit()
             return instance
         return None
 
     def delete(self, instance_id):
-        instance = self.get(instance_id)
+        instance = self.get_for_update(instance_id)
         if instance:
             db.session.delete(instance)
-            db.session.commit()
+            commit()
 
+    @replica_read
     def get_by_attribute(self, attribute_name, attribute_value):
         return self.model.query.filter_by(**{attribute_name: attribute_value}).first()
+
+
+time_public_methods(SQLAlchemyRepository)
@@ -1,7 +1,9 @@
 #!/usr/bin/python3
 
 
-from app.persistence.repository import SQLAlchemyRepository
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from app.persistence.repository import SQLAlchemyRepository, replica_read
 from app.models.review import Review
 
 class ReviewRepository(SQLAlchemyRepository):
@@ -10,10 +12,20 @@ class ReviewRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Review)
     
+    @replica_read
     def get_by_place(self, place_id):
         """Get all reviews for a specific place"""
         return self.model.query.filter_by(place_id=place_id).all()
     
+    @replica_read
+    def get_page_by_place(self, place_id, limit=None, cursor=None, with_authors=False):
+        """Get one page of a place's reviews, most recent first"""
+        query = self.model.query.filter_by(place_id=place_id)
+        if with_authors:
+            query = query.options(joinedload(Review.user))
+        return self._paginate(query, limit, cursor, descending=True)
+    
+    @replica_read
     def get_by_user(self, user_id):
         """Get all reviews by a specific user"""
         return self.model.query.filter_by(user_id=user_id).all()
@@ -22,9 +34,15 @@ class ReviewRepository(SQLAlchemyRepository):
         """Get review by specific user for specific place"""
         return self.model.query.filter_by(place_id=place_id, user_id=user_id).first()
     
+    def get_reviewed_pairs(self, pairs):
+        """Return which of the given (user_id, place_id) pairs already have a review"""
+        existing = self._existing_pairs(Review.place_id, Review.user_id,
+                                        [(place_id, user_id) for user_id, place_id in pairs])
+        return {(user_id, place_id) for place_id, user_id in existing}
+
+    @replica_read
     def get_average_rating(self, place_id):
         """Get average rating for a place"""
-        from sqlalchemy import func
         result = self.model.query.filter_by(place_id=place_id).with_entities(
             func.avg(Review.rating)
         ).scalar()
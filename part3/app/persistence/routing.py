@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Read/write routing between the primary database and its read replicas
+
+Replicas are listed in SQLALCHEMY_READ_REPLICAS. Repository read methods mark their
+queries as replica reads; RoutingSession sends those to one replica per
+session and everything else (flushes, INSERT/UPDATE/DELETE, queries
+inside a unit of work) to the primary. Once a session has written, it
+stays on the primary until it is removed at the end of the request, so a
+request always reads its own writes.
+"""
+
+import itertools
+import os
+import threading
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.dml import UpdateBase
+from app.persistence.engine import engine_options, is_sqlite_memory
+
+# session.info keys
+READ_KEY = 'hbnb_replica_read'
+WROTE_KEY = 'hbnb_wrote'
+REPLICA_KEY = 'hbnb_replica'
+UNSYNCED_KEY = 'hbnb_unsynced'
+
+
+def create_read_replicas(app, primary):
+    """Build engines for SQLALCHEMY_READ_REPLICAS, or None without replicas
+
+    Relative SQLite paths are resolved against the instance folder, as
+    Flask-SQLAlchemy does for the primary.
+    """
+    uris = app.config.get('SQLALCHEMY_READ_REPLICAS') or ()
+    if not uris:
+        return None
+    engines = []
+    for uri in uris:
+        url = make_url(uri)
+        if url.get_backend_name() == 'sqlite' and not is_sqlite_memory(uri) and not os.path.isabs(url.database):
+            url = url.set(database=os.path.join(app.instance_path, url.database))
+        engines.append(create_engine(url, **engine_options({**app.config, 'SQLALCHEMY_DATABASE_URI': uri})))
+    return ReadReplicas(primary, engines, app.config.get('REPLICA_SYNC_ON_COMMIT', True))
+
+
+class ReadReplicas:
+    """The replica engines of one app, handed out round-robin per session
+
+    When the primary and every replica are SQLite files, sync() stands in
+    for replication by copying the primary into each replica with the
+    SQLite backup API; with `sync_on_commit` that happens after every
+    commit that wrote, otherwise the replicas lag until sync() is called.
+    """
+
+    def __init__(self, primary, engines, sync_on_commit=False):
+        self.primary = primary
+        self.engines = engines
+        self.replicable = all(engine.dialect.name == 'sqlite' for engine in [primary] + engines)
+        self.sync_on_commit = sync_on_commit and self.replicable
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def choose(self):
+        return self.engines[next(self._next) % len(self.engines)]
+
+    def sync(self):
+        """Copy the primary's committed state into every replica"""
+        if not self.replicable:
+            raise RuntimeError("Replication stand-in only supports SQLite databases")
+        with self._lock:
+            source = self.primary.raw_connection()
+            try:
+                for engine in self.engines:
+                    target = engine.raw_connection()
+                    try:
+                        source.driver_connection.backup(target.driver_connection)
+                    finally:
+                        target.close()
+            finally:
+                source.close()
+
+
+class RoutingSession(Session):
+    """Session that sends replica reads to a replica bind"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info[WROTE_KEY] = self.info[UNSYNCED_KEY] = True
+            elif self.info.get(READ_KEY) and not self.info.get(WROTE_KEY):
+                replica = self._replica()
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica(self):
+        """The replica this session reads from, picked on first use"""
+        if REPLICA_KEY not in self.info:
+            replicas = current_app.extensions.get('hbnb_replicas')
+            self.info[REPLICA_KEY] = replicas.choose() if replicas else None
+        return self.info[REPLICA_KEY]
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def replicate_commit(session):
+    if session.info.pop(UNSYNCED_KEY, False):
+        replicas = current_app.extensions.get('hbnb_replicas')
+        if replicas and replicas.sync_on_commit:
+            replicas.sync()
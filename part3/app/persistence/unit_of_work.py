@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+Unit of work: group several repository writes into a single commit
+"""
+
+from contextlib import contextmanager
+from app import db
+
+DEPTH_KEY = 'hbnb_unit_of_work_depth'
+AFTER_COMMIT_KEY = 'hbnb_after_commit'
+
+
+def in_unit_of_work():
+    """Whether the current session is inside a unit of work"""
+    return db.session.info.get(DEPTH_KEY, 0) > 0
+
+
+def commit():
+    """Commit the session, or only flush it inside a unit of work
+
+    Repositories and models call this instead of db.session.commit(), so
+    inside a unit of work their writes get ids and constraint checks from
+    the flush but are made durable by the single commit at the end.
+    """
+    if in_unit_of_work():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def after_commit(callback):
+    """Run callback now, or once the enclosing unit of work has committed"""
+    if in_unit_of_work():
+        db.session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+    else:
+        callback()
+
+
+@contextmanager
+def unit_of_work():
+    """Commit everything written in the block once, or roll it all back
+
+    Nested blocks join the outermost one. Callbacks registered with
+    after_commit run after the outermost commit and are dropped on rollback.
+    """
+    info = db.session.info
+    depth = info.get(DEPTH_KEY, 0)
+    info[DEPTH_KEY] = depth + 1
+    try:
+        yield
+        if depth == 0:
+            info[DEPTH_KEY] = 0
+            db.session.commit()
+    except BaseException:
+        if depth == 0:
+            info.pop(AFTER_COMMIT_KEY, None)
+            db.session.rollback()
+        raise
+    finally:
+        info[DEPTH_KEY] = depth
+    if depth == 0:
+        for callback in info.pop(AFTER_COMMIT_KEY, []):
+            callback()
@@ -2,10 +2,14 @@
 
 
 from app.persistence.repository import SQLAlchemyRepository
+from sqlalchemy import update
 from app.models.user import User
+from app import db
+from app.persistence.unit_of_work import commit
 
 class UserRepository(SQLAlchemyRepository):
     """User-specific repository with additional methods"""
+    secret_columns = ('password_hash',)
     
     def __init__(self):
         super().__init__(User)
@@ -17,3 +21,19 @@ class UserRepository(SQLAlchemyRepository):
     def email_exists(self, email):
         """Check if email already exists"""
         return self.get_by_email(email) is not None
+
+    def get_existing_emails(self, emails):
+        """Return which of the given emails are already registered"""
+        return self._existing_values(User.email, [email.lower() for email in emails])
+
+    def replace_password_hash(self, user_id, old_hash, new_hash):
+        """Swap a user's password hash if it is still `old_hash`
+
+        The compare-and-set keeps a background rehash from overwriting a
+        password changed in the meantime. Returns whether a row changed.
+        """
+        result = db.session.execute(
+            update(User).where(User.id == user_id, User.password_hash == old_hash).values(password_hash=new_hash)
+        )
+        commit()
+        return result.rowcount == 1
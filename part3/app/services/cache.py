@@ -0,0 +1,253 @@
+#!/usr/bin/python3
+"""
+Read-through entity cache used by the facade for single-entity reads
+"""
+
+import fnmatch
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+MISSING = object()
+# Marks a datetime in a JSON-encoded snapshot
+DATETIME_TAG = '$datetime'
+
+
+class LocalCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL"""
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + (ttl or self.ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {'backend': 'local', 'size': len(self._entries), 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+
+class InMemorySharedClient:
+    """Local stand-in for a shared cache server such as Redis
+
+    Implements the get/set/delete/scan_iter subset of the redis-py client
+    API that SharedCache uses, for development and tests.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None or (entry[1] is not None and entry[1] < time.monotonic()):
+                self._data.pop(name, None)
+                return None
+            return entry[0]
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._data[name] = (value, time.monotonic() + ex if ex else None)
+
+    def delete(self, *names):
+        with self._lock:
+            for name in names:
+                self._data.pop(name, None)
+
+    def scan_iter(self, match='*'):
+        with self._lock:
+            names = list(self._data)
+        return (name for name in names if fnmatch.fnmatchcase(name, match))
+
+
+def encode_snapshot(value):
+    """JSON text of a snapshot, with datetimes tagged so they round-trip"""
+    return json.dumps(value, default=_encode_datetime, separators=(',', ':'))
+
+
+def decode_snapshot(raw):
+    return json.loads(raw, object_hook=_decode_datetime)
+
+
+def _encode_datetime(value):
+    if isinstance(value, datetime):
+        return {DATETIME_TAG: value.isoformat()}
+    raise TypeError(f"Cannot cache a {type(value).__name__}")
+
+
+def _decode_datetime(value):
+    if len(value) == 1 and DATETIME_TAG in value:
+        return datetime.fromisoformat(value[DATETIME_TAG])
+    return value
+
+
+class SharedCache:
+    """Cache stored in a shared key/value server, visible to every worker
+
+    Values are stored as JSON, never pickled, so whoever can write to the
+    server cannot make the app run code. Only keys under `prefix` are
+    ever read, written or cleared; the rest of the database is left alone.
+    """
+
+    def __init__(self, client, ttl=60, prefix='hbnb:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        return decode_snapshot(raw)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, encode_snapshot(value), ex=ttl or self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        for start in range(0, len(keys), 500):
+            self.client.delete(*keys[start:start + 500])
+
+    def stats(self):
+        return {'backend': 'shared', 'hits': self.hits, 'misses': self.misses}
+
+
+class NullCache:
+    """Cache that stores nothing, for disabling caching"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        self.misses += 1
+        return MISSING
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {'backend': 'null', 'hits': 0, 'misses': self.misses}
+
+
+class EntityCache:
+    """Caches ORM entities as column snapshots keyed by model and id
+
+    Snapshots are plain dicts, so they survive the end of the session that
+    loaded them and can be stored as JSON in a shared backend. On a hit the
+    entity is rebuilt and attached to the current session without a query,
+    so lazy relationships still load normally.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def key(model, instance_id):
+        return f'{model.__name__}:{instance_id}'
+
+    def get(self, session, model, instance_id):
+        """Return the entity from the session, the cache, or None"""
+        existing = session.identity_map.get(identity_key(model, instance_id))
+        if existing is not None:
+            return existing
+        snapshot = self.backend.get(self.key(model, instance_id))
+        if snapshot is MISSING:
+            return None
+        instance = inspect(model).class_manager.new_instance()
+        for name, value in snapshot.items():
+            set_committed_value(instance, name, value)
+        make_transient_to_detached(instance)
+        session.add(instance)
+        return instance
+
+    def put(self, instance):
+        mapper = inspect(instance).mapper
+        snapshot = {attr.key: getattr(instance, attr.key) for attr in mapper.column_attrs}
+        self.backend.set(self.key(type(instance), instance.id), snapshot)
+
+    def invalidate(self, model, instance_id):
+        self.backend.delete(self.key(model, instance_id))
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return self.backend.stats()
+
+
+def create_cache_backend(config, prefix='hbnb:'):
+    """Build the cache backend selected by the CACHE_* settings
+
+    `prefix` namespaces the keys of a shared backend.
+    """
+    cache_type = config.get('CACHE_TYPE', 'local')
+    ttl = config.get('CACHE_TTL_SECONDS', 60)
+    if cache_type == 'local':
+        return LocalCache(config.get('CACHE_MAX_SIZE', 10000), ttl)
+    if cache_type == 'shared':
+        url = config.get('CACHE_REDIS_URL')
+        if url:
+            import redis
+            return SharedCache(redis.Redis.from_url(url), ttl, prefix)
+        return SharedCache(InMemorySharedClient(), ttl, prefix)
+    if cache_type == 'null':
+        return NullCache()
+    raise ValueError(f"Unknown CACHE_TYPE: {cache_type}")
+
+
+def get_entity_cache():
+    """Return the entity cache of the current application"""
+    return current_app.extensions['hbnb_cache']
@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+"""
+Newline-delimited JSON serialization for streamed exports
+"""
+
+import json
+from datetime import date, datetime
+
+# Rows serialized into one chunk of the response or output file
+LINES_PER_CHUNK = 500
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def ndjson_chunks(rows, lines_per_chunk=LINES_PER_CHUNK):
+    """Yield rows as NDJSON text, `lines_per_chunk` lines at a time
+
+    Only one chunk is held in memory, so the output can be streamed to a
+    response or a file whatever the number of rows.
+    """
+    encode = json.JSONEncoder(default=_default, separators=(',', ':')).encode
+    lines = []
+    for row in rows:
+        lines.append(encode(row))
+        if len(lines) >= lines_per_chunk:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
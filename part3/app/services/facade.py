@@ -1,6 +1,9 @@
 #!/usr/bin/python3
 
-from app.persistence.repository import InMemoryRepository
+from flask import current_app
+from app import db
+from app.persistence.repository import InMemoryRepository, add_missing_columns, create_indexes
+from app.persistence.unit_of_work import after_commit, in_unit_of_work, unit_of_work
 from app.persistence.user_repository import UserRepository
 from app.persistence.place_repository import PlaceRepository
 from app.persistence.review_repository import ReviewRepository
@@ -9,6 +12,8 @@ from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
+from app.services.cache import get_entity_cache
+from app.utils.password_hasher import PasswordHasherBusy, get_password_hasher
 
 class HBnBFacade:
     def __init__(self):
@@ -17,6 +22,31 @@ class HBnBFacade:
         self.review_repo = ReviewRepository()
         self.amenity_repo = AmenityRepository()
 
+    def transaction(self):
+        """Unit of work: `with facade.transaction():` commits every write once
+
+        Repository calls inside the block only flush; the block commits at
+        the end or rolls everything back if it raises.
+        """
+        return unit_of_work()
+
+    def _get_cached(self, repo, instance_id):
+        """Read one entity through the entity cache, filling it on a miss"""
+        cache = get_entity_cache()
+        instance = cache.get(db.session, repo.model, instance_id)
+        if instance is None:
+            instance = repo.get(instance_id)
+            # Rows read inside a unit of work may hold uncommitted changes
+            if instance is not None and not in_unit_of_work():
+                cache.put(instance)
+        return instance
+
+    def _invalidate(self, model, *instance_ids):
+        """Drop written entities from the entity cache once they are committed"""
+        cache = get_entity_cache()
+        for instance_id in instance_ids:
+            after_commit(lambda instance_id=instance_id: cache.invalidate(model, instance_id))
+
     # User operations
     def create_user(self, user_data):
         """Create a new user"""
@@ -25,21 +55,102 @@ class HBnBFacade:
             if self.user_repo.email_exists(user_data['email']):
                 raise ValueError("Email already exists")
             
-            user = User(
-                first_name=user_data['first_name'],
-                last_name=user_data['last_name'],
-                email=user_data['email'],
-                password=user_data.get('password'),
-                is_admin=user_data.get('is_admin', False)
-            )
+            user = self._build_user(user_data)
             self.user_repo.add(user)
+            self._invalidate(User, user.id)
             return user
+        except PasswordHasherBusy:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to create user: {str(e)}")
 
+    def _build_user(self, user_data, password_hash=None):
+        """Build a user from either a plaintext `password` or a `password_hash`"""
+        password_hash = password_hash or user_data.get('password_hash')
+        if password_hash:
+            return User.from_hash(user_data['first_name'], user_data['last_name'], user_data['email'],
+                                  password_hash, is_admin=user_data.get('is_admin', False))
+        return User.from_plaintext(user_data['first_name'], user_data['last_name'], user_data['email'],
+                                   user_data.get('password'), is_admin=user_data.get('is_admin', False))
+
+    def import_users(self, users_data):
+        """Create many users at once, hashing plaintext passwords in parallel
+
+        Invalid rows are skipped and reported as (index, message) pairs;
+        the valid ones are inserted in a single transaction.
+        """
+        users_data = list(users_data)
+        errors = []
+        existing = self.user_repo.get_existing_emails(
+            [data['email'] for data in users_data if isinstance(data, dict) and isinstance(data.get('email'), str)]
+        )
+        accepted = []
+        for index, data in enumerate(users_data):
+            error = self._user_row_error(data)
+            if error:
+                errors.append((index, error))
+            elif data['email'].lower() in existing:
+                errors.append((index, "Email already exists"))
+            else:
+                existing.add(data['email'].lower())
+                accepted.append((index, data))
+
+        plaintext = [data['password'] for _, data in accepted if not data.get('password_hash')]
+        hashes = iter(get_password_hasher().hash_many(plaintext))
+        users = []
+        for index, data in accepted:
+            try:
+                password_hash = None if data.get('password_hash') else next(hashes)
+                users.append(self._build_user(data, password_hash))
+            except (ValueError, TypeError) as e:
+                errors.append((index, str(e)))
+        with self.transaction():
+            self.user_repo.bulk_insert(users)
+            self._invalidate(User, *(user.id for user in users))
+        return users, sorted(errors)
+
+    @staticmethod
+    def _user_row_error(data):
+        """Why an import row cannot become a user, or None if it can"""
+        if not isinstance(data, dict):
+            return "Row must be an object"
+        missing = [field for field in ('first_name', 'last_name', 'email') if not data.get(field)]
+        if not (data.get('password') or data.get('password_hash')):
+            missing.append('password')
+        if missing:
+            return f"Missing required field: {', '.join(missing)}"
+        for field in ('first_name', 'last_name', 'email', 'password', 'password_hash'):
+            if data.get(field) is not None and not isinstance(data[field], str):
+                return f"{field} must be a string"
+        if data.get('password') and len(data['password']) < 6:
+            return "Password must be at least 6 characters long"
+        return None
+
+    def upgrade_password_hash(self, user, password):
+        """Rehash a just-verified password in the background if its hash is outdated
+
+        Returns the background future, or None when the hash is current or
+        hashing is at capacity.
+        """
+        if not user.password_needs_rehash():
+            return None
+        app = current_app._get_current_object()
+        user_id, old_hash = user.id, user.password_hash
+
+        def store(new_hash):
+            with app.app_context():
+                self.user_repo.replace_password_hash(user_id, old_hash, new_hash)
+                self._invalidate(User, user_id)
+
+        return get_password_hasher().hash_async(password, store)
+
     def get_user(self, user_id):
         """Get user by ID"""
-        return self.user_repo.get(user_id)
+        return self._get_cached(self.user_repo, user_id)
+
+    def get_users_by_ids(self, user_ids):
+        """Get users by id in request order, plus the ids that were not found"""
+        return self.user_repo.get_many(user_ids)
 
     def get_user_by_email(self, email):
         """Get user by email"""
@@ -49,9 +160,17 @@ class HBnBFacade:
         """Get all users"""
         return self.user_repo.get_all()
 
+    def get_users_page(self, limit=None, cursor=None):
+        """Get one page of users and the cursor of the next page"""
+        return self.user_repo.get_page(limit, cursor)
+
+    def get_users_fingerprint(self):
+        """Get (count, latest updated_at) of all users, for conditional GETs"""
+        return self.user_repo.get_fingerprint()
+
     def update_user(self, user_id, user_data):
         """Update user information"""
-        user = self.get_user(user_id)
+        user = self.user_repo.get_for_update(user_id)
         if not user:
             raise ValueError("User not found")
         
@@ -74,7 +193,10 @@ class HBnBFacade:
                 user.set_password(user_data['password'])
             
             user.save()
+            self._invalidate(User, user.id)
             return user
+        except PasswordHasherBusy:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to update user: {str(e)}")
 
@@ -84,21 +206,30 @@ class HBnBFacade:
         try:
             amenity = Amenity(name=amenity_data['name'])
             self.amenity_repo.add(amenity)
+            self._invalidate(Amenity, amenity.id)
             return amenity
         except Exception as e:
             raise ValueError(f"Failed to create amenity: {str(e)}")
 
     def get_amenity(self, amenity_id):
         """Get amenity by ID"""
-        return self.amenity_repo.get(amenity_id)
+        return self._get_cached(self.amenity_repo, amenity_id)
 
     def get_all_amenities(self):
         """Get all amenities"""
         return self.amenity_repo.get_all()
 
+    def get_amenities_page(self, limit=None, cursor=None):
+        """Get one page of amenities and the cursor of the next page"""
+        return self.amenity_repo.get_page(limit, cursor)
+
+    def get_amenities_fingerprint(self):
+        """Get (count, latest updated_at) of all amenities, for conditional GETs"""
+        return self.amenity_repo.get_fingerprint()
+
     def update_amenity(self, amenity_id, amenity_data):
         """Update amenity information"""
-        amenity = self.get_amenity(amenity_id)
+        amenity = self.amenity_repo.get_for_update(amenity_id)
         if not amenity:
             raise ValueError("Amenity not found")
         
@@ -109,6 +240,7 @@ class HBnBFacade:
             # Update the existing amenity
             amenity.name = updated_amenity.name
             amenity.save()
+            self._invalidate(Amenity, amenity.id)
             
             return amenity
         except Exception as e:
@@ -132,21 +264,57 @@ class HBnBFacade:
                 owner_id=place_data['owner_id']
             )
             self.place_repo.add(place)
+            self._invalidate(Place, place.id)
+            after_commit(lambda: self.place_repo.index_place(place))
             return place
         except Exception as e:
             raise ValueError(f"Failed to create place: {str(e)}")
 
     def get_place(self, place_id):
         """Get place by ID"""
-        return self.place_repo.get(place_id)
+        return self._get_cached(self.place_repo, place_id)
+
+    def get_place_with_details(self, place_id):
+        """Get place by ID with its owner and amenities eagerly loaded"""
+        return self.place_repo.get_with_details(place_id)
 
     def get_all_places(self):
         """Get all places"""
         return self.place_repo.get_all()
 
+    def get_places_page(self, limit=None, cursor=None):
+        """Get one page of places and the cursor of the next page"""
+        return self.place_repo.get_page(limit, cursor)
+
+    def get_places_fingerprint(self):
+        """Get (count, latest updated_at) of all places, for conditional GETs"""
+        return self.place_repo.get_fingerprint()
+
+    def get_place_search_fingerprint(self):
+        """Get the places fingerprint including amenity links, for search"""
+        return self.place_repo.get_search_fingerprint()
+
+    def search_places(self, filters, limit=None, cursor=None):
+        """Get one page of places matching the filters, plus facet counts
+
+        `filters` may hold min_price, max_price, min_rating, amenity_ids
+        and text. Facets are only computed for the first page.
+        """
+        places, next_cursor = self.place_repo.search(limit=limit, cursor=cursor, **filters)
+        facets = None if cursor else self.place_repo.search_facets(**filters)
+        return places, next_cursor, facets
+
+    def search_places_by_area(self, near=None, radius_km=None, bbox=None, limit=None):
+        """Get (place, distance_km) pairs inside a radius and/or bounding box"""
+        return self.place_repo.search_area(near, radius_km, bbox, limit)
+
+    def get_nearest_places(self, latitude, longitude, k):
+        """Get the k places closest to a point as (place, distance_km) pairs"""
+        return self.place_repo.nearest(latitude, longitude, k)
+
     def update_place(self, place_id, place_data):
         """Update place information"""
-        place = self.get_place(place_id)
+        place = self.place_repo.get_for_update(place_id)
         if not place:
             raise ValueError("Place not found")
         
@@ -171,6 +339,8 @@ class HBnBFacade:
                 place.longitude = place_data['longitude']
             
             place.save()
+            self._invalidate(Place, place.id)
+            after_commit(lambda: self.place_repo.index_place(place))
             return place
         except Exception as e:
             raise ValueError(f"Failed to update place: {str(e)}")
@@ -196,29 +366,47 @@ class HBnBFacade:
                 raise ValueError("User has already reviewed this place")
             
             review = Review(
-                title=review_data.get('title', ''),
-                comment=review_data['comment'],
+                text=review_data.get('text') or review_data.get('comment'),
                 rating=review_data['rating'],
                 place_id=review_data['place_id'],
                 user_id=review_data['user_id']
             )
+            # Committed together with the review by review_repo.add
+            self.place_repo.adjust_rating_aggregates(review.place_id, added=review.rating)
             self.review_repo.add(review)
+            self._invalidate(Review, review.id)
+            self._invalidate(Place, review.place_id)
             return review
         except Exception as e:
             raise ValueError(f"Failed to create review: {str(e)}")
 
     def get_review(self, review_id):
         """Get review by ID"""
-        return self.review_repo.get(review_id)
+        return self._get_cached(self.review_repo, review_id)
 
     def get_all_reviews(self):
         """Get all reviews"""
         return self.review_repo.get_all()
 
+    def get_reviews_page(self, limit=None, cursor=None):
+        """Get one page of reviews and the cursor of the next page"""
+        return self.review_repo.get_page(limit, cursor)
+
+    def get_reviews_fingerprint(self, place_id=None):
+        """Get (count, latest updated_at) of all reviews or one place's reviews"""
+        if place_id is None:
+            return self.review_repo.get_fingerprint()
+        return self.review_repo.get_fingerprint(place_id=place_id)
+
     def get_reviews_by_place(self, place_id):
         """Get all reviews for a place"""
         return self.review_repo.get_by_place(place_id)
 
+    def get_reviews_by_place_page(self, place_id, limit=None, cursor=None, with_authors=False):
+        """Get one page of a place's reviews, most recent first"""
+        return self.review_repo.get_page_by_place(place_id, limit, cursor, with_authors)
+
+
     def get_reviews_by_user(self, user_id):
         """Get all reviews by a user"""
         return self.review_repo.get_by_user(user_id)
@@ -229,28 +417,237 @@ class HBnBFacade:
 
     def update_review(self, review_id, review_data):
         """Update review information"""
-        review = self.get_review(review_id)
+        review = self.review_repo.get_for_update(review_id)
         if not review:
             raise ValueError("Review not found")
         
         try:
-            if 'title' in review_data:
-                review.title = review_data['title']
-            if 'comment' in review_data:
-                review.comment = review_data['comment']
-            if 'rating' in review_data:
-                review.rating = review_data['rating']
-            
-            review.save()
+            # The aggregates move with the review in one transaction, and
+            # only once the new rating is known to be valid
+            with self.transaction():
+                if 'rating' in review_data:
+                    Review.validate_rating(review_data['rating'])
+                    # Before the new rating is set, so autoflush cannot write it first
+                    self.place_repo.replace_review_rating(review.id, review_data['rating'])
+                    review.rating = review_data['rating']
+                if 'text' in review_data or 'comment' in review_data:
+                    review.text = review_data.get('text') or review_data.get('comment')
+                review.save()
+            self._invalidate(Review, review.id)
+            self._invalidate(Place, review.place_id)
             return review
         except Exception as e:
             raise ValueError(f"Failed to update review: {str(e)}")
 
     def delete_review(self, review_id):
         """Delete a review"""
-        review = self.get_review(review_id)
+        review = self.review_repo.get_for_update(review_id)
         if not review:
             raise ValueError("Review not found")
         
-        self.review_repo.delete(review_id)
+        with self.transaction():
+            self.place_repo.replace_review_rating(review_id)
+            self.review_repo.delete(review_id)
+        self._invalidate(Review, review_id)
+        self._invalidate(Place, review.place_id)
         return True
+
+    # Bulk operations
+    def _build_each(self, items, build):
+        """Build one instance per item, collecting (instance, None) or (None, error)"""
+        results = []
+        for item in items:
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Item must be an object")
+                results.append((build(item), None))
+            except KeyError as e:
+                results.append((None, f"Missing required field: {e.args[0]}"))
+            except (ValueError, TypeError) as e:
+                results.append((None, str(e)))
+        return results
+
+    @staticmethod
+    def _number(item, field, kind=float):
+        try:
+            return kind(item[field])
+        except (ValueError, TypeError):
+            raise ValueError(f"{field} must be a valid number")
+
+    def bulk_create_amenities(self, amenities_data):
+        """Create many amenities in one INSERT and one commit
+
+        Returns (amenity, None) or (None, error) for each item, in order.
+        """
+        taken = self.amenity_repo.get_existing_names(
+            [item['name'] for item in amenities_data if isinstance(item, dict) and isinstance(item.get('name'), str)]
+        )
+
+        def build(item):
+            amenity = Amenity(name=item['name'])
+            if amenity.name in taken:
+                raise ValueError("Amenity already exists")
+            taken.add(amenity.name)
+            return amenity
+
+        results = self._build_each(amenities_data, build)
+        with self.transaction():
+            self.amenity_repo.bulk_insert([amenity for amenity, error in results if error is None])
+        return results
+
+    def bulk_create_places(self, places_data):
+        """Create many places in one INSERT and one commit
+
+        Owners are checked with one IN query. Returns (place, None) or
+        (None, error) for each item, in order.
+        """
+        owners = self.user_repo.get_existing_ids(
+            [item.get('owner_id') for item in places_data if isinstance(item, dict) and item.get('owner_id')]
+        )
+
+        def build(item):
+            if item.get('owner_id') not in owners:
+                raise ValueError("Owner not found")
+            return Place(
+                title=item['title'],
+                description=item.get('description'),
+                price=self._number(item, 'price'),
+                latitude=self._number(item, 'latitude'),
+                longitude=self._number(item, 'longitude'),
+                owner_id=item['owner_id']
+            )
+
+        results = self._build_each(places_data, build)
+        places = [place for place, error in results if error is None]
+        with self.transaction():
+            self.place_repo.bulk_insert(places)
+            after_commit(lambda: self.place_repo.index_places(places))
+        return results
+
+    def bulk_create_reviews(self, reviews_data, user_id=None):
+        """Create many reviews in one INSERT and one commit
+
+        With `user_id` every review is written by that user; otherwise each
+        item names its own user_id. Users, places and earlier reviews are
+        checked with one IN query each, and the rating aggregates of every
+        affected place are updated by one executemany.
+        Returns (review, None) or (None, error) for each item, in order.
+        """
+        items = [item for item in reviews_data if isinstance(item, dict)]
+        if user_id is not None:
+            authors = {user_id}
+        else:
+            authors = self.user_repo.get_existing_ids([item.get('user_id') for item in items if item.get('user_id')])
+        places = self.place_repo.get_existing_ids([item.get('place_id') for item in items if item.get('place_id')])
+        reviewed = self.review_repo.get_reviewed_pairs(
+            [(user_id or item.get('user_id'), item.get('place_id')) for item in items
+             if item.get('place_id') and (user_id or item.get('user_id'))]
+        )
+
+        def build(item):
+            author = user_id or item['user_id']
+            if author not in authors:
+                raise ValueError("User not found")
+            if item['place_id'] not in places:
+                raise ValueError("Place not found")
+            if (author, item['place_id']) in reviewed:
+                raise ValueError("User has already reviewed this place")
+            rating = self._number(item, 'rating', int)
+            review = Review(text=item.get('text') or item.get('comment'), rating=rating,
+                            place_id=item['place_id'], user_id=author)
+            reviewed.add((author, review.place_id))
+            return review
+
+        results = self._build_each(reviews_data, build)
+        reviews = [review for review, error in results if error is None]
+        ratings = {}
+        for review in reviews:
+            ratings.setdefault(review.place_id, []).append(review.rating)
+        with self.transaction():
+            self.review_repo.bulk_insert(reviews)
+            self.place_repo.add_rating_aggregates(ratings)
+            self._invalidate(Place, *ratings)
+        return results
+
+    def bulk_link_amenities(self, links_data):
+        """Attach amenities to places from {'place_id', 'amenity_id'} items
+
+        Returns ((place_id, amenity_id), None) or (None, error) for each
+        item, in order.
+        """
+        items = [item for item in links_data if isinstance(item, dict)]
+        places = self.place_repo.get_existing_ids([item.get('place_id') for item in items if item.get('place_id')])
+        amenities = self.amenity_repo.get_existing_ids(
+            [item.get('amenity_id') for item in items if item.get('amenity_id')]
+        )
+        linked = self.place_repo.get_existing_amenity_links(
+            [(item.get('place_id'), item.get('amenity_id')) for item in items
+             if item.get('place_id') and item.get('amenity_id')]
+        )
+
+        def build(item):
+            link = (item['place_id'], item['amenity_id'])
+            if link[0] not in places:
+                raise ValueError("Place not found")
+            if link[1] not in amenities:
+                raise ValueError("Amenity not found")
+            if link in linked:
+                raise ValueError("Amenity already linked to this place")
+            linked.add(link)
+            return link
+
+        results = self._build_each(links_data, build)
+        links = [link for link, error in results if error is None]
+        with self.transaction():
+            self.place_repo.add_amenity_links(links)
+            self._invalidate(Place, *{place_id for place_id, _ in links})
+        return results
+
+    def get_password_hasher_stats(self):
+        """Get queue depth and latency metrics of the password hasher"""
+        return get_password_hasher().stats()
+
+    # Export
+    EXPORT_ENTITIES = ('users', 'places', 'amenities', 'reviews', 'place_amenities')
+
+    def export_rows(self, entity, batch_size=None, include_secrets=False):
+        """Stream every row of an entity as a column dict
+
+        Password hashes are only included with `include_secrets`.
+        """
+        if entity not in self.EXPORT_ENTITIES:
+            raise ValueError(f"Unknown entity: {entity}. Expected one of {', '.join(self.EXPORT_ENTITIES)}")
+        options = {'batch_size': batch_size} if batch_size else {}
+        if entity == 'place_amenities':
+            return self.place_repo.iter_amenity_links(**options)
+        repo = {'users': self.user_repo, 'places': self.place_repo,
+                'amenities': self.amenity_repo, 'reviews': self.review_repo}[entity]
+        return repo.iter_rows(include_secrets=include_secrets, **options)
+
+    def get_cache_stats(self):
+        """Get hit/miss counters of the entity cache"""
+        return get_entity_cache().stats()
+
+    def rebuild_rating_aggregates(self):
+        """Recompute every place's rating aggregates, returns places updated"""
+        count = self.place_repo.rebuild_rating_aggregates()
+        get_entity_cache().clear()
+        return count
+
+    def upgrade_schema(self):
+        """Bring a database created by an earlier release up to the models
+
+        Creates missing tables, adds missing columns and indexes, then
+        backfills geohashes and rating aggregates. Safe to run repeatedly.
+        Returns (added columns, places geohashed, places rated).
+        """
+        db.create_all()
+        tables = db.metadata.sorted_tables
+        added = add_missing_columns(tables)
+        create_indexes([index for table in tables for index in table.indexes])
+        geohashed = self.place_repo.backfill_geohash()
+        return added, geohashed, self.rebuild_rating_aggregates()
+
+    def get_top_rated_places(self, limit=None, min_reviews=1):
+        """Get the best rated places"""
+        return self.place_repo.get_top_rated(limit, min_reviews)
@@ -0,0 +1,230 @@
+#!/usr/bin/python3
+"""
+Deterministic synthetic datasets for benchmarking
+"""
+
+import bisect
+import itertools
+import math
+import random
+import uuid
+from datetime import datetime, timedelta
+from app.utils import geo
+from app.utils.password_hasher import get_password_hasher
+from app.services.facade import HBnBFacade
+
+# Every generated user logs in with this password
+GENERATED_PASSWORD = 'password123'
+# Generated timestamps fall in the two years after this date
+EPOCH = datetime(2024, 1, 1)
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+CHUNK_SIZE = 5000
+
+# Approximate total rows -> entity counts
+SCALES = {
+    '1k': {'users': 100, 'places': 100, 'amenities': 30, 'reviews': 600},
+    '10k': {'users': 1000, 'places': 1000, 'amenities': 30, 'reviews': 6000},
+    '100k': {'users': 10000, 'places': 10000, 'amenities': 30, 'reviews': 60000},
+    '1m': {'users': 100000, 'places': 100000, 'amenities': 30, 'reviews': 600000},
+}
+
+# (name, latitude, longitude, price multiplier); earlier cities get more places
+CITIES = (
+    ('Paris', 48.8566, 2.3522, 1.4), ('London', 51.5074, -0.1278, 1.6), ('New York', 40.7128, -74.0060, 1.8),
+    ('Tokyo', 35.6762, 139.6503, 1.3), ('Barcelona', 41.3874, 2.1686, 1.1), ('Rome', 41.9028, 12.4964, 1.1),
+    ('Lisbon', 38.7223, -9.1393, 0.9), ('Berlin', 52.5200, 13.4050, 1.0), ('Mexico City', 19.4326, -99.1332, 0.6),
+    ('Bangkok', 13.7563, 100.5018, 0.5), ('Cape Town', -33.9249, 18.4241, 0.7), ('Sydney', -33.8688, 151.2093, 1.5),
+    ('Buenos Aires', -34.6037, -58.3816, 0.6), ('Marrakesh', 31.6295, -7.9811, 0.5), ('Reykjavik', 64.1466, -21.9426, 1.3),
+    ('Tunis', 36.8065, 10.1815, 0.5), ('Seoul', 37.5665, 126.9780, 1.0), ('Vancouver', 49.2827, -123.1207, 1.4),
+)
+KINDS = ('Studio', 'Loft', 'Apartment', 'Cottage', 'Villa', 'Cabin', 'Townhouse', 'Room', 'Penthouse', 'Bungalow')
+ADJECTIVES = ('Cozy', 'Sunny', 'Quiet', 'Modern', 'Charming', 'Spacious', 'Bright', 'Rustic', 'Central', 'Elegant')
+AMENITIES = (
+    'WiFi', 'Kitchen', 'Air Conditioning', 'Heating', 'Washer', 'Dryer', 'Free Parking', 'TV', 'Workspace',
+    'Hair Dryer', 'Iron', 'Pool', 'Hot Tub', 'Gym', 'Breakfast', 'Fireplace', 'Balcony', 'Garden', 'BBQ Grill',
+    'Elevator', 'Crib', 'Pets Allowed', 'Smoke Alarm', 'First Aid Kit', 'Beach Access', 'Sea View', 'EV Charger',
+    'Bathtub', 'Dishwasher', 'Coffee Maker',
+)
+FIRST_NAMES = ('Ada', 'Ben', 'Chloe', 'Dev', 'Emma', 'Farid', 'Grace', 'Hugo', 'Ines', 'Jamal', 'Kira', 'Leo',
+               'Maya', 'Nour', 'Omar', 'Priya', 'Quinn', 'Rosa', 'Sami', 'Tara', 'Uma', 'Victor', 'Wen', 'Yara')
+LAST_NAMES = ('Smith', 'Garcia', 'Chen', 'Haddad', 'Muller', 'Rossi', 'Silva', 'Kim', 'Nguyen', 'Okafor',
+              'Dubois', 'Ivanova', 'Tanaka', 'Ben Ali', 'Kowalski', 'Jensen')
+REVIEW_TEXTS = ('Great stay, would come back.', 'Exactly as described.', 'Lovely host and a perfect location.',
+                'A bit noisy at night.', 'Clean and comfortable.', 'Not worth the price.', 'Amazing view!',
+                'Check-in was easy.', 'The bed was uncomfortable.', 'Perfect for a weekend trip.')
+# Exponents of the Zipf laws for city size, amenity popularity and reviews per place
+CITY_SKEW = 1.0
+AMENITY_SKEW = 0.8
+REVIEW_SKEW = 1.1
+REVIEWER_ATTEMPTS = 10
+
+
+def zipf_cum_weights(count, skew):
+    """Cumulative weights of a Zipf law over `count` ranks, for random.choices"""
+    return list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+class DatasetGenerator:
+    """Seeded generator writing a synthetic dataset straight into the database
+
+    The same seed and counts always produce the same rows, ids and
+    timestamps included. Places cluster around CITIES with log-normal
+    prices, amenities and review counts per place follow Zipf laws, and
+    every user shares GENERATED_PASSWORD through one precomputed hash.
+    Rows are written with executemany INSERTs, CHUNK_SIZE at a time.
+    """
+
+    def __init__(self, seed=42, facade=None):
+        self.random = random.Random(seed)
+        self.facade = facade or HBnBFacade()
+
+    def generate(self, users, places, amenities, reviews):
+        """Generate the dataset and return the number of rows per table"""
+        for name, repo in (('users', self.facade.user_repo), ('places', self.facade.place_repo),
+                           ('amenities', self.facade.amenity_repo), ('reviews', self.facade.review_repo)):
+            if repo.get_fingerprint()[0]:
+                raise ValueError(f"The {name} table is not empty; generate into a fresh database")
+        if places and not users:
+            raise ValueError("Places need at least one user to own them")
+        counts = {}
+        user_ids = self._generate_users(users)
+        counts['users'] = len(user_ids)
+        amenity_ids = self._generate_amenities(amenities)
+        counts['amenities'] = len(amenity_ids)
+        place_ids, owners, qualities, listed_at = self._generate_places(places, user_ids)
+        counts['places'] = len(place_ids)
+        counts['place_amenities'] = self._generate_place_amenities(place_ids, amenity_ids)
+        counts['reviews'] = self._generate_reviews(reviews, place_ids, owners, qualities, listed_at, user_ids)
+        self.facade.rebuild_rating_aggregates()
+        self.facade.place_repo.refresh_index()
+        return counts
+
+    def _uuid(self):
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    def _timestamp(self, after=EPOCH):
+        remaining = max(1, SPAN_SECONDS - int((after - EPOCH).total_seconds()))
+        return after + timedelta(seconds=self.random.randrange(remaining))
+
+    def _insert(self, repo, rows):
+        """Insert rows CHUNK_SIZE at a time, one transaction per chunk"""
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, CHUNK_SIZE))
+            if not chunk:
+                return
+            with self.facade.transaction():
+                repo.insert_rows(chunk)
+
+    def _generate_users(self, count):
+        password_hash = get_password_hasher().hash(GENERATED_PASSWORD)
+        user_ids = [self._uuid() for _ in range(count)]
+
+        def rows():
+            for index, user_id in enumerate(user_ids):
+                created_at = self._timestamp()
+                yield {'id': user_id, 'created_at': created_at, 'updated_at': created_at,
+                       'first_name': self.random.choice(FIRST_NAMES), 'last_name': self.random.choice(LAST_NAMES),
+                       'email': f'user{index}@example.com', 'password_hash': password_hash,
+                       'is_admin': index == 0}
+        self._insert(self.facade.user_repo, rows())
+        return user_ids
+
+    def _generate_amenities(self, count):
+        # Past the list, names repeat with a number: 'WiFi 2', 'Kitchen 2'...
+        names = [AMENITIES[index % len(AMENITIES)] + (f' {index // len(AMENITIES) + 1}' if index >= len(AMENITIES) else '')
+                 for index in range(count)]
+        amenity_ids = [self._uuid() for _ in names]
+        rows = []
+        for amenity_id, name in zip(amenity_ids, names):
+            created_at = self._timestamp()
+            rows.append({'id': amenity_id, 'created_at': created_at, 'updated_at': created_at, 'name': name})
+        self._insert(self.facade.amenity_repo, rows)
+        return amenity_ids
+
+    def _generate_places(self, count, user_ids):
+        """Places clustered around the cities, owned by a pool of hosts
+
+        Returns the place ids, each place's owner index, a per-place
+        quality that centres its review ratings and the creation times.
+        """
+        city_weights = zipf_cum_weights(len(CITIES), CITY_SKEW)
+        hosts = max(1, len(user_ids) // 5)
+        place_ids = [self._uuid() for _ in range(count)]
+        owners = [self.random.randrange(hosts) for _ in range(count)]
+        qualities = [self.random.uniform(2.5, 4.8) for _ in range(count)]
+        listed_at = [self._timestamp() for _ in range(count)]
+
+        def rows():
+            for place_id, owner, created_at in zip(place_ids, owners, listed_at):
+                city, latitude, longitude, multiplier = self.random.choices(CITIES, cum_weights=city_weights)[0]
+                # Most places sit near the centre, a long tail in the suburbs
+                spread = 0.03 if self.random.random() < 0.7 else 0.25
+                latitude = min(90.0, max(-90.0, self.random.gauss(latitude, spread)))
+                longitude = self.random.gauss(longitude, spread / max(0.2, math.cos(math.radians(latitude))))
+                longitude = (longitude + 180.0) % 360.0 - 180.0
+                kind = self.random.choice(KINDS)
+                price = round(max(10.0, self.random.lognormvariate(math.log(80 * multiplier), 0.5)), 2)
+                yield {'id': place_id, 'created_at': created_at, 'updated_at': created_at,
+                       'title': f'{self.random.choice(ADJECTIVES)} {kind} in {city}',
+                       'description': f'A {kind.lower()} in {city}.', 'price': price,
+                       'latitude': latitude, 'longitude': longitude, 'owner_id': user_ids[owner],
+                       'geohash': geo.encode(latitude, longitude), 'review_count': 0, 'rating_sum': 0,
+                       'rating_average': 0.0, 'rating_count_1': 0, 'rating_count_2': 0, 'rating_count_3': 0,
+                       'rating_count_4': 0, 'rating_count_5': 0}
+        self._insert(self.facade.place_repo, rows())
+        return place_ids, owners, qualities, listed_at
+
+    def _generate_place_amenities(self, place_ids, amenity_ids):
+        """Link each place to a handful of amenities, popular ones more often"""
+        if not amenity_ids:
+            return 0
+        weights = zipf_cum_weights(len(amenity_ids), AMENITY_SKEW)
+        links = []
+        for place_id in place_ids:
+            wanted = min(len(amenity_ids), max(0, int(self.random.gauss(6, 3))))
+            chosen = set()
+            while len(chosen) < wanted:
+                chosen.add(bisect.bisect(weights, self.random.random() * weights[-1]))
+            links.extend((place_id, amenity_ids[index]) for index in sorted(chosen))
+        for start in range(0, len(links), CHUNK_SIZE):
+            with self.facade.transaction():
+                self.facade.place_repo.add_amenity_links(links[start:start + CHUNK_SIZE])
+        return len(links)
+
+    def _generate_reviews(self, count, place_ids, owners, qualities, listed_at, user_ids):
+        """Zipf-distributed reviews: a few places get most of them
+
+        Owners never review their own places and nobody reviews a place
+        twice. The reviewer is redrawn up to REVIEWER_ATTEMPTS times when a
+        draw breaks either rule, then the review is skipped, so slightly
+        fewer than `count` reviews may be written.
+        """
+        if not place_ids or len(user_ids) < 2:
+            return 0
+        # Popularity rank is independent of creation order
+        ranked = list(range(len(place_ids)))
+        self.random.shuffle(ranked)
+        weights = zipf_cum_weights(len(ranked), REVIEW_SKEW)
+        reviewed = set()
+        written = 0
+
+        def rows():
+            nonlocal written
+            for _ in range(count):
+                place = ranked[bisect.bisect(weights, self.random.random() * weights[-1])]
+                for _ in range(REVIEWER_ATTEMPTS):
+                    user = self.random.randrange(len(user_ids))
+                    if user != owners[place] and (user, place) not in reviewed:
+                        break
+                else:
+                    continue
+                reviewed.add((user, place))
+                rating = min(5, max(1, round(self.random.gauss(qualities[place], 0.9))))
+                created_at = self._timestamp(after=listed_at[place])
+                written += 1
+                yield {'id': self._uuid(), 'created_at': created_at, 'updated_at': created_at,
+                       'text': self.random.choice(REVIEW_TEXTS), 'rating': rating,
+                       'place_id': place_ids[place], 'user_id': user_ids[user]}
+        self._insert(self.facade.review_repo, rows())
+        return written
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+Cache of verified access tokens and the identities they resolve to
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import math
+import time
+from flask import current_app
+from flask_jwt_extended import decode_token
+from app.services.cache import MISSING, LocalCache, create_cache_backend
+
+
+class TokenRevoked(Exception):
+    """Raised for a token whose jti is on the blocklist"""
+
+
+class UnknownIdentity(Exception):
+    """Raised for a valid token whose user no longer exists"""
+
+
+def _unverified_jti(token):
+    """Read the jti claim without checking the signature, None if unreadable"""
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return claims.get('jti') if isinstance(claims, dict) else None
+    except (IndexError, ValueError):
+        return None
+
+
+class IdentityCache:
+    """Verified identities keyed by token jti, plus a revocation blocklist
+
+    The first request with a token verifies its signature and expiry and
+    loads the user; later requests with the byte-identical token (compared
+    by digest, so a forged token reusing a jti never matches) reuse that
+    result until `ttl` seconds pass or the token expires. The short TTL
+    bounds how long a changed admin flag or deleted user goes unnoticed.
+
+    The blocklist is a dict, so every check is O(1); revoked entries are
+    dropped once the token would have expired anyway. On its own it only
+    covers this process: a token logged out here still works in other
+    workers and after a restart. Pass a shared `revoked_store` (see
+    create_revocation_store) to record revocations where every worker
+    checks them.
+    """
+
+    def __init__(self, ttl=60, max_size=10000, revoked_store=None):
+        self._verified = LocalCache(max_size, ttl)
+        self._revoked = {}
+        self._revoked_store = revoked_store
+        self._lock = threading.Lock()
+
+    def resolve(self, token):
+        """Return the identity dict of a token, verifying it on a cache miss"""
+        digest = hashlib.sha256(token.encode()).digest()
+        jti = _unverified_jti(token)
+        if jti is not None:
+            if self.is_revoked(jti):
+                raise TokenRevoked()
+            entry = self._verified.get(jti)
+            if entry is not MISSING and hmac.compare_digest(entry['digest'], digest) \
+                    and entry['expires'] > time.time():
+                return entry['identity']
+
+        # Raises jwt.ExpiredSignatureError / jwt.InvalidTokenError
+        claims = decode_token(token)
+        if self.is_revoked(claims['jti']):
+            raise TokenRevoked()
+
+        from app.persistence.user_repository import UserRepository
+        user = UserRepository().get(claims['sub'])
+        if user is None:
+            raise UnknownIdentity()
+        identity = {
+            'id': user.id,
+            'is_admin': bool(user.is_admin),
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'jti': claims['jti'],
+            'exp': claims['exp'],
+        }
+        self._verified.set(claims['jti'], {'digest': digest, 'identity': identity, 'expires': claims['exp']})
+        return identity
+
+    def revoke(self, jti, expires):
+        """Block a token until its expiry time"""
+        now = time.time()
+        with self._lock:
+            self._revoked = {key: value for key, value in self._revoked.items() if value > now}
+            self._revoked[jti] = expires
+        if self._revoked_store is not None:
+            self._revoked_store.set(jti, expires, ttl=max(1, math.ceil(expires - now)))
+        self._verified.delete(jti)
+
+    def is_revoked(self, jti):
+        if jti in self._revoked:
+            return True
+        return self._revoked_store is not None and self._revoked_store.get(jti) is not MISSING
+
+    def stats(self):
+        stats = self._verified.stats()
+        stats['revoked'] = len(self._revoked)
+        return stats
+
+
+def create_revocation_store(config):
+    """Shared store for revoked jtis when CACHE_TYPE is 'shared', else None
+
+    Without one, logouts are only enforced by the process that handled
+    them, so run a single worker or configure the shared cache.
+    """
+    if config.get('CACHE_TYPE', 'local') != 'shared':
+        return None
+    return create_cache_backend(config, prefix='hbnb:revoked:')
+
+
+def get_identity_cache():
+    """Return the identity cache of the current application"""
+    return current_app.extensions['hbnb_identity_cache']
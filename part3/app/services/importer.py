@@ -0,0 +1,197 @@
+#!/usr/bin/python3
+"""
+Streaming bulk import of users, amenities, places, reviews and amenity links
+"""
+
+import csv
+import json
+import time
+from itertools import islice
+from app.models.place_amenity import place_amenity
+from app.persistence.repository import create_indexes, drop_secondary_indexes
+from app.services.facade import HBnBFacade
+
+DEFAULT_CHUNK_SIZE = 5000
+# Entities in dependency order
+IMPORT_ORDER = ('users', 'amenities', 'places', 'reviews', 'place_amenities')
+# Indexes the bulk writes' own duplicate checks read, kept by drop_indexes
+LOOKUP_INDEXES = ('ix_reviews_place_id_rating',)
+# Foreign key fields of each entity and the entity they point to
+FOREIGN_KEYS = {
+    'places': {'owner_id': 'users'},
+    'reviews': {'user_id': 'users', 'place_id': 'places'},
+    'place_amenities': {'place_id': 'places', 'amenity_id': 'amenities'},
+}
+
+
+def read_rows(path, file_format=None):
+    """Yield (line number, row) pairs from an NDJSON or CSV file
+
+    The format follows the file extension unless given. Empty CSV cells
+    are left out of the row; a line that is not valid JSON yields None.
+    """
+    file_format = file_format or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+    with open(path, newline='', encoding='utf-8') as handle:
+        if file_format == 'csv':
+            reader = csv.DictReader(handle)
+            for row in reader:
+                row = {key: value for key, value in row.items() if value not in ('', None)}
+                if 'is_admin' in row:
+                    row['is_admin'] = row['is_admin'].strip().lower() in ('1', 'true', 'yes')
+                yield reader.line_num, row
+            return
+        for line_number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+
+
+class IdMap:
+    """Ids from the import files mapped to the ids the rows were stored under
+
+    References missing from the map are looked up in the database, one IN
+    query per chunk, so files may also point at rows that already exist.
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.ids = {}
+
+    def add(self, source_id, stored_id):
+        if source_id is not None:
+            self.ids[str(source_id)] = stored_id
+
+    def resolve(self, source_ids):
+        """Make every known id of `source_ids` translatable with get()"""
+        unknown = {str(source_id) for source_id in source_ids} - self.ids.keys()
+        for stored_id in self.repo.get_existing_ids(unknown) if unknown else ():
+            self.ids[stored_id] = stored_id
+
+    def get(self, source_id):
+        return self.ids.get(str(source_id), source_id)
+
+
+class ImportResult:
+    """Row counts, rejected rows and timing of one imported file"""
+
+    def __init__(self, entity, path):
+        self.entity = entity
+        self.path = path
+        self.rows = 0
+        self.imported = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class BulkImporter:
+    """Load NDJSON or CSV files chunk by chunk through the facade's bulk writes
+
+    Each chunk is validated by the model constructors, has its foreign keys
+    translated through the id maps and is written with executemany INSERTs
+    in one transaction, so memory is bounded by the chunk size plus the id
+    maps. Stored ids are newly generated; an `id` column in a file is only
+    used to resolve references from the files imported after it.
+    """
+
+    def __init__(self, facade=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.facade = facade or HBnBFacade()
+        self.chunk_size = chunk_size
+        self.id_maps = {
+            'users': IdMap(self.facade.user_repo),
+            'amenities': IdMap(self.facade.amenity_repo),
+            'places': IdMap(self.facade.place_repo),
+        }
+        self._create = {
+            'users': self._create_users,
+            'amenities': self.facade.bulk_create_amenities,
+            'places': self.facade.bulk_create_places,
+            'reviews': self.facade.bulk_create_reviews,
+            'place_amenities': self.facade.bulk_link_amenities,
+        }
+
+    def import_files(self, paths, file_format=None, drop_indexes=False):
+        """Import {entity: path} in dependency order and return the results
+
+        With `drop_indexes` the secondary indexes of the affected tables,
+        except LOOKUP_INDEXES, are dropped first and rebuilt once every file
+        is in.
+        """
+        unknown = set(paths) - set(IMPORT_ORDER)
+        if unknown:
+            raise ValueError(f"Unknown entity: {', '.join(sorted(unknown))}")
+        entities = [entity for entity in IMPORT_ORDER if entity in paths]
+        dropped = []
+        if drop_indexes:
+            dropped = drop_secondary_indexes([self._table(entity) for entity in entities], keep=LOOKUP_INDEXES)
+        try:
+            return [self.import_file(entity, paths[entity], file_format) for entity in entities]
+        finally:
+            create_indexes(dropped)
+
+    def import_file(self, entity, path, file_format=None):
+        """Import one file of `entity` rows, chunk by chunk"""
+        result = ImportResult(entity, path)
+        started = time.perf_counter()
+        rows = read_rows(path, file_format)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self._import_chunk(entity, chunk, result)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _import_chunk(self, entity, chunk, result):
+        result.rows += len(chunk)
+        lines, items = [], []
+        for line_number, row in chunk:
+            if isinstance(row, dict):
+                lines.append(line_number)
+                items.append(row)
+            else:
+                result.errors.append((line_number, 'Row must be a JSON object'))
+        if not items:
+            return
+        items = self._translate(entity, items)
+        for line_number, item, (created, error) in zip(lines, items, self._create[entity](items)):
+            if error is not None:
+                result.errors.append((line_number, error))
+                continue
+            result.imported += 1
+            if entity in self.id_maps:
+                self.id_maps[entity].add(item.get('id'), created.id)
+
+    def _translate(self, entity, items):
+        """Copy the items with their foreign keys rewritten to stored ids"""
+        foreign_keys = FOREIGN_KEYS.get(entity, {})
+        if not foreign_keys:
+            return items
+        items = [dict(item) for item in items]
+        for field, target in foreign_keys.items():
+            id_map = self.id_maps[target]
+            id_map.resolve(item[field] for item in items if item.get(field) is not None)
+            for item in items:
+                if item.get(field) is not None:
+                    item[field] = id_map.get(item[field])
+        return items
+
+    def _create_users(self, items):
+        """facade.import_users, reshaped into per-item results"""
+        users, errors = self.facade.import_users(items)
+        failed = dict(errors)
+        created = iter(users)
+        return [(None, failed[index]) if index in failed else (next(created), None) for index in range(len(items))]
+
+    def _table(self, entity):
+        if entity == 'place_amenities':
+            return place_amenity
+        repos = {'users': self.facade.user_repo, 'amenities': self.facade.amenity_repo,
+                 'places': self.facade.place_repo, 'reviews': self.facade.review_repo}
+        return repos[entity].model.__table__
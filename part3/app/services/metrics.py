@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""
+Operational metrics served at /metrics in the Prometheus text format
+
+Requests are counted and timed per namespace, route, method and status;
+repository calls per model and operation (see timed_operation).
+Connection pools, caches and the password hasher are sampled when the
+endpoint is scraped.
+"""
+
+import hmac
+import time
+from flask import Response, g, request
+from app.persistence.repository import repository_metrics
+from app.utils.metrics import CONTENT_TYPE, MetricsRegistry
+
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+STARTED_KEY = 'hbnb_request_started'
+
+
+class AppMetrics:
+    """The metric families recorded by the app"""
+
+    def __init__(self):
+        self.registry = MetricsRegistry()
+        self.requests = self.registry.counter(
+            'hbnb_http_requests_total', 'HTTP requests handled',
+            ('namespace', 'route', 'method', 'status'))
+        self.request_duration = self.registry.histogram(
+            'hbnb_http_request_duration_seconds', 'Time to handle an HTTP request',
+            ('namespace', 'route', 'method'), REQUEST_BUCKETS)
+
+    def observe_request(self, namespace, route, method, status, seconds):
+        self.requests.inc((namespace, route, method, str(status)))
+        self.request_duration.observe(seconds, (namespace, route, method))
+
+    def render(self, app):
+        return self.registry.render() + repository_metrics.render(collect_gauges(app))
+
+
+def route_namespaces(app, api):
+    """Map each endpoint to its (namespace, route) labels
+
+    Only routed endpoints get labels; anything else (404s) is reported as
+    route "unmatched" so a scanner cannot grow the label set without bound.
+    """
+    namespaces = sorted(((api.ns_paths.get(ns, ns.path).rstrip('/'), ns.name) for ns in api.namespaces),
+                        key=lambda entry: len(entry[0]), reverse=True)
+    labels = {}
+    for rule in app.url_map.iter_rules():
+        name = next((name for path, name in namespaces if rule.rule == path or rule.rule.startswith(path + '/')), '')
+        labels[rule.endpoint] = (name, rule.rule)
+    return labels
+
+
+def collect_gauges(app):
+    """Sample pools, caches and the password hasher for a scrape"""
+    from app import db
+    engines = [('primary', db.engine)]
+    replicas = app.extensions.get('hbnb_replicas')
+    if replicas:
+        engines += [(f'replica_{index}', engine) for index, engine in enumerate(replicas.engines)]
+    pool = []
+    for role, engine in engines:
+        for state in ('size', 'checkedin', 'checkedout', 'overflow'):
+            reading = getattr(engine.pool, state, None)
+            if reading is not None:
+                pool.append(({'engine': role, 'state': state}, reading()))
+
+    caches, hit_ratios = [], []
+    for name, cache in (('entity', app.extensions.get('hbnb_cache')),
+                        ('identity', app.extensions.get('hbnb_identity_cache'))):
+        if cache is None:
+            continue
+        stats = cache.stats()
+        caches += [({'cache': name, 'stat': key}, value) for key, value in stats.items() if _is_number(value)]
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        hit_ratios.append(({'cache': name}, stats.get('hits', 0) / lookups if lookups else 0))
+
+    hasher = []
+    password_hasher = app.extensions.get('hbnb_password_hasher')
+    if password_hasher is not None:
+        hasher = [({'stat': key}, value) for key, value in password_hasher.stats().items() if _is_number(value)]
+
+    return [
+        ('hbnb_db_pool_connections', 'Database pool connections by state', pool),
+        ('hbnb_cache', 'Cache hits, misses, evictions and size since start', caches),
+        ('hbnb_cache_hit_ratio', 'Share of cache lookups that hit since start', hit_ratios),
+        ('hbnb_password_hasher', 'Password hasher queue depth, workers, completed and rejected jobs', hasher),
+    ]
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def init_metrics(app, api):
+    """Record request metrics for `app` and serve them at /metrics
+
+    Call once every namespace is registered. METRICS_TOKEN, if set, must
+    be sent as a bearer token to read the endpoint.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    metrics = app.extensions['hbnb_metrics'] = AppMetrics()
+    labels = route_namespaces(app, api)
+
+    @app.before_request
+    def start_request_timer():
+        setattr(g, STARTED_KEY, time.perf_counter())
+
+    @app.after_request
+    def observe_request(response):
+        started = g.pop(STARTED_KEY, None)
+        if started is not None:
+            current = request._get_current_object()
+            namespace, route = labels.get(current.endpoint, ('', 'unmatched'))
+            metrics.observe_request(namespace, route, current.method, response.status_code,
+                                    time.perf_counter() - started)
+        return response
+
+    def metrics_view():
+        token = app.config.get('METRICS_TOKEN')
+        if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return Response('Unauthorized\n', 401, content_type='text/plain')
+        return Response(metrics.render(app), content_type=CONTENT_TYPE)
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+    labels['metrics'] = ('', '/metrics')
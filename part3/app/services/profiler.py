@@ -0,0 +1,200 @@
+#!/usr/bin/python3
+"""
+On-demand sampling profiler for single requests
+
+ProfilingMiddleware wraps the WSGI app. A request is profiled when it
+carries the PROFILER_HEADER together with an admin's bearer token, or
+when it is drawn at PROFILER_SAMPLE_RATE. While it runs, a sampler
+thread reads the request thread's stack every PROFILER_INTERVAL seconds;
+once the response body is done the samples are written to PROFILER_DIR
+as collapsed stacks (`<id>.folded`, the input of flamegraph.pl and
+speedscope) and a top-N summary (`<id>.txt`). The profile id is returned
+in the PROFILER_HEADER response header.
+
+With PROFILER_ENABLED off the middleware is not installed at all; when it
+is installed, an unprofiled request costs one header lookup and, with a
+sample rate set, one random draw.
+"""
+
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from werkzeug.wsgi import ClosingIterator
+
+logger = logging.getLogger(__name__)
+
+
+_switch_lock = threading.Lock()
+_active_samplers = 0
+_saved_switch_interval = None
+
+
+class StackSampler(threading.Thread):
+    """Counts the stacks seen in one thread at a fixed interval
+
+    A sampler can only run when the sampled thread releases the GIL, which
+    busy Python code does every sys.getswitchinterval() (5 ms by default).
+    While any sampler runs, the switch interval is lowered to `interval`
+    so samples land on time; it is restored when the last one stops.
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name='hbnb-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._labels = {}
+        self._stopped = threading.Event()
+
+    def start(self):
+        global _active_samplers, _saved_switch_interval
+        with _switch_lock:
+            if _active_samplers == 0:
+                _saved_switch_interval = sys.getswitchinterval()
+                sys.setswitchinterval(min(_saved_switch_interval, self.interval))
+            _active_samplers += 1
+        super().start()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = self._stack(frame)
+            # the sampled thread may already be inside stop()
+            if not self._stopped.is_set():
+                self.samples[stack] += 1
+
+    def stop(self):
+        global _active_samplers
+        self._stopped.set()
+        self.join()
+        with _switch_lock:
+            _active_samplers -= 1
+            if _active_samplers == 0:
+                sys.setswitchinterval(_saved_switch_interval)
+        return self.samples
+
+    def _stack(self, frame):
+        """Labels of the frames from the outermost call to `frame`"""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = frame_label(code)
+            stack.append(label)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+
+def frame_label(code):
+    """'function (file:line)', with ';' removed since it separates frames"""
+    parts = code.co_filename.replace('\\', '/').split('/')
+    path = '/'.join(parts[parts.index('app'):]) if 'app' in parts else '/'.join(parts[-2:])
+    return f'{code.co_name} ({path}:{code.co_firstlineno})'.replace(';', ':')
+
+
+def collapsed(samples):
+    """Collapsed-stack lines, `frame;frame;frame count`, heaviest first"""
+    return [f"{';'.join(stack)} {count}" for stack, count in samples.most_common()]
+
+
+def summary(samples, title, top_n):
+    """Top-N functions by samples spent in them (self) and under them (total)"""
+    total = sum(samples.values())
+    own, inclusive = Counter(), Counter()
+    for stack, count in samples.items():
+        own[stack[-1]] += count
+        for label in set(stack):
+            inclusive[label] += count
+    lines = [title, f'{total} samples', '']
+    for heading, counts in (('self', own), ('total', inclusive)):
+        lines.append(f'{heading:>7}  {"%":>6}  function')
+        for label, count in counts.most_common(top_n):
+            lines.append(f'{count:7d}  {100.0 * count / total:6.1f}  {label}')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+class ProfilingMiddleware:
+    """WSGI middleware profiling selected requests of a Flask app"""
+
+    def __init__(self, app, wsgi_app):
+        self.app = app
+        self.wsgi_app = wsgi_app
+        self.header = app.config.get('PROFILER_HEADER', 'X-HBnB-Profile')
+        self.environ_key = 'HTTP_' + self.header.upper().replace('-', '_')
+        self.sample_rate = app.config.get('PROFILER_SAMPLE_RATE', 0.0)
+        self.interval = app.config.get('PROFILER_INTERVAL', 0.001)
+        self.top_n = app.config.get('PROFILER_TOP_N', 25)
+        self.directory = app.config.get('PROFILER_DIR') or os.path.join(app.instance_path, 'profiles')
+
+    def __call__(self, environ, start_response):
+        if not self.should_profile(environ):
+            return self.wsgi_app(environ, start_response)
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        started = time.perf_counter()
+        status = []
+
+        def profiled_start_response(response_status, headers, exc_info=None):
+            status.append(response_status)
+            return start_response(response_status, headers + [(self.header, profile_id)], exc_info)
+
+        def finish():
+            samples = sampler.stop()
+            elapsed = time.perf_counter() - started
+            title = (f"{environ.get('REQUEST_METHOD')} {environ.get('PATH_INFO')} "
+                     f"{status[0] if status else '-'} in {elapsed * 1000:.1f} ms, sampled every "
+                     f"{self.interval * 1000:g} ms")
+            try:
+                self.write(profile_id, samples, title)
+            except OSError:
+                logger.exception('Could not write profile %s', profile_id)
+
+        sampler.start()
+        try:
+            body = self.wsgi_app(environ, profiled_start_response)
+        except BaseException:
+            finish()
+            raise
+        return ClosingIterator(body, [finish])
+
+    def should_profile(self, environ):
+        if environ.get(self.environ_key):
+            return self.is_admin(environ.get('HTTP_AUTHORIZATION', ''))
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def is_admin(self, authorization):
+        """Whether the Authorization header holds a valid admin access token"""
+        scheme, _, token = authorization.partition(' ')
+        if scheme != 'Bearer' or not token:
+            return False
+        from app.services.identity_cache import get_identity_cache
+        with self.app.app_context():
+            try:
+                return bool(get_identity_cache().resolve(token.strip()).get('is_admin'))
+            except Exception:
+                return False
+
+    def write(self, profile_id, samples, title):
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, profile_id)
+        with open(base + '.folded', 'w') as folded:
+            folded.writelines(line + '\n' for line in collapsed(samples))
+        with open(base + '.txt', 'w') as report:
+            report.write(summary(samples, title, self.top_n) if samples else title + '\nno samples\n')
+        logger.info('Wrote profile %s: %s', base, title)
+
+
+def init_profiler(app):
+    """Wrap `app.wsgi_app` in ProfilingMiddleware if PROFILER_ENABLED is set"""
+    if app.config.get('PROFILER_ENABLED', False):
+        app.wsgi_app = ProfilingMiddleware(app, app.wsgi_app)
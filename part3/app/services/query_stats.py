@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+"""
+Per-request SQL instrumentation
+
+Engine events count every statement a request runs, time it and group
+it by fingerprint (the statement with literals and IN lists folded). The
+totals go out as a Server-Timing header and a structured log line; a
+statement repeated SQL_REPEAT_THRESHOLD times in one request is logged
+as a likely N+1, and a request running more statements than its route's
+entry in SQL_QUERY_BUDGETS warns or raises depending on SQL_QUERY_BUDGET_MODE.
+"""
+
+import json
+import logging
+import re
+import time
+import warnings
+from collections import Counter
+from functools import lru_cache
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = 'hbnb_query_stats'
+START_KEY = 'hbnb_query_started'
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more SQL statements than its route's budget"""
+
+
+class QueryBudgetWarning(UserWarning):
+    """A request ran more SQL statements than its route's budget"""
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement):
+    """Normalize a statement so executions differing only in values match"""
+    statement = _STRING.sub('?', statement)
+    statement = _NUMBER.sub('?', statement)
+    statement = _PLACEHOLDER_LIST.sub('(?+)', statement)
+    return _WHITESPACE.sub(' ', statement).strip()
+
+
+class QueryStats:
+    """Statements run while handling one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold):
+        """(fingerprint, count) of statements run at least `threshold` times"""
+        return [(statement, count) for statement, count in self.fingerprints.most_common() if count >= threshold]
+
+    def server_timing(self):
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+
+def current_stats():
+    """The QueryStats of the request being handled, if any"""
+    return g.get(STATS_KEY) if has_request_context() else None
+
+
+def route_key():
+    """'METHOD /rule' identifying the request's route in SQL_QUERY_BUDGETS"""
+    rule = request.url_rule.rule if request.url_rule is not None else request.path
+    return f'{request.method} {rule}'
+
+
+def instrument_engine(engine):
+    """Record every statement the engine runs into the current request's stats"""
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info[START_KEY].pop()
+        stats = current_stats()
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+    @event.listens_for(engine, 'handle_error')
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get(START_KEY):
+            connection.info[START_KEY].pop()
+
+
+def init_query_stats(app, engines):
+    """Instrument `engines` and report per-request SQL stats for `app`"""
+    if not app.config.get('SQL_INSTRUMENTATION', True):
+        return
+    for engine in engines:
+        instrument_engine(engine)
+
+    @app.before_request
+    def start_query_stats():
+        setattr(g, STATS_KEY, QueryStats())
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.pop(STATS_KEY, None)
+        if stats is None:
+            return response
+        response.headers.add('Server-Timing', stats.server_timing())
+        threshold = app.config.get('SQL_REPEAT_THRESHOLD', 5)
+        repeated = stats.repeated(threshold)
+        route = route_key()
+        logger.log(logging.WARNING if repeated else logging.INFO, json.dumps({
+            'event': 'sql', 'route': route, 'path': request.path, 'status': response.status_code,
+            'queries': stats.count, 'db_ms': round(stats.duration * 1000, 2),
+            'repeated': [{'statement': statement, 'count': count} for statement, count in repeated],
+        }))
+        budget = app.config.get('SQL_QUERY_BUDGETS', {}).get(route)
+        if budget is not None and stats.count > budget:
+            check_budget(app.config.get('SQL_QUERY_BUDGET_MODE', 'warn'), route, stats, budget)
+        return response
+
+
+def check_budget(mode, route, stats, budget):
+    message = f'{route} ran {stats.count} SQL statements, over its budget of {budget}'
+    if stats.fingerprints:
+        statement, count = stats.fingerprints.most_common(1)[0]
+        message += f'; most repeated ({count}x): {statement}'
+    if mode == 'raise':
+        raise QueryBudgetExceeded(message)
+    if mode == 'warn':
+        warnings.warn(message, QueryBudgetWarning)
+        logger.warning(message)
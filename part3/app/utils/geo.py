@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Geohash encoding and great-circle helpers for spatial place search
+"""
+
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0088
+# Precision stored on places: 9 characters is a ~4.8m x 4.8m cell
+GEOHASH_PRECISION = 9
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode a coordinate as a geohash string of the given precision"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, value = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        if value >= middle:
+            bits = (bits << 1) | 1
+            interval[0] = middle
+        else:
+            bits <<= 1
+            interval[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """Return the (latitude, longitude) size in degrees of a geohash cell"""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two coordinates in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Return the (min_lat, min_lon, max_lat, max_lon) box enclosing a circle
+
+    min_lon is greater than max_lon when the box crosses the antimeridian.
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+    d_lon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(latitude))))
+    if d_lon >= 180:
+        return min_lat, -180.0, max_lat, 180.0
+    min_lon = (longitude - d_lon + 540) % 360 - 180
+    max_lon = (longitude + d_lon + 540) % 360 - 180
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def in_bounding_box(latitude, longitude, box):
+    """Check whether a coordinate lies inside a (possibly wrapping) box"""
+    min_lat, min_lon, max_lat, max_lon = box
+    if not min_lat <= latitude <= max_lat:
+        return False
+    if min_lon <= max_lon:
+        return min_lon <= longitude <= max_lon
+    return longitude >= min_lon or longitude <= max_lon
+
+
+def _cell_span(low, high, size, origin):
+    """Indexes of the first and last grid cells covering [low, high]"""
+    last = int((180.0 if origin == 90 else 360.0) / size) - 1
+    return int((low + origin) // size), min(int((high + origin) // size), last)
+
+
+def covering_prefixes(box, max_cells=16):
+    """Return the geohash prefixes of a small set of cells covering a box
+
+    Picks the longest precision at which at most `max_cells` cells cover the
+    box, so the prefixes can be served by a handful of index range scans.
+    An empty prefix means the box is too large to narrow down.
+    """
+    min_lat, min_lon, max_lat, max_lon = box
+    spans = [(min_lon, max_lon)] if min_lon <= max_lon else [(min_lon, 180.0), (-180.0, max_lon)]
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_size, lon_size = cell_size(precision)
+        lat_first, lat_last = _cell_span(min_lat, max_lat, lat_size, 90)
+        lon_cells = [_cell_span(low, high, lon_size, 180) for low, high in spans]
+        count = (lat_last - lat_first + 1) * sum(last - first + 1 for first, last in lon_cells)
+        if count > max_cells:
+            continue
+        prefixes = set()
+        for lat_index in range(lat_first, lat_last + 1):
+            latitude = (lat_index + 0.5) * lat_size - 90
+            for lon_first, lon_last in lon_cells:
+                for lon_index in range(lon_first, lon_last + 1):
+                    longitude = (lon_index + 0.5) * lon_size - 180
+                    prefixes.add(encode(latitude, longitude, precision))
+        return sorted(prefixes)
+    return ['']
@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+"""
+Counters and histograms rendered in the Prometheus text format
+
+Every thread records into its own shard, a set of plain dicts that no
+other thread writes, so recording takes no lock and costs a dict lookup
+and a couple of additions. A scrape sums the shards; shards of threads
+that have exited are folded into a retired total so threaded servers
+that spawn a thread per request do not accumulate them.
+"""
+
+import threading
+from bisect import bisect_left
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Shard:
+    __slots__ = ('thread', 'series')
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        # metric -> {label values: value or bucket counts}
+        self.series = {}
+
+
+class MetricsRegistry:
+    """The metrics of one app and the per-thread shards they record into"""
+
+    def __init__(self):
+        self.metrics = []
+        self._local = threading.local()
+        self._shards = []
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=()):
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def series(self, metric):
+        """This thread's {label values: value} dict for `metric`"""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        series = shard.series.get(metric)
+        if series is None:
+            series = shard.series[metric] = {}
+        return series
+
+    def collect(self):
+        """{metric: {label values: value}} summed over every thread"""
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    live.append(shard)
+                else:
+                    _merge(self._retired, shard)
+            self._shards = live
+            totals = _Shard()
+            for shard in [self._retired] + live:
+                _merge(totals, shard)
+        return totals.series
+
+    def render(self, gauges=()):
+        """Text exposition of every metric plus `gauges`
+
+        `gauges` are (name, documentation, [(labels dict, value)]) tuples
+        sampled at scrape time.
+        """
+        collected = self.collect()
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render(collected.get(metric, {})))
+        for name, documentation, samples in gauges:
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.extend(f'{name}{format_labels(labels)} {format_value(value)}' for labels, value in samples)
+        return '\n'.join(lines) + '\n'
+
+
+def _merge(target, shard):
+    # list() snapshots a dict in one step, so a thread adding a series
+    # while we read does not break the iteration
+    for metric, series in list(shard.series.items()):
+        merged = target.series.setdefault(metric, {})
+        for labels, value in list(series.items()):
+            merged[labels] = metric.add(merged.get(labels), value)
+
+
+class Counter:
+    def __init__(self, registry, name, documentation, labelnames):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, labels=(), amount=1):
+        series = self.registry.series(self)
+        series[labels] = series.get(labels, 0) + amount
+
+    @staticmethod
+    def add(total, value):
+        return value if total is None else total + value
+
+    def render(self, series):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} counter'
+        for labels, value in sorted(series.items()):
+            yield f'{self.name}{format_labels(zip(self.labelnames, labels))} {format_value(value)}'
+
+
+class Histogram:
+    """Cumulative buckets in the Prometheus sense: le is an inclusive bound"""
+
+    def __init__(self, registry, name, documentation, labelnames, buckets):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, labels=()):
+        series = self.registry.series(self)
+        counts = series.get(labels)
+        if counts is None:
+            # one count per bucket, one for +Inf, then the sum
+            counts = series[labels] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    @staticmethod
+    def add(total, value):
+        return list(value) if total is None else [a + b for a, b in zip(total, value)]
+
+    def render(self, series):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} histogram'
+        for labels, counts in sorted(series.items()):
+            labels = list(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield f'{self.name}_bucket{format_labels(labels + [("le", format_value(bound))])} {cumulative}'
+            yield f'{self.name}_sum{format_labels(labels)} {format_value(counts[-1])}'
+            yield f'{self.name}_count{format_labels(labels)} {cumulative}'
+
+
+def format_labels(labels):
+    labels = labels.items() if isinstance(labels, dict) else labels
+    pairs = [f'{name}="{_escape(value)}"' for name, value in labels]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
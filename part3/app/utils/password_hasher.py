@@ -0,0 +1,265 @@
+#!/usr/bin/python3
+"""
+Bounded worker pool that runs password hashing off the request thread
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent import futures
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import bcrypt
+from flask import current_app
+
+ALGORITHMS = ('bcrypt', 'argon2')
+# Latency samples kept for the percentile metrics
+LATENCY_WINDOW = 1024
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; the client should retry later"""
+
+    def __init__(self, retry_after):
+        super().__init__('Password hashing is at capacity, retry shortly')
+        self.retry_after = retry_after
+
+
+def _argon2(params):
+    try:
+        from argon2 import PasswordHasher as Argon2Hasher
+    except ImportError:
+        raise RuntimeError("PASSWORD_HASH_ALGORITHM='argon2' needs the argon2-cffi package "
+                           "(pip install argon2-cffi)") from None
+    return Argon2Hasher(**(params or {}))
+
+
+def hash_password(password, algorithm='bcrypt', rounds=12, argon2_params=None):
+    """Hash a password with bcrypt at the given cost factor, or with argon2"""
+    if algorithm == 'argon2':
+        return _argon2(argon2_params).hash(password)
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def check_password(password_hash, password):
+    """Check a password against a bcrypt or argon2 hash"""
+    if password_hash.startswith('$argon2'):
+        from argon2.exceptions import InvalidHashError, VerificationError
+        try:
+            return _argon2(None).verify(password_hash, password)
+        except (InvalidHashError, VerificationError):
+            return False
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    except ValueError:
+        # Malformed or foreign hash
+        return False
+
+
+class PasswordHasher:
+    """Runs password hashing in a process pool with a bounded number of pending jobs
+
+    A process pool sidesteps the GIL, so hashing neither serializes on one
+    core nor stalls the threads serving other endpoints. At most
+    `max_pending` jobs are queued or running; beyond that `hash` and
+    `verify` raise PasswordHasherBusy immediately instead of letting a
+    login storm build an unbounded backlog. A job holds its slot until the
+    work is done, even when the caller stops waiting after `timeout`
+    seconds and gets PasswordHasherBusy. With `workers=0` jobs run inline
+    on the calling thread, still bounded by `max_pending`.
+    """
+
+    def __init__(self, workers=0, max_pending=64, rounds=12, timeout=10.0, retry_after=1,
+                 algorithm='bcrypt', argon2_params=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.algorithm = algorithm
+        self.argon2_params = dict(argon2_params or {})
+        if algorithm == 'argon2':
+            # Fails at startup, not on the first login, if argon2-cffi is missing
+            _argon2(self.argon2_params)
+        self._hash = partial(hash_password, algorithm=algorithm, rounds=rounds, argon2_params=self.argon2_params)
+        self._background = None
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._stats_lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latencies = {operation: deque(maxlen=LATENCY_WINDOW) for operation in ('hash', 'verify', 'hash_many')}
+
+    def hash(self, password):
+        """Hash a password with the configured algorithm and cost"""
+        return self._run('hash', self._hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Whether a stored hash uses another algorithm or a lower cost than configured"""
+        if self.algorithm == 'argon2':
+            return not password_hash.startswith('$argon2') or \
+                _argon2(self.argon2_params).check_needs_rehash(password_hash)
+        if not password_hash.startswith('$2'):
+            return True
+        try:
+            return int(password_hash.split('$')[2]) < self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def hash_async(self, password, callback):
+        """Hash a password on a background thread and pass the result to callback
+
+        Used for opportunistic rehashing, so a saturated pool or a failure
+        is logged and dropped; the next login simply tries again. The job
+        takes its pending slot when it is submitted, so queued rehashes
+        count against `max_pending` too.
+        """
+        if not self._acquire():
+            logger.info('Skipped background rehash: hashing at capacity')
+            return None
+
+        def job():
+            try:
+                callback(self._call('hash', self._hash, (password,)))
+            except PasswordHasherBusy:
+                logger.info('Skipped background rehash: hashing timed out')
+            except Exception:
+                logger.exception('Background rehash failed')
+
+        try:
+            with self._executor_lock:
+                if self._background is None:
+                    self._background = ThreadPoolExecutor(1, thread_name_prefix='hbnb-rehash')
+                return self._background.submit(job)
+        except BaseException:
+            self._release('hash', time.perf_counter())
+            raise
+
+    def hash_many(self, passwords):
+        """Hash a batch of passwords, spread across the worker processes
+
+        Takes a single pending slot for the whole batch, so a bulk import
+        is refused rather than queued when interactive hashing is saturated.
+        """
+        return self._run('hash_many', self._hash_batch, list(passwords), local=True)
+
+    def _hash_batch(self, passwords):
+        if not self.workers:
+            return [self._hash(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._get_executor().map(self._hash, passwords, chunksize=chunksize))
+
+    def verify(self, password_hash, password):
+        """Check a password against a stored hash"""
+        return self._run('verify', check_password, password_hash, password)
+
+    def _run(self, operation, function, *args, local=False):
+        if not self._acquire():
+            raise PasswordHasherBusy(self.retry_after)
+        return self._call(operation, function, args, local)
+
+    def _acquire(self):
+        """Take a pending slot, or count a rejection and return False"""
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._rejected += 1
+            return False
+        with self._stats_lock:
+            self._pending += 1
+        return True
+
+    def _release(self, operation, started):
+        with self._stats_lock:
+            self._pending -= 1
+            self._completed += 1
+            self._latencies[operation].append(time.perf_counter() - started)
+        self._slots.release()
+
+    def _call(self, operation, function, args, local=False):
+        """Run a job holding a slot from _acquire, releasing it when the work ends"""
+        started = time.perf_counter()
+        if local or not self.workers:
+            try:
+                return function(*args)
+            finally:
+                self._release(operation, started)
+        try:
+            future = self._get_executor().submit(function, *args)
+        except BaseException:
+            self._release(operation, started)
+            raise
+        # A worker still hashing after the timeout keeps its slot
+        future.add_done_callback(lambda future: self._release(operation, started))
+        try:
+            return future.result(timeout=self.timeout)
+        except futures.TimeoutError:
+            future.cancel()
+            raise PasswordHasherBusy(self.retry_after)
+
+    def _get_executor(self):
+        # Started on first use, after any pre-forking server has forked
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def shutdown(self):
+        """Stop the background thread and the worker processes"""
+        with self._executor_lock:
+            if self._background is not None:
+                self._background.shutdown()
+                self._background = None
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def stats(self):
+        """Queue depth, throughput counters and latency percentiles in ms"""
+        with self._stats_lock:
+            result = {
+                'workers': self.workers,
+                'algorithm': self.algorithm,
+                'rounds': self.rounds,
+                'queue_depth': self._pending,
+                'max_pending': self.max_pending,
+                'completed': self._completed,
+                'rejected': self._rejected,
+            }
+            for operation, samples in self._latencies.items():
+                ordered = sorted(samples)
+                for label, quantile in (('p50', 0.5), ('p99', 0.99)):
+                    value = ordered[min(len(ordered) - 1, int(quantile * len(ordered)))] if ordered else None
+                    result[f'{operation}_{label}_ms'] = round(value * 1000, 2) if value is not None else None
+            return result
+
+
+def create_password_hasher(config):
+    """Build the password hasher described by the PASSWORD_HASH_* settings"""
+    return PasswordHasher(
+        workers=config.get('PASSWORD_HASH_WORKERS', 0),
+        max_pending=config.get('PASSWORD_HASH_MAX_PENDING', 64),
+        rounds=config.get('BCRYPT_LOG_ROUNDS', 12),
+        timeout=config.get('PASSWORD_HASH_TIMEOUT_SECONDS', 10.0),
+        retry_after=config.get('PASSWORD_HASH_RETRY_AFTER_SECONDS', 1),
+        algorithm=config.get('PASSWORD_HASH_ALGORITHM', 'bcrypt'),
+        argon2_params={
+            'time_cost': config.get('ARGON2_TIME_COST', 3),
+            'memory_cost': config.get('ARGON2_MEMORY_COST', 65536),
+            'parallelism': config.get('ARGON2_PARALLELISM', 1),
+        },
+    )
+
+
+def get_password_hasher():
+    """Return the password hasher of the current application"""
+    return current_app.extensions['hbnb_password_hasher']
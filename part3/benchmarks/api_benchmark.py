@@ -0,0 +1,306 @@
+#!/usr/bin/python3
+"""
+Latency, throughput and query counts of the v1 API under a realistic mix
+
+Replays a weighted mix of requests (browse, search and nearest-place
+listings, place detail, login, posting a review) against a generated
+dataset and reports requests per second plus p50/p95/p99 latency and SQL
+queries per endpoint. By default the requests go through the Flask test
+client against a file-backed SQLite database generated with
+`DatasetGenerator`; with --url they go over HTTP to a running server
+whose database was filled with `flask hbnb generate` at the same --scale
+(query counts are then not available).
+
+    python benchmarks/api_benchmark.py --scale 10k --requests 2000
+    python benchmarks/api_benchmark.py --baseline benchmarks/baseline.json
+    python benchmarks/api_benchmark.py --url http://127.0.0.1:5000 --concurrency 8
+
+With --baseline the results are compared against a saved run and the exit
+status is 1 when an endpoint's p95 latency or the overall throughput got
+worse by more than --threshold, or an endpoint now runs more queries.
+--write-baseline saves the current run as the new baseline.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from config import config, Config
+from app import create_app, db
+from app.services.generator import CITIES, GENERATED_PASSWORD, SCALES, DatasetGenerator
+
+# Relative weight of each endpoint in the request mix
+MIX = {
+    'list_places': 25,
+    'search_places': 15,
+    'nearest_places': 10,
+    'place_detail': 35,
+    'login': 3,
+    'post_review': 12,
+}
+DEFAULT_THRESHOLD = 0.25
+# Logged-in users whose tokens post the reviews
+REVIEWER_POOL = 10
+
+
+def percentile(ordered, quantile):
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+class ClientTarget:
+    """Requests through the Flask test client, with per-request query counts"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+        def count(*args):
+            self._local.queries = getattr(self._local, 'queries', 0) + 1
+
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', count)
+
+    def request(self, method, path, body=None, token=None):
+        """Return (status, JSON body or None, queries run)"""
+        client = getattr(self._local, 'client', None) or self.app.test_client()
+        self._local.client = client
+        self._local.queries = 0
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        response = client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_json(silent=True), self._local.queries
+
+
+class HttpTarget:
+    """Requests over HTTP to a running server; query counts are unknown"""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(self.url + path, data=data, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                status, payload = response.status, response.read()
+        except urllib.error.HTTPError as error:
+            status, payload = error.code, error.read()
+        try:
+            return status, json.loads(payload) if payload else None, None
+        except ValueError:
+            return status, None, None
+
+
+class Workload:
+    """Draws requests of the mix against ids discovered from the dataset"""
+
+    def __init__(self, target, users):
+        self.target = target
+        self.users = users
+        self.place_ids = []
+        self.tokens = []
+
+    def prepare(self, rng):
+        """Collect place ids to open and log in the reviewers"""
+        cursor = None
+        for _ in range(5):
+            path = '/api/v1/places/?limit=100' + (f'&cursor={cursor}' if cursor else '')
+            status, page, _ = self.target.request('GET', path)
+            if status != 200:
+                raise SystemExit(f'GET {path} returned {status}; is the dataset generated?')
+            self.place_ids.extend(place['id'] for place in page['items'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        if not self.place_ids:
+            raise SystemExit('The dataset has no places')
+        for _ in range(REVIEWER_POOL):
+            status, body, _ = self.login(rng)
+            if status == 200:
+                self.tokens.append(body['access_token'])
+
+    def login(self, rng):
+        email = f'user{rng.randrange(self.users)}@example.com'
+        return self.target.request('POST', '/api/v1/auth/login', {'email': email, 'password': GENERATED_PASSWORD})
+
+    def run(self, name, rng, state):
+        """Issue one request of endpoint `name`; returns (status, queries)"""
+        if name == 'list_places':
+            cursor = state.get('cursor') if rng.random() < 0.5 else None
+            path = '/api/v1/places/?limit=20' + (f'&cursor={cursor}' if cursor else '')
+            status, page, queries = self.target.request('GET', path)
+            state['cursor'] = page.get('next_cursor') if status == 200 and page else None
+            return status, queries
+        if name == 'search_places':
+            low = rng.choice((0, 50, 100))
+            path = f'/api/v1/places/search?min_price={low}&max_price={low + rng.choice((100, 200))}&limit=20'
+            min_rating = rng.choice((None, 3, 4))
+            if min_rating:
+                path += f'&min_rating={min_rating}'
+            status, _, queries = self.target.request('GET', path)
+            return status, queries
+        if name == 'nearest_places':
+            _, latitude, longitude, _ = rng.choice(CITIES)
+            status, _, queries = self.target.request('GET', f'/api/v1/places/?near={latitude},{longitude}&nearest=10')
+            return status, queries
+        if name == 'place_detail':
+            status, _, queries = self.target.request('GET', f'/api/v1/places/{rng.choice(self.place_ids)}/detail')
+            return status, queries
+        if name == 'login':
+            status, _, queries = self.login(rng)
+            return status, queries
+        if name == 'post_review':
+            body = {'title': 'Benchmark', 'comment': 'Posted by the API benchmark.', 'rating': rng.randint(1, 5),
+                    'place_id': rng.choice(self.place_ids)}
+            status, _, queries = self.target.request('POST', '/api/v1/reviews/', body, rng.choice(self.tokens))
+            return status, queries
+        raise ValueError(f'Unknown endpoint: {name}')
+
+
+def replay(workload, requests, concurrency, seed):
+    """Run `requests` draws of the mix over `concurrency` threads"""
+    names, weights = list(MIX), list(MIX.values())
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        state, samples = {}, []
+        for _ in range(requests // concurrency + (index < requests % concurrency)):
+            name = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                status, queries = workload.run(name, rng, state)
+            except Exception:
+                status, queries = None, None
+            samples.append((name, time.perf_counter() - started, status, queries))
+        return samples
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        samples = [sample for batch in pool.map(worker, range(concurrency)) for sample in batch]
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples, elapsed):
+    """Per-endpoint counts, latency percentiles and mean queries"""
+    endpoints = {}
+    for name in MIX:
+        rows = [sample for sample in samples if sample[0] == name]
+        if not rows:
+            continue
+        ordered = sorted(latency for _, latency, _, _ in rows)
+        queries = [count for _, _, _, count in rows if count is not None]
+        endpoints[name] = {
+            'count': len(rows),
+            'rejected': sum(1 for _, _, status, _ in rows if status is not None and 400 <= status < 500),
+            'errors': sum(1 for _, _, status, _ in rows if status is None or status >= 500),
+            'p50_ms': round(percentile(ordered, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(ordered, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(ordered, 0.99) * 1000, 2),
+            'queries': round(sum(queries) / len(queries), 2) if queries else None,
+        }
+    return {'requests': len(samples), 'seconds': round(elapsed, 2),
+            'throughput_rps': round(len(samples) / elapsed, 1), 'endpoints': endpoints}
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return human-readable regressions of `results` against `baseline`"""
+    regressions = []
+    if results['throughput_rps'] < baseline['throughput_rps'] * (1 - threshold):
+        regressions.append(f"throughput {results['throughput_rps']} req/s < baseline {baseline['throughput_rps']}")
+    for name, base in baseline['endpoints'].items():
+        current = results['endpoints'].get(name)
+        if current is None:
+            continue
+        if current['errors']:
+            regressions.append(f"{name}: {current['errors']} errors")
+        if current['p95_ms'] > base['p95_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms > baseline {base['p95_ms']} ms")
+        # Query counts are deterministic for a dataset, so any increase counts
+        if None not in (current['queries'], base['queries']) and current['queries'] > base['queries'] + 0.5:
+            regressions.append(f"{name}: {current['queries']} queries > baseline {base['queries']}")
+    return regressions
+
+
+def build_app(scale, seed, database):
+    """App on a file-backed SQLite database holding the generated dataset"""
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{database}'
+    config['api-benchmark'] = BenchmarkConfig
+    app = create_app('api-benchmark')
+    with app.app_context():
+        try:
+            DatasetGenerator(seed).generate(**SCALES[scale])
+        except ValueError:
+            pass  # Reusing a database generated by an earlier run
+        db.session.remove()
+    return app
+
+
+def run(scale='10k', requests=1000, concurrency=1, seed=42, warmup=50, url=None, database=None):
+    """Generate or reuse the dataset, replay the mix and summarize it"""
+    with tempfile.TemporaryDirectory() as directory:
+        target = HttpTarget(url) if url else ClientTarget(
+            build_app(scale, seed, database or os.path.join(directory, 'benchmark.db')))
+        workload = Workload(target, SCALES[scale]['users'])
+        workload.prepare(random.Random(seed))
+        replay(workload, warmup, 1, seed + 1)
+        samples, elapsed = replay(workload, requests, concurrency, seed)
+    results = summarize(samples, elapsed)
+    results.update({'target': url or 'test-client', 'scale': scale, 'concurrency': concurrency, 'seed': seed})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scale', choices=list(SCALES), default='10k')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--warmup', type=int, default=50, help='Untimed requests before the run')
+    parser.add_argument('--url', help='Benchmark a running server instead of the test client')
+    parser.add_argument('--database', help='SQLite file to generate into or reuse (test client only)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--baseline', help='Compare against this baseline file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed relative slowdown before a regression is reported')
+    parser.add_argument('--write-baseline', help='Save the results as a baseline file')
+    args = parser.parse_args()
+
+    results = run(args.scale, args.requests, args.concurrency, args.seed, args.warmup, args.url, args.database)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['requests']} requests in {results['seconds']}s: {results['throughput_rps']} req/s "
+              f"({results['target']}, scale {results['scale']}, concurrency {results['concurrency']})")
+        print(f"{'endpoint':<16}{'count':>7}{'4xx':>6}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}")
+        for name, row in results['endpoints'].items():
+            print(f"{name:<16}{row['count']:>7}{row['rejected']:>6}{row['errors']:>8}{row['p50_ms']:>9}"
+                  f"{row['p95_ms']:>9}{row['p99_ms']:>9}{row['queries']!s:>9}")
+    if args.write_baseline:
+        with open(args.write_baseline, 'w') as handle:
+            json.dump(results, handle, indent=2)
+            handle.write('\n')
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
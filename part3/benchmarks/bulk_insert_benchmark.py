@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Bulk create throughput for places and reviews
+
+Creates places through facade.bulk_create_places and then one review per
+place through facade.bulk_create_reviews against a file-backed SQLite
+database, in batches of --batch items, and prints rows per second.
+
+    python benchmarks/bulk_insert_benchmark.py --rows 20000 --batch 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config, TestingConfig
+from app import create_app, db
+from app.models.user import User
+from app.services.facade import HBnBFacade
+
+
+def timed(create, items, batch):
+    """Create `items` in batches and return rows per second"""
+    started = time.perf_counter()
+    for start in range(0, len(items), batch):
+        results = create(items[start:start + batch])
+        errors = [error for _, error in results if error]
+        if errors:
+            raise SystemExit(f'bulk create failed: {errors[0]}')
+    return len(items) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--batch', type=int, default=5000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        class BenchmarkConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        config['benchmark'] = BenchmarkConfig
+        app = create_app('benchmark')
+        with app.app_context():
+            facade = HBnBFacade()
+            owner = User.from_plaintext('Bench', 'Owner', 'bench@example.com', 'secret123')
+            db.session.add(owner)
+            db.session.commit()
+            owner_id = owner.id
+            places = [{'title': f'Place {index}', 'description': '', 'price': 50 + index % 200,
+                       'latitude': (index % 1800) / 10 - 90, 'longitude': (index % 3600) / 10 - 180,
+                       'owner_id': owner_id} for index in range(args.rows)]
+            place_rate = timed(facade.bulk_create_places, places, args.batch)
+            place_ids = [row.id for row in db.session.execute(db.select(db.text('id')).select_from(db.table('places')))]
+            reviews = [{'text': 'Lovely stay', 'rating': 1 + index % 5, 'place_id': place_id}
+                       for index, place_id in enumerate(place_ids)]
+            review_rate = timed(lambda items: facade.bulk_create_reviews(items, owner_id), reviews, args.batch)
+            db.session.remove()
+            db.engine.dispose()
+    print(f'places:   {place_rate:10.0f} rows/s')
+    print(f'reviews:  {review_rate:10.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
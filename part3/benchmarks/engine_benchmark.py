@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+"""
+Concurrent read/write throughput with and without the SQLite engine profile
+
+Generates a dataset into a file-backed SQLite database, then runs --readers
+threads paging through places alongside --writers threads updating place
+prices, each for --seconds. The run is repeated with the old defaults
+(rollback journal, no pragmas) and with the configured SQLITE_PRAGMAS (WAL,
+synchronous=NORMAL, busy_timeout, cache and mmap sizes), and prints
+operations per second and failed operations for each.
+
+    python benchmarks/engine_benchmark.py --scale 10k --readers 4 --writers 1
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config, Config, TestingConfig
+from app import create_app, db
+from app.models.place import Place
+from app.services.facade import HBnBFacade
+from app.services.generator import SCALES, DatasetGenerator
+
+PROFILES = {
+    'rollback journal': {},
+    'wal + pragmas': Config.SQLITE_PRAGMAS,
+}
+
+
+def worker(app, operation, deadline, counts, index):
+    """Run `operation` until the deadline, counting successes and failures"""
+    with app.app_context():
+        facade = HBnBFacade()
+        done = failed = 0
+        while time.perf_counter() < deadline:
+            try:
+                operation(facade)
+                done += 1
+            except Exception:
+                db.session.rollback()
+                failed += 1
+            db.session.remove()
+        counts[index] = (done, failed)
+
+
+def run(profile, pragmas, scale, readers, writers, seconds):
+    """Generate a dataset under one pragma profile and measure mixed load"""
+    with tempfile.TemporaryDirectory() as directory:
+        class BenchmarkConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+            SQLITE_PRAGMAS = pragmas
+            CACHE_TYPE = 'null'
+        config['benchmark'] = BenchmarkConfig
+        app = create_app('benchmark')
+        with app.app_context():
+            DatasetGenerator(seed=1).generate(**SCALES[scale])
+            place_ids = [place_id for (place_id,) in db.session.query(Place.id)]
+            db.session.remove()
+        rng = random.Random(1)
+
+        def read(facade):
+            facade.get_places_page(limit=20, cursor=None)
+            facade.get_place_with_details(rng.choice(place_ids))
+
+        def write(facade):
+            facade.update_place(rng.choice(place_ids), {'price': rng.randint(20, 400)})
+
+        operations = [read] * readers + [write] * writers
+        counts = [None] * len(operations)
+        deadline = time.perf_counter() + seconds
+        threads = [threading.Thread(target=worker, args=(app, operation, deadline, counts, index))
+                   for index, operation in enumerate(operations)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with app.app_context():
+            db.engine.dispose()
+    reads, writes = counts[:readers], counts[readers:]
+    print(f'{profile:18} reads {sum(done for done, _ in reads) / seconds:8.0f}/s'
+          f'  writes {sum(done for done, _ in writes) / seconds:7.0f}/s'
+          f'  failed {sum(failed for _, failed in counts):5d}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scale', choices=sorted(SCALES), default='1k')
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=1)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+    for profile, pragmas in PROFILES.items():
+        run(profile, pragmas, args.scale, args.readers, args.writers, args.seconds)
+
+
+if __name__ == '__main__':
+    main()
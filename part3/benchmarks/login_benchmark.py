@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""
+Login latency at different password hashing settings
+
+Runs concurrent POST /api/v1/auth/login requests through the Flask test
+client for each setting and reports p50/p99 latency, throughput and how
+many logins were shed with 503. Settings are `bcrypt:<rounds>` or
+`argon2:<time_cost>:<memory_cost_kib>` (argon2 needs argon2-cffi).
+
+    python benchmarks/login_benchmark.py --logins 100 --concurrency 8 \\
+        bcrypt:10 bcrypt:12 argon2:2:19456
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.models.user import User
+from app.utils.password_hasher import PasswordHasher
+
+DEFAULT_SETTINGS = ('bcrypt:10', 'bcrypt:11', 'bcrypt:12')
+PASSWORD = 'benchmark-password'
+
+
+def parse_setting(setting):
+    """Turn 'bcrypt:12' or 'argon2:3:65536' into PasswordHasher keyword arguments"""
+    parts = setting.split(':')
+    if parts[0] == 'bcrypt' and len(parts) == 2:
+        return {'algorithm': 'bcrypt', 'rounds': int(parts[1])}
+    if parts[0] == 'argon2' and len(parts) == 3:
+        return {'algorithm': 'argon2', 'argon2_params': {
+            'time_cost': int(parts[1]), 'memory_cost': int(parts[2]), 'parallelism': 1}}
+    raise argparse.ArgumentTypeError(f'Invalid setting: {setting}')
+
+
+def percentile(ordered, quantile):
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+def run_setting(setting, logins, concurrency, workers, max_pending):
+    """Time `logins` concurrent logins with one hashing setting"""
+    app = create_app('testing')
+    hasher = PasswordHasher(workers=workers, max_pending=max_pending, **parse_setting(setting))
+    app.extensions['hbnb_password_hasher'] = hasher
+    with app.app_context():
+        db.session.add(User.from_plaintext('Bench', 'Mark', 'bench@example.com', PASSWORD))
+        db.session.commit()
+
+    def login(_):
+        started = time.perf_counter()
+        response = app.test_client().post('/api/v1/auth/login',
+                                          json={'email': 'bench@example.com', 'password': PASSWORD})
+        return time.perf_counter() - started, response.status_code
+
+    try:
+        # One warm-up login starts the worker processes outside the timing
+        login(None)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(login, range(logins)))
+        elapsed = time.perf_counter() - started
+    finally:
+        hasher.shutdown()
+
+    ordered = sorted(latency for latency, status in results if status == 200)
+    return {
+        'setting': setting,
+        'logins': logins,
+        'ok': len(ordered),
+        'shed_503': sum(1 for _, status in results if status == 503),
+        'p50_ms': round(percentile(ordered, 0.5) * 1000, 1) if ordered else None,
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 1) if ordered else None,
+        'logins_per_second': round(len(ordered) / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('settings', nargs='*', default=DEFAULT_SETTINGS)
+    parser.add_argument('--logins', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Hashing processes, 0 hashes on the request threads')
+    parser.add_argument('--max-pending', type=int, default=64)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = [run_setting(setting, args.logins, args.concurrency, args.workers, args.max_pending)
+               for setting in args.settings]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'setting':<22}{'p50 ms':>10}{'p99 ms':>10}{'logins/s':>10}{'503s':>7}")
+    for result in results:
+        print(f"{result['setting']:<22}{result['p50_ms']!s:>10}{result['p99_ms']!s:>10}"
+              f"{result['logins_per_second']:>10}{result['shed_503']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+Per-call cost of recording metrics
+
+Times AppMetrics.observe_request, a repository call through the
+timed_operation wrapper against the same call unwrapped, and a /metrics
+scrape, and prints microseconds per call.
+
+    python benchmarks/metrics_benchmark.py --calls 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.models.place import Place
+from app.persistence.repository import SQLAlchemyRepository
+
+
+class NoopRepository(SQLAlchemyRepository):
+    def noop(self):
+        return None
+
+
+def per_call_us(function, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--calls', type=int, default=200000)
+    args = parser.parse_args()
+    app = create_app('testing')
+    metrics = app.extensions['hbnb_metrics']
+    routes = [('places', f'/api/v1/places/route{index}', 'GET') for index in range(20)]
+    with app.app_context():
+        repository = NoopRepository(Place)
+        unwrapped = NoopRepository.noop.__wrapped__
+        counter = iter(range(10 ** 9))
+
+        def observe():
+            namespace, route, method = routes[next(counter) % 20]
+            metrics.observe_request(namespace, route, method, 200, 0.004)
+
+        results = {
+            'observe_request': per_call_us(observe, args.calls),
+            'repository call, unwrapped': per_call_us(lambda: unwrapped(repository), args.calls),
+            'repository call, timed': per_call_us(repository.noop, args.calls),
+        }
+        client = app.test_client()
+        results['/metrics scrape'] = per_call_us(lambda: client.get('/metrics'), 200)
+    for name, micros in results.items():
+        print(f'{name:28} {micros:10.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Write throughput with one commit per facade call versus one unit of work
+
+Creates the same amenities against a file-backed SQLite database twice,
+first with every facade call committing on its own and then inside
+`facade.transaction()`, and prints rows per second for both.
+
+    python benchmarks/unit_of_work_benchmark.py --rows 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config, TestingConfig
+from app import create_app, db
+from app.services.facade import HBnBFacade
+
+
+def run(rows, batched):
+    """Create `rows` amenities and return rows per second"""
+    with tempfile.TemporaryDirectory() as directory:
+        class BenchmarkConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        config['benchmark'] = BenchmarkConfig
+        app = create_app('benchmark')
+        with app.app_context():
+            facade = HBnBFacade()
+            started = time.perf_counter()
+            if batched:
+                with facade.transaction():
+                    for index in range(rows):
+                        facade.create_amenity({'name': f'Amenity {index}'})
+            else:
+                for index in range(rows):
+                    facade.create_amenity({'name': f'Amenity {index}'})
+            elapsed = time.perf_counter() - started
+            db.session.remove()
+            db.engine.dispose()
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    args = parser.parse_args()
+    per_call = run(args.rows, batched=False)
+    batched = run(args.rows, batched=True)
+    print(f'commit per call:  {per_call:10.0f} rows/s')
+    print(f'unit of work:     {batched:10.0f} rows/s  ({batched / per_call:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -6,11 +6,104 @@ import os
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///hbnb.db')
+    # Applied to every new SQLite connection. WAL lets readers run alongside
+    # the single writer; NORMAL sync is durable across app crashes in WAL
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    }
+    # Connection pool for file and server databases; server connections are
+    # pinged before use and recycled before the server drops idle ones
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = 30
+    DB_POOL_RECYCLE = 1800
+    DB_POOL_PRE_PING = True
+    # Read replicas for repository reads (comma-separated URLs). With SQLite
+    # files, the primary is copied into them after every committed write
+    # unless REPLICA_SYNC_ON_COMMIT is off
+    SQLALCHEMY_READ_REPLICAS = [url for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url]
+    REPLICA_SYNC_ON_COMMIT = True
+    # Per-request SQL stats (Server-Timing header and a log line per request).
+    # A route over its budget warns, or raises with SQL_QUERY_BUDGET_MODE =
+    # 'raise'; a statement repeated SQL_REPEAT_THRESHOLD times is logged as N+1
+    SQL_INSTRUMENTATION = True
+    SQL_REPEAT_THRESHOLD = 5
+    SQL_QUERY_BUDGET_MODE = 'warn'
+    SQL_QUERY_BUDGETS = {
+        'GET /api/v1/places/': 4,
+        'GET /api/v1/places/search': 6,
+        'GET /api/v1/places/top-rated': 4,
+        'GET /api/v1/places/<string:place_id>': 4,
+        'GET /api/v1/places/<string:place_id>/detail': 3,
+        'GET /api/v1/places/<string:place_id>/reviews': 5,
+        'POST /api/v1/reviews/': 10,
+        'POST /api/v1/auth/login': 3,
+    }
+    # Prometheus metrics at /metrics; set METRICS_TOKEN to require it as a bearer token
+    METRICS_ENABLED = True
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    # Sampling profiler for single requests: an admin sends PROFILER_HEADER,
+    # or PROFILER_SAMPLE_RATE picks requests at random; output goes to
+    # PROFILER_DIR (default instance/profiles)
+    PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PROFILER_HEADER = 'X-HBnB-Profile'
+    PROFILER_SAMPLE_RATE = float(os.getenv('PROFILER_SAMPLE_RATE', 0))
+    PROFILER_INTERVAL = 0.001
+    PROFILER_TOP_N = 25
+    PROFILER_DIR = os.getenv('PROFILER_DIR')
+    # Seconds before the in-process nearest-place index is reloaded from the
+    # database, bounding staleness from writes made by other processes
+    PLACE_INDEX_REFRESH_SECONDS = 300
+    # Entity cache: 'local' (per-process LRU), 'shared' (CACHE_REDIS_URL, or
+    # an in-process stand-in when unset) or 'null' to disable. 'shared' with
+    # CACHE_REDIS_URL also shares token revocations (logout) between workers;
+    # otherwise a logout only holds in the process that handled it
+    CACHE_TYPE = 'local'
+    CACHE_MAX_SIZE = 10000
+    CACHE_TTL_SECONDS = 60
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+    # Seconds a verified access token's identity is reused without checking
+    # the signature or reloading the user
+    IDENTITY_CACHE_TTL_SECONDS = 60
+    # Password hashing runs in a pool of worker processes (0 hashes inline);
+    # requests beyond PASSWORD_HASH_MAX_PENDING get a 503 with Retry-After
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # New hashes use this algorithm; on login, hashes of another algorithm or
+    # a lower cost are upgraded in the background. 'argon2' uses argon2-cffi
+    PASSWORD_HASH_ALGORITHM = os.getenv('PASSWORD_HASH_ALGORITHM', 'bcrypt')
+    ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 3))
+    ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 65536))
+    ARGON2_PARALLELISM = 1
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_MAX_PENDING = 64
+    PASSWORD_HASH_TIMEOUT_SECONDS = 10.0
+    PASSWORD_HASH_RETRY_AFTER_SECONDS = 1
+    # Largest array accepted by the POST .../bulk endpoints (413 beyond it)
+    BULK_MAX_ITEMS = 5000
 
 class DevelopmentConfig(Config):
     DEBUG = True
 
+class ProductionConfig(Config):
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 20))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+    SQL_QUERY_BUDGET_MODE = 'raise'
+
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
@@ -18,6 +18,8 @@ from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
+from app.persistence.place_repository import PlaceRepository
+from app.services.facade import HBnBFacade
 
 def init_database():
     """Initialize the database with tables and initial data"""
@@ -30,122 +32,112 @@ def init_database():
         print("✓ Tables created successfully")
         
         # Check if data already exists
+        facade = HBnBFacade()
         if db.session.query(User).count() > 0:
-            print("Database already contains data. Skipping initial data insertion.")
+            print("Database already contains data. Upgrading schema instead of inserting initial data...")
+            added, geohashed, rated = facade.upgrade_schema()
+            print(f"✓ Added columns: {', '.join(added) or 'none'}; "
+                  f"backfilled {geohashed} geohashes and {rated} rating aggregates")
             return
         
-        # Create admin user
-        print("Creating admin user...")
-        admin_user = User(
-            first_name="Admin",
-            last_name="User",
-            email="admin@hbnb.com",
-            password="admin123",
-            is_admin=True
-        )
-        db.session.add(admin_user)
-        
-        # Create regular users
-        print("Creating regular users...")
-        users_data = [
-            ("John", "Doe", "john.doe@example.com", "password123", False),
-            ("Jane", "Smith", "jane.smith@example.com", "password123", False),
-            ("Bob", "Johnson", "bob.johnson@example.com", "password123", False)
-        ]
-        
-        users = [admin_user]
-        for first_name, last_name, email, password, is_admin in users_data:
-            user = User(
-                first_name=first_name,
-                last_name=last_name,
-                email=email,
-                password=password,
-                is_admin=is_admin
-            )
-            db.session.add(user)
-            users.append(user)
-        
-        # Commit users before creating places
-        db.session.commit()
-        
-        # Create amenities
-        print("Creating amenities...")
-        amenity_names = [
-            "WiFi", "Pool", "Gym", "Parking", "Kitchen",
-            "Air Conditioning", "Heating", "TV", "Washer", "Dryer"
-        ]
-        
-        amenities = []
-        for name in amenity_names:
-            amenity = Amenity(name=name)
-            db.session.add(amenity)
-            amenities.append(amenity)
-        
-        # Create places
-        print("Creating places...")
-        places_data = [
-            ("Beautiful Beach House", "A stunning beachfront property with ocean views and modern amenities.", 150.00, 34.0522, -118.2437, users[1]),  # John Doe
-            ("Cozy Downtown Apartment", "Modern apartment in the heart of the city with easy access to public transportation.", 85.00, 40.7128, -74.0060, users[2]),  # Jane Smith
-            ("Mountain Cabin Retreat", "Peaceful cabin surrounded by nature, perfect for a quiet getaway.", 120.00, 39.7392, -104.9903, users[1]),  # John Doe
-            ("Luxury Penthouse", "High-end penthouse with panoramic city views and premium amenities.", 300.00, 41.8781, -87.6298, users[3])  # Bob Johnson
-        ]
-        
-        places = []
-        for title, description, price, latitude, longitude, owner in places_data:
-            place = Place(
-                title=title,
-                description=description,
-                price=price,
-                latitude=latitude,
-                longitude=longitude,
-                owner_id=owner.id
-            )
-            db.session.add(place)
-            places.append(place)
-        
-        # Commit places before creating reviews
-        db.session.commit()
-        
-        # Create reviews
-        print("Creating reviews...")
-        reviews_data = [
-            ("Amazing beach house with incredible ocean views! The property was clean and well-maintained.", 5, places[0], users[2]),  # Jane reviews Beach House
-            ("Great location in downtown. The apartment was modern and comfortable.", 4, places[1], users[1]),  # John reviews Downtown Apartment
-            ("Perfect for a quiet retreat. The cabin was cozy and had everything we needed.", 5, places[2], users[3]),  # Bob reviews Mountain Cabin
-            ("Luxury at its finest! The penthouse exceeded all expectations.", 5, places[3], users[1]),  # John reviews Luxury Penthouse
-            ("Good value for money. The apartment was clean and well-equipped.", 4, places[1], users[3])  # Bob reviews Downtown Apartment
-        ]
-        
-        for text, rating, place, user in reviews_data:
-            review = Review(
-                text=text,
-                rating=rating,
-                place_id=place.id,
-                user_id=user.id
-            )
-            db.session.add(review)
-        
-        # Add amenities to places
-        print("Adding amenities to places...")
-        place_amenities = [
-            # Beach House amenities
-            (places[0], [amenities[0], amenities[1], amenities[3], amenities[4], amenities[5], amenities[7]]),  # WiFi, Pool, Parking, Kitchen, AC, TV
-            # Downtown Apartment amenities
-            (places[1], [amenities[0], amenities[3], amenities[4], amenities[5], amenities[6], amenities[7]]),  # WiFi, Parking, Kitchen, AC, Heating, TV
-            # Mountain Cabin amenities
-            (places[2], [amenities[0], amenities[3], amenities[4], amenities[6], amenities[7], amenities[8], amenities[9]]),  # WiFi, Parking, Kitchen, Heating, TV, Washer, Dryer
-            # Luxury Penthouse amenities
-            (places[3], [amenities[0], amenities[1], amenities[2], amenities[3], amenities[4], amenities[5], amenities[6], amenities[7], amenities[8], amenities[9]])  # All amenities
-        ]
-        
-        # TODO: Fix amenities relationship in Place model
-        # for place, place_amenities_list in place_amenities:
-        #     for amenity in place_amenities_list:
-        #         place.amenities.append(amenity)
-        
-        # Commit all changes
-        print("Committing changes to database...")
-        db.session.commit()
+        # Seed everything in one transaction: a single commit, or nothing on error
+        with facade.transaction():
+            # Users go through the bulk import path, so every password is
+            # hashed in one hash_many batch and inserted with one executemany
+            print("Creating users...")
+            users_data = [
+                ("Admin", "User", "admin@hbnb.com", "admin123", True),
+                ("John", "Doe", "john.doe@example.com", "password123", False),
+                ("Jane", "Smith", "jane.smith@example.com", "password123", False),
+                ("Bob", "Johnson", "bob.johnson@example.com", "password123", False)
+            ]
+            users, errors = facade.import_users([
+                {'first_name': first_name, 'last_name': last_name, 'email': email,
+                 'password': password, 'is_admin': is_admin}
+                for first_name, last_name, email, password, is_admin in users_data
+            ])
+            if errors:
+                raise ValueError(f"Could not create users: {errors}")
+        
+            # Create amenities
+            print("Creating amenities...")
+            amenity_names = [
+                "WiFi", "Pool", "Gym", "Parking", "Kitchen",
+                "Air Conditioning", "Heating", "TV", "Washer", "Dryer"
+            ]
+        
+            amenities = []
+            for name in amenity_names:
+                amenity = Amenity(name=name)
+                db.session.add(amenity)
+                amenities.append(amenity)
+        
+            # Create places
+            print("Creating places...")
+            places_data = [
+                ("Beautiful Beach House", "A stunning beachfront property with ocean views and modern amenities.", 150.00, 34.0522, -118.2437, users[1]),  # John Doe
+                ("Cozy Downtown Apartment", "Modern apartment in the heart of the city with easy access to public transportation.", 85.00, 40.7128, -74.0060, users[2]),  # Jane Smith
+                ("Mountain Cabin Retreat", "Peaceful cabin surrounded by nature, perfect for a quiet getaway.", 120.00, 39.7392, -104.9903, users[1]),  # John Doe
+                ("Luxury Penthouse", "High-end penthouse with panoramic city views and premium amenities.", 300.00, 41.8781, -87.6298, users[3])  # Bob Johnson
+            ]
+        
+            places = []
+            for title, description, price, latitude, longitude, owner in places_data:
+                place = Place(
+                    title=title,
+                    description=description,
+                    price=price,
+                    latitude=latitude,
+                    longitude=longitude,
+                    owner_id=owner.id
+                )
+                db.session.add(place)
+                places.append(place)
+        
+            # Flush places before creating reviews
+            db.session.flush()
+        
+            # Create reviews
+            print("Creating reviews...")
+            reviews_data = [
+                ("Amazing beach house with incredible ocean views! The property was clean and well-maintained.", 5, places[0], users[2]),  # Jane reviews Beach House
+                ("Great location in downtown. The apartment was modern and comfortable.", 4, places[1], users[1]),  # John reviews Downtown Apartment
+                ("Perfect for a quiet retreat. The cabin was cozy and had everything we needed.", 5, places[2], users[3]),  # Bob reviews Mountain Cabin
+                ("Luxury at its finest! The penthouse exceeded all expectations.", 5, places[3], users[1]),  # John reviews Luxury Penthouse
+                ("Good value for money. The apartment was clean and well-equipped.", 4, places[1], users[3])  # Bob reviews Downtown Apartment
+            ]
+        
+            for text, rating, place, user in reviews_data:
+                review = Review(
+                    text=text,
+                    rating=rating,
+                    place_id=place.id,
+                    user_id=user.id
+                )
+                db.session.add(review)
+        
+            # Add amenities to places
+            print("Adding amenities to places...")
+            place_amenities = [
+                # Beach House amenities
+                (places[0], [amenities[0], amenities[1], amenities[3], amenities[4], amenities[5], amenities[7]]),  # WiFi, Pool, Parking, Kitchen, AC, TV
+                # Downtown Apartment amenities
+                (places[1], [amenities[0], amenities[3], amenities[4], amenities[5], amenities[6], amenities[7]]),  # WiFi, Parking, Kitchen, AC, Heating, TV
+                # Mountain Cabin amenities
+                (places[2], [amenities[0], amenities[3], amenities[4], amenities[6], amenities[7], amenities[8], amenities[9]]),  # WiFi, Parking, Kitchen, Heating, TV, Washer, Dryer
+                # Luxury Penthouse amenities
+                (places[3], [amenities[0], amenities[1], amenities[2], amenities[3], amenities[4], amenities[5], amenities[6], amenities[7], amenities[8], amenities[9]])  # All amenities
+            ]
+        
+            for place, place_amenities_list in place_amenities:
+                place.amenities.extend(place_amenities_list)
+        
+            db.session.flush()
+
+            # Reviews were inserted directly, so derive the rating aggregates
+            print("Computing rating aggregates...")
+            PlaceRepository().rebuild_rating_aggregates()
+        print("Committed changes to database")
         print("✓ Database initialized successfully!")
         
         # Display summary
@@ -22,6 +22,15 @@ CREATE TABLE IF NOT EXISTS places (
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
     owner_id VARCHAR(36) NOT NULL,
+    geohash VARCHAR(12),
+    review_count INTEGER DEFAULT 0 NOT NULL,
+    rating_sum INTEGER DEFAULT 0 NOT NULL,
+    rating_average FLOAT DEFAULT 0 NOT NULL,
+    rating_count_1 INTEGER DEFAULT 0 NOT NULL,
+    rating_count_2 INTEGER DEFAULT 0 NOT NULL,
+    rating_count_3 INTEGER DEFAULT 0 NOT NULL,
+    rating_count_4 INTEGER DEFAULT 0 NOT NULL,
+    rating_count_5 INTEGER DEFAULT 0 NOT NULL,
     created_at DATETIME NOT NULL,
     updated_at DATETIME NOT NULL,
     FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
@@ -60,6 +69,24 @@ CREATE TABLE IF NOT EXISTS place_amenities (
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_places_owner_id ON places(owner_id);
+CREATE INDEX IF NOT EXISTS ix_places_geohash ON places(geohash);
+CREATE INDEX IF NOT EXISTS ix_places_price ON places(price);
+CREATE INDEX IF NOT EXISTS ix_places_rating_average_review_count ON places(rating_average, review_count);
+CREATE INDEX IF NOT EXISTS ix_place_amenities_amenity_id_place_id ON place_amenities(amenity_id, place_id);
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id_rating ON reviews(place_id, rating);
 CREATE INDEX IF NOT EXISTS idx_reviews_place_id ON reviews(place_id);
 CREATE INDEX IF NOT EXISTS idx_reviews_user_id ON reviews(user_id);
 CREATE INDEX IF NOT EXISTS idx_amenities_name ON amenities(name);
+
+-- Indexes backing keyset pagination ordered by (created_at, id)
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_places_created_at_id ON places(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_amenities_created_at_id ON amenities(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_reviews_created_at_id ON reviews(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id_created_at_id ON reviews(place_id, created_at, id);
+
+-- Indexes backing the max(updated_at) collection fingerprints of conditional GETs
+CREATE INDEX IF NOT EXISTS ix_users_updated_at ON users(updated_at);
+CREATE INDEX IF NOT EXISTS ix_places_updated_at ON places(updated_at);
+CREATE INDEX IF NOT EXISTS ix_amenities_updated_at ON amenities(updated_at);
+CREATE INDEX IF NOT EXISTS ix_reviews_updated_at ON reviews(updated_at);
@@ -63,7 +63,7 @@ VALUES
 ('amenity-010', 'Dryer', datetime('now'), datetime('now'));
 
 -- Insert places
-INSERT INTO places (id, title, description, price, latitude, longitude, owner_id, created_at, updated_at) 
+INSERT INTO places (id, title, description, price, latitude, longitude, owner_id, geohash, created_at, updated_at) 
 VALUES 
 (
     'place-001',
@@ -73,6 +73,7 @@ VALUES
     34.0522,
     -118.2437,
     'user-001',
+    '9q5ctr186',
     datetime('now'),
     datetime('now')
 ),
@@ -84,6 +85,7 @@ VALUES
     40.7128,
     -74.0060,
     'user-002',
+    'dr5regw3p',
     datetime('now'),
     datetime('now')
 ),
@@ -95,6 +97,7 @@ VALUES
     39.7392,
     -104.9903,
     'user-001',
+    '9xj64fk3s',
     datetime('now'),
     datetime('now')
 ),
@@ -106,6 +109,7 @@ VALUES
     41.8781,
     -87.6298,
     'user-003',
+    'dp3wjztvt',
     datetime('now'),
     datetime('now')
 );
@@ -195,3 +199,14 @@ VALUES
     datetime('now'),
     datetime('now')
 );
+
+-- Derive the denormalized rating aggregates from the reviews above
+UPDATE places SET
+    review_count = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id),
+    rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM reviews WHERE reviews.place_id = places.id),
+    rating_count_1 = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating = 1),
+    rating_count_2 = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating = 2),
+    rating_count_3 = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating = 3),
+    rating_count_4 = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating = 4),
+    rating_count_5 = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating = 5);
+UPDATE places SET rating_average = CASE WHEN review_count > 0 THEN CAST(rating_sum AS FLOAT) / review_count ELSE 0 END;
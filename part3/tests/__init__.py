@@ -0,0 +1,4 @@
+#!/usr/bin/python3
+"""
+Test package for HBnB API
+"""
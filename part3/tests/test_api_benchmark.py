@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""
+Tests for the API benchmark's baseline comparison
+"""
+import unittest
+from benchmarks.api_benchmark import compare, summarize
+
+
+def results(p95_ms=10.0, queries=4.0, throughput=100.0, errors=0):
+    return {'throughput_rps': throughput, 'endpoints': {'place_detail': {
+        'count': 10, 'rejected': 0, 'errors': errors, 'p50_ms': 5.0, 'p95_ms': p95_ms, 'p99_ms': 12.0,
+        'queries': queries}}}
+
+
+class TestBaselineComparison(unittest.TestCase):
+    """Test cases for compare() and summarize()"""
+
+    def test_within_threshold_passes(self):
+        """Test that noise below the threshold is not a regression"""
+        self.assertEqual(compare(results(p95_ms=12.0, throughput=80.0), results(), threshold=0.25), [])
+
+    def test_slower_or_chattier_endpoints_regress(self):
+        """Test latency, query count, throughput and error regressions"""
+        regressions = compare(results(p95_ms=13.0, queries=5.0, throughput=70.0, errors=1), results())
+        self.assertEqual(len(regressions), 4)
+        self.assertTrue(any('queries' in regression for regression in regressions))
+
+    def test_query_counts_unknown_over_http(self):
+        """Test that missing query counts are not compared"""
+        self.assertEqual(compare(results(queries=None), results()), [])
+
+    def test_summarize(self):
+        """Test the per-endpoint percentiles and status buckets"""
+        samples = [('place_detail', 0.001 * index, 200 if index % 10 else 404, 4) for index in range(1, 101)]
+        samples.append(('login', 0.4, None, None))
+        summary = summarize(samples, elapsed=2.0)
+        detail = summary['endpoints']['place_detail']
+        self.assertEqual((detail['count'], detail['rejected'], detail['errors']), (100, 10, 0))
+        self.assertEqual((detail['p50_ms'], detail['p95_ms'], detail['queries']), (51.0, 96.0, 4.0))
+        self.assertEqual(summary['endpoints']['login']['errors'], 1)
+        self.assertEqual(summary['throughput_rps'], 50.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Tests for login, logout and the verified identity cache
+"""
+import unittest
+from datetime import timedelta
+from unittest import mock
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.user import User
+from app.services import identity_cache
+from app.services.cache import InMemorySharedClient, SharedCache
+
+
+class TestIdentityCache(unittest.TestCase):
+    """Test cases for token-authenticated routes"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database and a logged-in user"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.user = User.from_plaintext('Ada', 'Auth', 'ada@example.com', 'secret123')
+        db.session.add(self.user)
+        db.session.commit()
+        response = self.client.post('/api/v1/auth/login', json={'email': 'ada@example.com', 'password': 'secret123'})
+        self.token = response.get_json()['access_token']
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def get_protected(self, token):
+        return self.client.get('/api/v1/auth/protected', headers={'Authorization': f'Bearer {token}'})
+
+    def test_token_is_verified_once(self):
+        """Test that repeated requests with a token reuse the verified identity"""
+        with mock.patch.object(identity_cache, 'decode_token', wraps=identity_cache.decode_token) as decode:
+            for _ in range(3):
+                response = self.get_protected(self.token)
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(decode.call_count, 1)
+        self.assertIn(self.user.id, response.get_json()['message'])
+
+    def test_forged_token_with_cached_jti_is_rejected(self):
+        """Test that a cached jti does not vouch for a token with another signature"""
+        self.assertEqual(self.get_protected(self.token).status_code, 200)
+        header, payload, signature = self.token.split('.')
+        forged = f"{header}.{payload}.{'A' * len(signature)}"
+        self.assertEqual(self.get_protected(forged).status_code, 401)
+
+    def test_logout_revokes_token(self):
+        """Test that a token stops working after logout"""
+        headers = {'Authorization': f'Bearer {self.token}'}
+        self.assertEqual(self.client.post('/api/v1/auth/logout', headers=headers).status_code, 200)
+        response = self.get_protected(self.token)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json()['error'], 'Token has been revoked')
+
+    def test_revocation_is_shared_between_workers(self):
+        """Test that a logout in one worker is seen by another through the shared store"""
+        store = SharedCache(InMemorySharedClient(), prefix='hbnb:revoked:')
+        worker_a = identity_cache.IdentityCache(revoked_store=store)
+        worker_b = identity_cache.IdentityCache(revoked_store=store)
+        identity = worker_b.resolve(self.token)
+        worker_a.revoke(identity['jti'], identity['exp'])
+        with self.assertRaises(identity_cache.TokenRevoked):
+            worker_b.resolve(self.token)
+
+    def test_missing_and_expired_tokens(self):
+        """Test the 401 responses for absent and expired tokens"""
+        self.assertEqual(self.client.get('/api/v1/auth/protected').status_code, 401)
+        expired = create_access_token(identity=self.user.id, expires_delta=timedelta(seconds=-1))
+        response = self.get_protected(expired)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json()['error'], 'Token has expired')
+
+    def test_authenticated_write(self):
+        """Test that a protected write path sees the token's identity"""
+        response = self.client.post('/api/v1/places/', headers={'Authorization': f'Bearer {self.token}'},
+                                    json={'title': 'Loft', 'description': '', 'price': 80,
+                                          'latitude': 48.85, 'longitude': 2.35})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()['owner_id'], self.user.id)
+
+
+if __name__ == '__main__':
+    unittest.main()
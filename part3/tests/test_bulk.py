@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""
+Tests for the bulk create endpoints
+"""
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.models.place import Place
+from app.models.user import User
+
+
+class TestBulkCreate(unittest.TestCase):
+    """Test cases for POST /amenities/bulk, /places/bulk and /reviews/bulk"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database and a logged-in user"""
+        self.app = create_app('testing')
+        self.app.config['BULK_MAX_ITEMS'] = 10
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        user = User.from_plaintext('Bea', 'Bulk', 'bea@example.com', 'secret123')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        self.headers = self.login('bea@example.com')
+        db.session.add(User.from_plaintext('Ada', 'Admin', 'ada@example.com', 'secret123', is_admin=True))
+        db.session.commit()
+        self.admin_headers = self.login('ada@example.com')
+
+    def login(self, email):
+        response = self.client.post('/api/v1/auth/login', json={'email': email, 'password': 'secret123'})
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def place_item(self, title, latitude=48.85):
+        return {'title': title, 'description': '', 'price': 80, 'latitude': latitude, 'longitude': 2.35}
+
+    def test_amenities_partial_success(self):
+        """Test that invalid items fail alone and the rest are created"""
+        self.client.post('/api/v1/amenities/', json={'name': 'WiFi'})
+        response = self.client.post('/api/v1/amenities/bulk', json=[{'name': 'Pool'}, {'name': 'WiFi'},
+                                                                    {'name': 'Pool'}, 'Sauna', {}],
+                                    headers=self.admin_headers)
+        self.assertEqual(response.status_code, 207)
+        body = response.get_json()
+        self.assertEqual((body['created'], body['failed']), (1, 4))
+        self.assertEqual([item['status'] for item in body['items']], [201, 400, 400, 400, 400])
+        self.assertEqual(body['items'][4]['error'], 'Missing required field: name')
+
+    def test_amenities_require_admin(self):
+        """Test that only admins may bulk create amenities"""
+        items = [{'name': 'Pool'}]
+        self.assertEqual(self.client.post('/api/v1/amenities/bulk', json=items).status_code, 401)
+        response = self.client.post('/api/v1/amenities/bulk', json=items, headers=self.headers)
+        self.assertEqual(response.status_code, 403)
+
+    def test_places_use_one_commit_and_are_indexed(self):
+        """Test that places are inserted with one commit and get a geohash"""
+        items = [self.place_item(f'Loft {i}', 40 + i) for i in range(5)]
+        with mock.patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            response = self.client.post('/api/v1/places/bulk', json={'items': items}, headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(commit.call_count, 1)
+        places = Place.query.all()
+        self.assertEqual(len(places), 5)
+        self.assertTrue(all(place.geohash and place.owner_id == self.user_id for place in places))
+        nearest = self.client.get('/api/v1/places/?near=40,2.35&nearest=1').get_json()['items']
+        self.assertEqual(nearest[0]['title'], 'Loft 0')
+
+    def test_non_admin_cannot_set_owner(self):
+        """Test that a non-admin's places are always owned by them"""
+        item = dict(self.place_item('Loft'), owner_id='someone-else')
+        response = self.client.post('/api/v1/places/bulk', json=[item], headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(db.session.get(Place, response.get_json()['items'][0]['id']).owner_id, self.user_id)
+
+    def test_reviews_update_rating_aggregates(self):
+        """Test that bulk reviews update each place's aggregates"""
+        response = self.client.post('/api/v1/places/bulk', json=[self.place_item('A'), self.place_item('B')],
+                                    headers=self.headers)
+        place_a, place_b = [item['id'] for item in response.get_json()['items']]
+        response = self.client.post('/api/v1/reviews/bulk', headers=self.headers, json=[
+            {'text': 'Great', 'rating': 5, 'place_id': place_a},
+            {'text': 'Again', 'rating': 1, 'place_id': place_a},
+            {'text': 'Fine', 'rating': 3, 'place_id': place_b},
+            {'text': 'Where?', 'rating': 4, 'place_id': 'missing'},
+        ])
+        self.assertEqual(response.status_code, 207)
+        errors = [item.get('error') for item in response.get_json()['items']]
+        self.assertEqual(errors, [None, 'User has already reviewed this place', None, 'Place not found'])
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Place, place_a).review_count, 1)
+        self.assertEqual(db.session.get(Place, place_b).rating_sum, 3)
+
+    def test_too_many_items(self):
+        """Test that arrays above BULK_MAX_ITEMS are rejected"""
+        response = self.client.post('/api/v1/amenities/bulk', json=[{'name': f'A{i}'} for i in range(11)],
+                                    headers=self.admin_headers)
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.client.post('/api/v1/places/bulk', json=[], headers=self.headers).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Tests for the entity cache in front of the facade getters
+"""
+import json
+import unittest
+from datetime import datetime
+from unittest import mock
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.services.cache import (MISSING, EntityCache, InMemorySharedClient, LocalCache,
+                                SharedCache, get_entity_cache)
+from app.services.facade import HBnBFacade
+
+
+class TestLocalCache(unittest.TestCase):
+    """Test cases for the in-process LRU backend"""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted past max_size"""
+        cache = LocalCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_entries_expire(self):
+        """Test that an entry older than the TTL is a miss"""
+        cache = LocalCache(max_size=10, ttl=5)
+        with mock.patch('app.services.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with mock.patch('app.services.cache.time.monotonic', return_value=106.0):
+            self.assertIs(cache.get('a'), MISSING)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+
+class TestFacadeEntityCache(unittest.TestCase):
+    """Test cases for cached facade reads and write invalidation"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database, a user and a place"""
+        self.app = create_app('testing')
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.facade = HBnBFacade()
+        self.user = User(first_name='Ada', last_name='Host', email='ada@example.com', password_hash='x')
+        db.session.add(self.user)
+        db.session.commit()
+        self.place = Place(title='Loft', description='', price=80.0, latitude=48.85,
+                           longitude=2.35, owner_id=self.user.id)
+        db.session.add(self.place)
+        db.session.commit()
+        self.place_id = self.place.id
+        self.user_id = self.user.id
+        db.session.remove()
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def test_second_read_is_served_from_cache(self):
+        """Test that a read in a fresh session does not query the database"""
+        self.assertEqual(self.facade.get_place(self.place_id).title, 'Loft')
+        db.session.remove()
+        with mock.patch.object(self.facade.place_repo, 'get') as repo_get:
+            place = self.facade.get_place(self.place_id)
+        repo_get.assert_not_called()
+        self.assertEqual(place.title, 'Loft')
+        self.assertEqual(place.owner.id, self.user_id)
+        stats = self.facade.get_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_update_invalidates(self):
+        """Test that an update is visible on the next read"""
+        self.facade.get_place(self.place_id)
+        self.facade.update_place(self.place_id, {'title': 'Studio'})
+        db.session.remove()
+        self.assertEqual(self.facade.get_place(self.place_id).title, 'Studio')
+
+    def test_review_write_invalidates_place(self):
+        """Test that a new review refreshes the cached place aggregates"""
+        self.facade.get_place(self.place_id)
+        db.session.remove()
+        self.facade.create_review({'text': 'Great', 'rating': 4, 'user_id': self.user_id,
+                                   'place_id': self.place_id})
+        db.session.remove()
+        place = self.facade.get_place(self.place_id)
+        self.assertEqual((place.review_count, place.rating_average), (1, 4.0))
+
+    def test_shared_backend(self):
+        """Test that the shared backend round-trips snapshots through the client"""
+        self.app.extensions['hbnb_cache'] = EntityCache(SharedCache(InMemorySharedClient()))
+        self.facade.get_user(self.user_id)
+        db.session.remove()
+        user = self.facade.get_user(self.user_id)
+        self.assertEqual(user.email, 'ada@example.com')
+        self.assertEqual(get_entity_cache().stats()['hits'], 1)
+
+    def test_shared_backend_stores_json_under_its_prefix(self):
+        """Test that snapshots are JSON and clear() leaves other keys alone"""
+        client = InMemorySharedClient()
+        client.set('session:1', b'keep')
+        self.app.extensions['hbnb_cache'] = EntityCache(SharedCache(client))
+        self.facade.get_user(self.user_id)
+        raw = client.get(f'hbnb:User:{self.user_id}')
+        self.assertEqual(json.loads(raw)['email'], 'ada@example.com')
+        db.session.remove()
+        self.assertIsInstance(self.facade.get_user(self.user_id).created_at, datetime)
+
+        get_entity_cache().clear()
+        self.assertIsNone(client.get(f'hbnb:User:{self.user_id}'))
+        self.assertEqual(client.get('session:1'), b'keep')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Tests for ETag and Last-Modified conditional GETs
+"""
+import unittest
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+from app.services.facade import HBnBFacade
+
+
+class TestConditionalGet(unittest.TestCase):
+    """Test cases for 304 responses on entity and collection endpoints"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database, a place and an amenity"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.owner = User(first_name='Olive', last_name='Owner', email='olive@example.com', password_hash='x')
+        self.amenity = Amenity(name='WiFi')
+        db.session.add_all([self.owner, self.amenity])
+        db.session.commit()
+        self.place = Place(title='Loft', description='', price=80.0, latitude=48.85,
+                           longitude=2.35, owner_id=self.owner.id)
+        db.session.add(self.place)
+        db.session.commit()
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def test_entity_etag_round_trip(self):
+        """Test that a matching If-None-Match is a 304 until the place changes"""
+        url = f'/api/v1/places/{self.place.id}'
+        response = self.client.get(url)
+        etag = response.headers['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertIn('Last-Modified', response.headers)
+
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+        HBnBFacade().update_place(self.place.id, {'price': 95.0})
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_if_modified_since(self):
+        """Test that Last-Modified is honoured when no ETag is sent"""
+        url = f'/api/v1/places/{self.place.id}'
+        last_modified = self.client.get(url).headers['Last-Modified']
+        response = self.client.get(url, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, headers={'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_collection_etag_tracks_writes_and_query(self):
+        """Test that a collection ETag changes with new rows and with the query string"""
+        response = self.client.get('/api/v1/places/')
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        self.assertEqual(self.client.get('/api/v1/places/', headers={'If-None-Match': etag}).status_code, 304)
+        self.assertEqual(self.client.get('/api/v1/places/?limit=1', headers={'If-None-Match': etag}).status_code, 200)
+
+        db.session.add(Place(title='Flat', description='', price=50.0, latitude=0.0,
+                             longitude=0.0, owner_id=self.owner.id))
+        db.session.commit()
+        self.assertEqual(self.client.get('/api/v1/places/', headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_detail_etag_tracks_embedded_rows(self):
+        """Test that the detail ETag changes when an embedded owner or amenity changes"""
+        self.place.amenities.append(self.amenity)
+        db.session.commit()
+        url = f'/api/v1/places/{self.place.id}/detail'
+        etag = self.client.get(url).headers['ETag']
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+
+        HBnBFacade().update_user(self.owner.id, {'first_name': 'Olga'})
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+
+        HBnBFacade().update_amenity(self.amenity.id, {'name': 'Fibre'})
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_marshalled_amenity_endpoints(self):
+        """Test that the amenity endpoints answer 304 without a marshalled body"""
+        for url in ('/api/v1/amenities/', f'/api/v1/amenities/{self.amenity.id}'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            response = self.client.get(url, headers={'If-None-Match': response.headers['ETag']})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.data, b'')
+
+
+if __name__ == '__main__':
+    unittest.main()
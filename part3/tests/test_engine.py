@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""
+Tests for the database engine options and SQLite pragmas
+"""
+import os
+import tempfile
+import unittest
+from sqlalchemy import text
+from app import create_app, db
+from app.persistence.engine import engine_options
+from config import TestingConfig, config
+
+
+class TestEngineConfiguration(unittest.TestCase):
+    """Test cases for engine_options() and install_sqlite_pragmas()"""
+
+    def test_file_database_gets_pragmas_on_connect(self):
+        """Test that WAL, synchronous, busy_timeout and cache_size are applied"""
+        directory = tempfile.mkdtemp()
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(directory, 'hbnb.db')
+
+        config['test_file'] = FileConfig
+        try:
+            app = create_app('test_file')
+            with app.app_context():
+                pragma = lambda name: db.session.execute(text(f'PRAGMA {name}')).scalar()
+                self.assertEqual(pragma('journal_mode'), 'wal')
+                self.assertEqual(pragma('synchronous'), 1)
+                self.assertEqual(pragma('busy_timeout'), 5000)
+                self.assertEqual(pragma('cache_size'), -65536)
+                self.assertEqual(app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_size'], 5)
+                db.session.remove()
+                db.engine.dispose()
+        finally:
+            del config['test_file']
+
+    def test_pool_options_by_backend(self):
+        """Test pool sizing for server databases and none for in-memory SQLite"""
+        options = engine_options({'SQLALCHEMY_DATABASE_URI': 'postgresql://hbnb@db/hbnb',
+                                  'DB_POOL_SIZE': 20, 'DB_POOL_RECYCLE': 600})
+        self.assertEqual((options['pool_size'], options['pool_recycle']), (20, 600))
+        self.assertTrue(options['pool_pre_ping'])
+        self.assertNotIn('pool_recycle', engine_options({'SQLALCHEMY_DATABASE_URI': 'sqlite:///hbnb.db'}))
+        self.assertEqual(engine_options({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'}), {})
+        self.assertEqual(engine_options({'SQLALCHEMY_DATABASE_URI': 'sqlite://'}), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
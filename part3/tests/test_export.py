@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Tests for the streaming NDJSON export
+"""
+import json
+import unittest
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.services.facade import HBnBFacade
+
+
+class TestExport(unittest.TestCase):
+    """Test cases for GET /api/v1/export/<entity> and `flask hbnb export`"""
+
+    def setUp(self):
+        """Set up an app with an admin, a regular user and some amenities"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.session.add(User.from_plaintext('Ada', 'Admin', 'ada@example.com', 'secret123', is_admin=True))
+        db.session.add(User.from_plaintext('Reg', 'User', 'reg@example.com', 'secret123'))
+        db.session.add_all([Amenity(name=f'Amenity {index}') for index in range(7)])
+        db.session.commit()
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def headers(self, email):
+        response = self.client.post('/api/v1/auth/login', json={'email': email, 'password': 'secret123'})
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+    def test_streams_ndjson(self):
+        """Test that an admin gets one JSON object per line, streamed"""
+        response = self.client.get('/api/v1/export/amenities?format=ndjson', headers=self.headers('ada@example.com'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(sorted(row['name'] for row in rows), [f'Amenity {index}' for index in range(7)])
+        self.assertIn('created_at', rows[0])
+
+    def test_users_export_omits_password_hashes(self):
+        """Test that password hashes never leave over HTTP"""
+        response = self.client.get('/api/v1/export/users', headers=self.headers('ada@example.com'))
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(len(rows), 2)
+        self.assertNotIn('password_hash', rows[0])
+
+    def test_requires_admin_and_known_entity(self):
+        """Test the 403, 400 and 401 responses"""
+        self.assertEqual(self.client.get('/api/v1/export/users').status_code, 401)
+        self.assertEqual(self.client.get('/api/v1/export/users', headers=self.headers('reg@example.com')).status_code, 403)
+        admin = self.headers('ada@example.com')
+        self.assertEqual(self.client.get('/api/v1/export/secrets', headers=admin).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/export/users?format=csv', headers=admin).status_code, 400)
+
+    def test_rows_are_read_in_batches(self):
+        """Test that small batches still return every row"""
+        rows = list(HBnBFacade().export_rows('amenities', batch_size=2))
+        self.assertEqual(len(rows), 7)
+
+    def test_cli_export(self):
+        """Test that the CLI command can include password hashes"""
+        result = self.app.test_cli_runner().invoke(args=['hbnb', 'export', 'users', '--include-secrets'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        lines = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertTrue(all(row['password_hash'].startswith('$') for row in lines))
+        self.assertIn('Exported 2 users', result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+Tests for the synthetic dataset generator
+"""
+import unittest
+from collections import Counter
+from app import create_app, db
+from app.models.place import Place
+from app.models.review import Review
+from app.services.facade import HBnBFacade
+from app.services.generator import GENERATED_PASSWORD, DatasetGenerator
+
+COUNTS = {'users': 40, 'places': 60, 'amenities': 35, 'reviews': 400}
+
+
+def generate(seed):
+    """Generate a small dataset in a fresh app; return it and its review rows"""
+    app = create_app('testing')
+    with app.app_context():
+        written = DatasetGenerator(seed).generate(**COUNTS)
+        reviews = sorted(HBnBFacade().export_rows('reviews'), key=lambda row: row['id'])
+        db.session.remove()
+    return written, reviews
+
+
+class TestDatasetGenerator(unittest.TestCase):
+    """Test cases for DatasetGenerator"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database holding a generated dataset"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.written = DatasetGenerator(seed=7).generate(**COUNTS)
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def test_same_seed_same_rows(self):
+        """Test that a seed reproduces the dataset exactly, ids included"""
+        self.assertEqual(generate(3), generate(3))
+        self.assertNotEqual(generate(3)[1], generate(4)[1])
+
+    def test_reviews_are_consistent_and_skewed(self):
+        """Test review rules, aggregates and the Zipf skew over places"""
+        reviews = Review.query.all()
+        self.assertEqual(len(reviews), self.written['reviews'])
+        self.assertGreater(len(reviews), COUNTS['reviews'] * 0.8)
+        owners = dict(db.session.query(Place.id, Place.owner_id))
+        self.assertFalse(any(review.user_id == owners[review.place_id] for review in reviews))
+        self.assertEqual(len({(review.user_id, review.place_id) for review in reviews}), len(reviews))
+        per_place = Counter(review.place_id for review in reviews)
+        counts = sorted(per_place.values(), reverse=True)
+        self.assertGreater(counts[0], 5 * counts[len(counts) // 2])
+        busiest = db.session.get(Place, counts and per_place.most_common(1)[0][0])
+        self.assertEqual(busiest.review_count, counts[0])
+
+    def test_places_are_indexed_and_users_can_log_in(self):
+        """Test geohashes, the nearest-place index, amenity names and logins"""
+        self.assertEqual(Place.query.filter(Place.geohash.is_(None)).count(), 0)
+        nearest = self.client.get('/api/v1/places/?near=48.8566,2.3522&nearest=1').get_json()['items']
+        self.assertEqual(len(nearest), 1)
+        self.assertEqual(self.written['amenities'], 35)
+        response = self.client.post('/api/v1/auth/login', json={'email': 'user0@example.com',
+                                                                'password': GENERATED_PASSWORD})
+        self.assertEqual(response.status_code, 200)
+
+    def test_refuses_a_populated_database(self):
+        """Test that generating twice into one database is rejected"""
+        with self.assertRaises(ValueError):
+            DatasetGenerator(seed=7).generate(**COUNTS)
+
+
+if __name__ == '__main__':
+    unittest.main()
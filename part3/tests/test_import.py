@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+Tests for the streaming bulk importer and `flask hbnb import`
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import inspect
+from app import create_app, db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services.importer import BulkImporter
+
+
+class TestBulkImporter(unittest.TestCase):
+    """Test cases for importing NDJSON and CSV files"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database and a scratch directory"""
+        self.app = create_app('testing')
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.directory = tempfile.mkdtemp()
+        self.paths = {
+            'users': self.write('users.ndjson', [
+                {'id': 'u1', 'first_name': 'Ola', 'last_name': 'Owner', 'email': 'ola@example.com',
+                 'password': 'secret123'},
+                {'id': 'u2', 'first_name': 'Rex', 'last_name': 'Reviewer', 'email': 'rex@example.com',
+                 'password': 'secret123'},
+            ]),
+            'amenities': self.write('amenities.ndjson', [{'id': 'a1', 'name': 'WiFi'}]),
+            'places': self.write('places.csv', 'id,title,description,price,latitude,longitude,owner_id\n'
+                                               'p1,Loft,,80,48.85,2.35,u1\n'
+                                               'p2,Ghost,,80,48.85,2.35,nobody\n'),
+            'reviews': self.write('reviews.ndjson', [
+                {'text': 'Great', 'rating': 5, 'place_id': 'p1', 'user_id': 'u2'},
+                {'text': 'Great again', 'rating': 4, 'place_id': 'p1', 'user_id': 'u2'},
+            ]),
+            'place_amenities': self.write('links.ndjson', [{'place_id': 'p1', 'amenity_id': 'a1'}]),
+        }
+
+    def tearDown(self):
+        """Release the application context and the scratch directory"""
+        db.session.remove()
+        self.ctx.pop()
+        shutil.rmtree(self.directory)
+
+    def write(self, name, rows):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as handle:
+            handle.write(rows if isinstance(rows, str) else ''.join(json.dumps(row) + '\n' for row in rows))
+        return path
+
+    def test_imports_and_translates_foreign_keys(self):
+        """Test that file ids are mapped to the stored ids of earlier files"""
+        results = BulkImporter(chunk_size=1).import_files(self.paths)
+        self.assertEqual([result.entity for result in results],
+                         ['users', 'amenities', 'places', 'reviews', 'place_amenities'])
+        self.assertEqual([result.imported for result in results], [2, 1, 1, 1, 1])
+        self.assertEqual(results[2].errors, [(3, 'Owner not found')])
+        self.assertEqual(results[3].errors, [(2, 'User has already reviewed this place')])
+        place = Place.query.one()
+        self.assertEqual(place.owner.email, 'ola@example.com')
+        self.assertEqual([amenity.name for amenity in place.amenities], ['WiFi'])
+        self.assertEqual((place.review_count, place.rating_sum), (1, 5))
+        self.assertEqual(Review.query.one().user_id, User.query.filter_by(email='rex@example.com').one().id)
+
+    def test_references_existing_rows(self):
+        """Test that a file may refer to rows stored before the import"""
+        owner = User.from_plaintext('Eve', 'Existing', 'eve@example.com', 'secret123')
+        db.session.add(owner)
+        db.session.commit()
+        path = self.write('more.ndjson', [{'title': 'Den', 'description': '', 'price': 50, 'latitude': 1,
+                                           'longitude': 2, 'owner_id': owner.id}, 'not an object'])
+        result = BulkImporter().import_file('places', path)
+        self.assertEqual((result.rows, result.imported), (2, 1))
+        self.assertEqual(result.errors, [(2, 'Row must be a JSON object')])
+
+    def test_indexes_are_rebuilt(self):
+        """Test that dropped secondary indexes exist again after the load"""
+        before = {index['name'] for index in inspect(db.engine).get_indexes('places')}
+        BulkImporter().import_files(self.paths, drop_indexes=True)
+        after = {index['name'] for index in inspect(db.engine).get_indexes('places')}
+        self.assertIn('ix_places_updated_at', after)
+        self.assertEqual(before, after)
+
+    def test_cli_reports_rows_per_second(self):
+        """Test the import command's report"""
+        result = self.app.test_cli_runner().invoke(args=[
+            'hbnb', 'import', '--users', self.paths['users'], '--places', self.paths['places'], '--drop-indexes'
+        ])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('places: 1 of 2 rows imported', result.stdout)
+        self.assertIn('places.csv:3: Owner not found', result.stderr)
+        self.assertIn('rows/s', result.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Tests for the metrics registry and the /metrics endpoint
+"""
+import re
+import threading
+import unittest
+from app import create_app, db
+from app.utils.metrics import MetricsRegistry
+
+
+def sample(text, name, **labels):
+    """Value of the sample `name` whose labels include `labels`, or None"""
+    for line in text.splitlines():
+        match = re.match(r'^(\w+)(?:\{(.*)\})? (\S+)$', line)
+        if match and match.group(1) == name:
+            found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2) or ''))
+            if all(found.get(key) == value for key, value in labels.items()):
+                return float(match.group(3))
+    return None
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for MetricsRegistry"""
+
+    def test_exposition_format(self):
+        """Test cumulative buckets, sum, count and label escaping"""
+        registry = MetricsRegistry()
+        latency = registry.histogram('latency_seconds', 'Latency', ('route',), (0.01, 0.1))
+        hits = registry.counter('hits_total', 'Hits', ('path',))
+        for value in (0.005, 0.01, 0.05, 2.0):
+            latency.observe(value, ('/a',))
+        hits.inc(('say "hi"\n',), 3)
+        text = registry.render([('depth', 'Depth', [({'pool': 'x'}, 2)])])
+        self.assertIn('# TYPE latency_seconds histogram', text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="0.01"} 2', text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="0.1"} 3', text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_count{route="/a"} 4', text)
+        self.assertAlmostEqual(sample(text, 'latency_seconds_sum'), 2.065)
+        self.assertIn('hits_total{path="say \\"hi\\"\\n"} 3', text)
+        self.assertIn('depth{pool="x"} 2', text)
+
+    def test_threads_record_without_losing_counts(self):
+        """Test that per-thread shards add up and exited threads are folded in"""
+        registry = MetricsRegistry()
+        hits = registry.counter('hits_total', 'Hits')
+
+        def record():
+            for _ in range(1000):
+                hits.inc()
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(registry.collect()[hits][()], 8000)
+        record()
+        self.assertEqual(registry.collect()[hits][()], 9000)
+        self.assertEqual(len(registry._shards), 1)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    """Test cases for GET /metrics"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def scrape(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        return response.get_data(as_text=True)
+
+    def test_request_and_repository_metrics(self):
+        """Test per-route request counts and latencies and repository timings"""
+        before = sample(self.scrape(), 'hbnb_repository_operation_duration_seconds_count',
+                        model='Place', operation='get_page') or 0
+        for _ in range(3):
+            self.client.get('/api/v1/places/')
+        self.client.get('/api/v1/places/missing')
+        self.client.get('/no/such/path')
+        text = self.scrape()
+        route = {'namespace': 'places', 'route': '/api/v1/places/', 'method': 'GET'}
+        self.assertEqual(sample(text, 'hbnb_http_requests_total', status='200', **route), 3)
+        self.assertEqual(sample(text, 'hbnb_http_request_duration_seconds_count', **route), 3)
+        self.assertEqual(sample(text, 'hbnb_http_requests_total', status='404',
+                                route='/api/v1/places/<string:place_id>'), 1)
+        self.assertEqual(sample(text, 'hbnb_http_requests_total', route='unmatched'), 1)
+        self.assertEqual(sample(text, 'hbnb_repository_operation_duration_seconds_count',
+                                model='Place', operation='get_page'), before + 3)
+        self.assertIsNotNone(sample(text, 'hbnb_cache_hit_ratio', cache='entity'))
+        self.assertEqual(sample(text, 'hbnb_password_hasher', stat='queue_depth'), 0)
+
+    def test_token_protects_the_endpoint(self):
+        """Test that METRICS_TOKEN is required as a bearer token once set"""
+        self.app.config['METRICS_TOKEN'] = 's3cret'
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Tests for keyset pagination of the list endpoints
+"""
+import unittest
+from app import create_app
+from app.services.facade import HBnBFacade
+from app.persistence.repository import MAX_PAGE_SIZE, decode_cursor
+
+
+class TestKeysetPagination(unittest.TestCase):
+    """Test cases for repository and endpoint pagination"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database and some amenities"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.facade = HBnBFacade()
+        self.names = [f'Amenity {i:02d}' for i in range(25)]
+        for name in self.names:
+            self.facade.create_amenity({'name': name})
+
+    def tearDown(self):
+        """Release the application context"""
+        self.ctx.pop()
+
+    def test_pages_cover_every_row_once(self):
+        """Test that following next_cursor visits every row exactly once"""
+        seen, cursor = [], None
+        while True:
+            items, cursor = self.facade.get_amenities_page(limit=10, cursor=cursor)
+            seen.extend(amenity.name for amenity in items)
+            if cursor is None:
+                break
+        self.assertEqual(sorted(seen), self.names)
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_limit_is_capped(self):
+        """Test that oversized limits are clamped to MAX_PAGE_SIZE"""
+        items, cursor = self.facade.get_amenities_page(limit=MAX_PAGE_SIZE * 10)
+        self.assertEqual(len(items), 25)
+        self.assertIsNone(cursor)
+
+    def test_invalid_arguments(self):
+        """Test that malformed limit and cursor values are rejected"""
+        with self.assertRaises(ValueError):
+            self.facade.get_amenities_page(limit='zero')
+        with self.assertRaises(ValueError):
+            self.facade.get_amenities_page(limit=0)
+        with self.assertRaises(ValueError):
+            decode_cursor('not-a-cursor')
+
+    def test_list_endpoint_returns_envelope(self):
+        """Test the items/next_cursor envelope of GET /api/v1/amenities/"""
+        response = self.client.get('/api/v1/amenities/?limit=20')
+        self.assertEqual(response.status_code, 200)
+        page = response.get_json()
+        self.assertEqual(len(page['items']), 20)
+        self.assertIsNotNone(page['next_cursor'])
+
+        response = self.client.get(f"/api/v1/amenities/?limit=20&cursor={page['next_cursor']}")
+        page = response.get_json()
+        self.assertEqual(len(page['items']), 5)
+        self.assertIsNone(page['next_cursor'])
+
+    def test_list_endpoint_rejects_bad_cursor(self):
+        """Test that an invalid cursor is a client error"""
+        for path in ('/api/v1/amenities/', '/api/v1/places/', '/api/v1/reviews/', '/api/v1/users/'):
+            response = self.client.get(f'{path}?cursor=garbage')
+            self.assertEqual(response.status_code, 400, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
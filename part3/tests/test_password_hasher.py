@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+"""
+Tests for the password hashing worker pool
+"""
+import sys
+import time
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.models.user import User
+from app.services.facade import HBnBFacade
+from app.utils.password_hasher import PasswordHasher, PasswordHasherBusy, get_password_hasher
+
+try:
+    import argon2
+except ImportError:
+    argon2 = None
+
+FAST_ARGON2 = {'time_cost': 1, 'memory_cost': 1024, 'parallelism': 1}
+
+
+class TestPasswordHasher(unittest.TestCase):
+    """Test cases for PasswordHasher"""
+
+    def test_inline_round_trip(self):
+        """Test hashing and verifying on the calling thread"""
+        hasher = PasswordHasher(workers=0, rounds=4)
+        password_hash = hasher.hash('secret123')
+        self.assertTrue(password_hash.startswith('$2b$04$'))
+        self.assertTrue(hasher.verify(password_hash, 'secret123'))
+        self.assertFalse(hasher.verify(password_hash, 'wrong'))
+        self.assertFalse(hasher.verify('not-a-hash', 'secret123'))
+        stats = hasher.stats()
+        self.assertEqual((stats['completed'], stats['queue_depth']), (4, 0))
+        self.assertIsNotNone(stats['hash_p50_ms'])
+
+    def test_process_pool_round_trip(self):
+        """Test hashing and verifying in a worker process"""
+        hasher = PasswordHasher(workers=1, rounds=4)
+        try:
+            password_hash = hasher.hash('secret123')
+            self.assertTrue(hasher.verify(password_hash, 'secret123'))
+        finally:
+            hasher.shutdown()
+
+    def test_rejects_when_full(self):
+        """Test that jobs beyond max_pending are refused immediately"""
+        hasher = PasswordHasher(workers=0, max_pending=1, rounds=4, retry_after=3)
+        hasher._slots.acquire()
+        with self.assertRaises(PasswordHasherBusy) as context:
+            hasher.hash('secret123')
+        self.assertEqual(context.exception.retry_after, 3)
+        self.assertEqual(hasher.stats()['rejected'], 1)
+
+    def test_timeout_is_busy_and_keeps_the_slot(self):
+        """Test that a timed-out job is a PasswordHasherBusy and holds its slot until done"""
+        hasher = PasswordHasher(workers=1, max_pending=1, rounds=4, timeout=0.001)
+        try:
+            with self.assertRaises(PasswordHasherBusy):
+                hasher.hash('secret123')
+            with self.assertRaises(PasswordHasherBusy):
+                hasher.hash('secret123')
+            deadline = time.monotonic() + 30
+            while hasher.stats()['queue_depth'] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(hasher.stats()['queue_depth'], 0)
+        finally:
+            hasher.shutdown()
+
+    def test_background_rehash_is_dropped_when_full(self):
+        """Test that hash_async takes its slot on submit instead of queueing"""
+        hasher = PasswordHasher(workers=0, max_pending=1, rounds=4)
+        hasher._slots.acquire()
+        self.assertIsNone(hasher.hash_async('secret123', lambda password_hash: None))
+        self.assertEqual(hasher.stats()['rejected'], 1)
+        hasher.shutdown()
+
+    def test_needs_rehash_below_configured_cost(self):
+        """Test that only hashes cheaper than the configured cost are flagged"""
+        weak = PasswordHasher(rounds=4).hash('secret123')
+        self.assertTrue(PasswordHasher(rounds=5).needs_rehash(weak))
+        self.assertFalse(PasswordHasher(rounds=4).needs_rehash(weak))
+        self.assertFalse(PasswordHasher(rounds=4).needs_rehash(PasswordHasher(rounds=5).hash('secret123')))
+        self.assertTrue(PasswordHasher(rounds=4).needs_rehash('plain'))
+
+    @unittest.skipUnless(argon2, 'argon2-cffi is not installed')
+    def test_argon2(self):
+        """Test argon2 hashing, and that bcrypt hashes are flagged for migration"""
+        hasher = PasswordHasher(algorithm='argon2', argon2_params=FAST_ARGON2)
+        password_hash = hasher.hash('secret123')
+        self.assertTrue(password_hash.startswith('$argon2id$'))
+        self.assertTrue(hasher.verify(password_hash, 'secret123'))
+        self.assertFalse(hasher.verify(password_hash, 'wrong'))
+        self.assertFalse(hasher.needs_rehash(password_hash))
+        self.assertTrue(hasher.needs_rehash(PasswordHasher(rounds=4).hash('secret123')))
+
+    def test_argon2_without_package_fails_at_startup(self):
+        """Test that a missing argon2-cffi is reported when the hasher is built"""
+        with mock.patch.dict(sys.modules, {'argon2': None}):
+            with self.assertRaisesRegex(RuntimeError, 'argon2-cffi'):
+                PasswordHasher(algorithm='argon2')
+
+
+class TestPasswordUpgrade(unittest.TestCase):
+    """Test cases for rehashing outdated hashes after a successful login"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database and a user hashed at cost 4"""
+        self.app = create_app('testing')
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.user = User.from_plaintext('Ada', 'Upgrade', 'ada@example.com', 'secret123')
+        db.session.add(self.user)
+        db.session.commit()
+        self.facade = HBnBFacade()
+
+    def tearDown(self):
+        """Release the application context"""
+        get_password_hasher().shutdown()
+        db.session.remove()
+        self.ctx.pop()
+
+    def test_current_hash_is_left_alone(self):
+        """Test that no rehash is scheduled for an up-to-date hash"""
+        self.assertIsNone(self.facade.upgrade_password_hash(self.user, 'secret123'))
+
+    def test_rehash_to_higher_cost(self):
+        """Test that raising the cost upgrades the hash in the background"""
+        self.app.extensions['hbnb_password_hasher'] = PasswordHasher(rounds=5)
+        self.facade.upgrade_password_hash(self.user, 'secret123').result(timeout=10)
+        db.session.expire_all()
+        self.assertTrue(self.user.password_hash.startswith('$2b$05$'))
+        self.assertTrue(self.user.check_password('secret123'))
+
+    def test_rehash_loses_to_password_change(self):
+        """Test that a password changed before the rehash lands is kept"""
+        self.app.extensions['hbnb_password_hasher'] = PasswordHasher(rounds=5)
+        user_id = self.user.id
+        self.facade.update_user(user_id, {'password': 'changed123'})
+        changed = self.user.password_hash
+        stale = User.from_hash('Ada', 'Upgrade', 'ada2@example.com', PasswordHasher(rounds=4).hash('secret123'))
+        stale.id = user_id
+        self.facade.upgrade_password_hash(stale, 'secret123').result(timeout=10)
+        db.session.expire_all()
+        self.assertEqual(self.facade.get_user(user_id).password_hash, changed)
+
+
+class TestLoginBackPressure(unittest.TestCase):
+    """Test cases for the 503 returned when hashing is saturated"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database and one user"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.session.add(User(first_name='Ada', last_name='Login', email='ada@example.com', password='secret123'))
+        db.session.commit()
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def test_login_returns_503_with_retry_after(self):
+        """Test that a login is shed with Retry-After while the queue is full"""
+        hasher = get_password_hasher()
+        for _ in range(hasher.max_pending):
+            hasher._slots.acquire()
+        response = self.client.post('/api/v1/auth/login', json={'email': 'ada@example.com', 'password': 'secret123'})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
+    def test_wrong_password_is_rejected(self):
+        """Test that verification through the hasher still rejects bad passwords"""
+        response = self.client.post('/api/v1/auth/login', json={'email': 'ada@example.com', 'password': 'nope123'})
+        self.assertEqual(response.status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
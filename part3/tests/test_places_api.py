@@ -0,0 +1,368 @@
+#!/usr/bin/python3
+"""
+Tests for the place endpoints and their sub-resources
+"""
+import random
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.place_index import PlaceIndex
+from app.services.facade import HBnBFacade
+from app.utils.geo import haversine_km
+
+
+class PlaceTestCase(unittest.TestCase):
+    """Base fixture with one owner, a few reviewers and one place"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.owner = User(first_name='Olive', last_name='Owner', email='olive@example.com',
+                          password_hash='x')
+        self.reviewers = [
+            User(first_name=f'Rev{i}', last_name='Iewer', email=f'rev{i}@example.com', password_hash='x')
+            for i in range(5)
+        ]
+        db.session.add_all([self.owner] + self.reviewers)
+        db.session.commit()
+        self.place = Place(title='Loft', description='Bright loft', price=90.0,
+                           latitude=48.8566, longitude=2.3522, owner_id=self.owner.id)
+        db.session.add(self.place)
+        db.session.commit()
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def add_reviews(self, place, count):
+        """Add `count` reviews to a place through the facade, one per reviewer"""
+        facade = HBnBFacade()
+        return [facade.create_review({'comment': f'Review {i}', 'rating': i % 5 + 1, 'place_id': place.id,
+                                      'user_id': self.reviewers[i].id}) for i in range(count)]
+
+
+class TestPlaceReviews(PlaceTestCase):
+    """Test cases for GET /api/v1/places/<id>/reviews"""
+
+    def test_reviews_are_scoped_and_newest_first(self):
+        """Test that only the place's reviews are returned, newest first"""
+        other = Place(title='Other', description='', price=50.0, latitude=0, longitude=0,
+                      owner_id=self.owner.id)
+        db.session.add(other)
+        db.session.commit()
+        self.add_reviews(other, 2)
+        reviews = self.add_reviews(self.place, 5)
+
+        response = self.client.get(f'/api/v1/places/{self.place.id}/reviews?limit=3')
+        self.assertEqual(response.status_code, 200)
+        page = response.get_json()
+        self.assertEqual([r['id'] for r in page['items']], [r.id for r in reversed(reviews)][:3])
+
+        response = self.client.get(f"/api/v1/places/{self.place.id}/reviews?limit=3&cursor={page['next_cursor']}")
+        page = response.get_json()
+        self.assertEqual([r['id'] for r in page['items']], [reviews[1].id, reviews[0].id])
+        self.assertIsNone(page['next_cursor'])
+
+    def test_embedded_authors_in_one_query(self):
+        """Test that ?embed=author resolves every author without a query per review"""
+        self.add_reviews(self.place, 5)
+        db.session.expire_all()
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            response = self.client.get(f'/api/v1/places/{self.place.id}/reviews?embed=author&limit=5')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        items = response.get_json()['items']
+        self.assertEqual(sorted(r['author']['first_name'] for r in items), [f'Rev{i}' for i in range(5)])
+        # Place, two fingerprints, then the reviews joined to their authors
+        self.assertLessEqual(len(statements), 4)
+
+        etag = response.headers['ETag']
+        HBnBFacade().update_user(self.reviewers[0].id, {'first_name': 'Renamed'})
+        response = self.client.get(f'/api/v1/places/{self.place.id}/reviews?embed=author&limit=5',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_place(self):
+        """Test that reviews of a missing place are a 404"""
+        response = self.client.get('/api/v1/places/missing/reviews')
+        self.assertEqual(response.status_code, 404)
+
+
+
+class TestPlaceDetail(PlaceTestCase):
+    """Test cases for GET /api/v1/places/<id>/detail"""
+
+    def test_detail_embeds_related_data(self):
+        """Test that owner, amenities, rating and authored reviews are embedded"""
+        self.place.amenities.extend([Amenity(name='WiFi'), Amenity(name='Pool')])
+        db.session.commit()
+        self.add_reviews(self.place, 4)
+        place_id = self.place.id
+        db.session.expire_all()
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            response = self.client.get(f'/api/v1/places/{place_id}/detail')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(response.status_code, 200)
+        detail = response.get_json()
+        self.assertEqual(detail['owner']['first_name'], 'Olive')
+        self.assertEqual(sorted(a['name'] for a in detail['amenities']), ['Pool', 'WiFi'])
+        self.assertEqual(detail['rating']['count'], 4)
+        self.assertEqual(detail['rating']['average'], 2.5)
+        self.assertEqual(len(detail['reviews']['items']), 4)
+        self.assertTrue(all(r['author']['last_name'] == 'Iewer' for r in detail['reviews']['items']))
+        # Place with owner and amenities, then reviews with authors; the ETag reuses those rows
+        self.assertLessEqual(len(statements), 3)
+
+
+
+class TestPlaceAreaSearch(PlaceTestCase):
+    """Test cases for ?near=&radius_km=&bbox= on GET /api/v1/places/"""
+
+    def setUp(self):
+        """Add places around Paris, in London and on both sides of the antimeridian"""
+        super().setUp()
+        coordinates = {
+            'Louvre': (48.8606, 2.3376),
+            'Montmartre': (48.8867, 2.3431),
+            'Versailles': (48.8049, 2.1204),
+            'London': (51.5074, -0.1278),
+            'Fiji East': (-17.0, 179.9),
+            'Fiji West': (-17.0, -179.9),
+        }
+        for title, (latitude, longitude) in coordinates.items():
+            db.session.add(Place(title=title, description='', price=100.0, latitude=latitude,
+                                 longitude=longitude, owner_id=self.owner.id))
+        db.session.commit()
+
+    def titles(self, query):
+        response = self.client.get(f'/api/v1/places/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return [place['title'] for place in response.get_json()['items']]
+
+    def test_geohash_is_maintained(self):
+        """Test that the geohash follows coordinate updates"""
+        original = self.place.geohash
+        self.assertTrue(original.startswith('u09t'))
+        self.place.latitude, self.place.longitude = 51.5074, -0.1278
+        db.session.commit()
+        self.assertTrue(self.place.geohash.startswith('gcpv'))
+
+    def test_radius_search_sorted_by_distance(self):
+        """Test that a radius search returns only nearby places, closest first"""
+        self.assertEqual(self.titles('near=48.8566,2.3522&radius_km=5'), ['Loft', 'Louvre', 'Montmartre'])
+        self.assertEqual(self.titles('near=48.8566,2.3522&radius_km=20&limit=2'), ['Loft', 'Louvre'])
+
+    def test_bbox_search(self):
+        """Test bounding box searches, including one crossing the antimeridian"""
+        self.assertEqual(sorted(self.titles('bbox=48.80,2.10,48.82,2.20')), ['Versailles'])
+        self.assertEqual(sorted(self.titles('bbox=-18,179,-16,-179')), ['Fiji East', 'Fiji West'])
+        self.assertEqual(self.titles('near=-17,179.95&radius_km=50'), ['Fiji East', 'Fiji West'])
+
+    def test_invalid_parameters(self):
+        """Test that malformed spatial parameters are client errors"""
+        for query in ('near=abc', 'near=91,0', 'bbox=1,2,3', 'near=0,0&radius_km=-1'):
+            response = self.client.get(f'/api/v1/places/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+
+
+class TestPlaceIndex(unittest.TestCase):
+    """Test cases for the in-process nearest-neighbour index"""
+
+    def test_matches_brute_force(self):
+        """Test KD-tree answers against an exhaustive haversine scan"""
+        rng = random.Random(7)
+        points = {f'p{i}': (rng.uniform(-80, 80), rng.uniform(-180, 180)) for i in range(2000)}
+        index = PlaceIndex()
+        index.load((place_id, lat, lon) for place_id, (lat, lon) in points.items())
+        for i in range(50):
+            moved = f'p{i}'
+            points[moved] = (rng.uniform(-80, 80), rng.uniform(-180, 180))
+            index.upsert(moved, *points[moved])
+        index.remove('p99')
+        del points['p99']
+        self.assertEqual(len(index), len(points))
+
+        for _ in range(25):
+            lat, lon = rng.uniform(-80, 80), rng.uniform(-180, 180)
+            expected = sorted(points, key=lambda p: haversine_km(lat, lon, *points[p]))[:5]
+            found = index.nearest(lat, lon, 5)
+            self.assertEqual([place_id for place_id, _ in found], expected)
+            self.assertAlmostEqual(found[0][1], haversine_km(lat, lon, *points[expected[0]]), places=6)
+
+
+class TestNearestPlaces(PlaceTestCase):
+    """Test cases for ?near=&nearest= on GET /api/v1/places/"""
+
+    def test_created_and_moved_places_are_indexed(self):
+        """Test that facade writes keep the index in sync without a reload"""
+        facade = HBnBFacade()
+        base = {'description': '', 'price': 80.0, 'owner_id': self.owner.id}
+        near = facade.create_place(dict(base, title='Near', latitude=48.86, longitude=2.35))
+        far = facade.create_place(dict(base, title='Far', latitude=40.0, longitude=-3.7))
+
+        response = self.client.get('/api/v1/places/?near=48.86,2.35&nearest=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['title'] for p in response.get_json()['items']], ['Near'])
+
+        facade.update_place(far.id, {'latitude': 48.8601, 'longitude': 2.3501})
+        response = self.client.get('/api/v1/places/?near=48.8601,2.3501&nearest=2')
+        self.assertEqual([p['title'] for p in response.get_json()['items']], ['Far', 'Near'])
+
+    def test_nearest_requires_a_point(self):
+        """Test that nearest without near, or with a bad k, is a client error"""
+        for query in ('nearest=3', 'near=0,0&nearest=zero', 'near=0,0&nearest=0'):
+            response = self.client.get(f'/api/v1/places/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+
+
+class TestPlaceSearch(PlaceTestCase):
+    """Test cases for GET /api/v1/places/search"""
+
+    def setUp(self):
+        """Add places with different prices, amenities and ratings"""
+        super().setUp()
+        self.wifi, self.pool = Amenity(name='WiFi'), Amenity(name='Pool')
+        specs = [
+            ('Cheap studio', 40.0, [self.wifi], [2]),
+            ('Sunny flat', 120.0, [self.wifi, self.pool], [5, 4]),
+            ('Villa 100%', 650.0, [self.pool], [5]),
+            ('Quiet room', 75.0, [], []),
+        ]
+        self.places = {}
+        for title, price, amenities, ratings in specs:
+            place = Place(title=title, description='', price=price, latitude=0, longitude=0,
+                          owner_id=self.owner.id)
+            place.amenities.extend(amenities)
+            db.session.add(place)
+            db.session.commit()
+            for reviewer, rating in zip(self.reviewers, ratings):
+                db.session.add(Review(text='ok', rating=rating, place_id=place.id, user_id=reviewer.id))
+            db.session.commit()
+            self.places[title] = place
+        HBnBFacade().rebuild_rating_aggregates()
+
+    def search(self, query):
+        response = self.client.get(f'/api/v1/places/search?{query}')
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response.get_json()
+
+    def test_filters_combine(self):
+        """Test price, rating, amenity and text filters together and apart"""
+        titles = lambda result: sorted(place['title'] for place in result['items'])
+        self.assertEqual(titles(self.search('min_price=50&max_price=200')), ['Loft', 'Quiet room', 'Sunny flat'])
+        self.assertEqual(titles(self.search('min_rating=4.5')), ['Sunny flat', 'Villa 100%'])
+        both = f'{self.wifi.id},{self.pool.id}'
+        self.assertEqual(titles(self.search(f'amenities={both}')), ['Sunny flat'])
+        self.assertEqual(titles(self.search('q=100%')), ['Villa 100%'])
+        self.assertEqual(titles(self.search(f'amenities={self.pool.id}&max_price=500&min_rating=4')),
+                         ['Sunny flat'])
+
+    def test_facets_follow_filters(self):
+        """Test price bucket and amenity counts over the filtered set"""
+        facets = self.search('max_price=200')['facets']
+        self.assertEqual(facets['total'], 4)
+        self.assertEqual({b['range']: b['count'] for b in facets['price']},
+                         {'0-50': 1, '50-100': 2, '100-200': 1, '200-500': 0, '500+': 0})
+        self.assertEqual([(a['name'], a['count']) for a in facets['amenities']], [('WiFi', 2), ('Pool', 1)])
+
+    def test_new_amenity_links_change_etag(self):
+        """Test that bulk-linked amenities are not hidden behind a 304"""
+        query = f'/api/v1/places/search?amenities={self.wifi.id}'
+        etag = self.client.get(query).headers['ETag']
+        self.assertEqual(self.client.get(query, headers={'If-None-Match': etag}).status_code, 304)
+        HBnBFacade().bulk_link_amenities([{'place_id': self.places['Quiet room'].id, 'amenity_id': self.wifi.id}])
+        response = self.client.get(query, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Quiet room', [place['title'] for place in response.get_json()['items']])
+
+    def test_invalid_filters(self):
+        """Test that malformed filters are client errors"""
+        for query in ('min_price=cheap', 'min_rating=9'):
+            response = self.client.get(f'/api/v1/places/search?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+
+
+class TestRatingAggregates(PlaceTestCase):
+    """Test cases for the denormalized rating aggregates on places"""
+
+    def assert_matches_rebuild(self):
+        """Check the incremental aggregates against a full recomputation"""
+        db.session.refresh(self.place)
+        incremental = self.place.rating_summary
+        HBnBFacade().rebuild_rating_aggregates()
+        db.session.refresh(self.place)
+        self.assertEqual(incremental, self.place.rating_summary)
+        return incremental
+
+    def test_review_writes_maintain_aggregates(self):
+        """Test create, update and delete of reviews against a rebuild"""
+        facade = HBnBFacade()
+        reviews = self.add_reviews(self.place, 3)
+        self.assertEqual(self.assert_matches_rebuild(),
+                         {'count': 3, 'average': 2.0, 'histogram': {'1': 1, '2': 1, '3': 1, '4': 0, '5': 0}})
+
+        facade.update_review(reviews[0].id, {'rating': 5, 'comment': 'Changed my mind'})
+        self.assertEqual(self.assert_matches_rebuild()['average'], 3.33)
+
+        facade.delete_review(reviews[1].id)
+        summary = self.assert_matches_rebuild()
+        self.assertEqual((summary['count'], summary['average']), (2, 4.0))
+
+    def test_invalid_rating_leaves_aggregates(self):
+        """Test that a rejected rating update does not leave adjusted totals behind"""
+        facade = HBnBFacade()
+        reviews = self.add_reviews(self.place, 2)
+        before = self.assert_matches_rebuild()
+        with self.assertRaises(ValueError):
+            facade.update_review(reviews[0].id, {'rating': 9})
+        db.session.commit()
+        self.assertEqual(self.assert_matches_rebuild(), before)
+
+    def test_rebuild_command_repairs_drift(self):
+        """Test that `flask hbnb rebuild-ratings` fixes aggregates written around the facade"""
+        db.session.add(Review(text='Direct', rating=4, place_id=self.place.id, user_id=self.reviewers[0].id))
+        db.session.commit()
+        self.assertEqual(self.place.review_count, 0)
+
+        result = self.app.test_cli_runner().invoke(args=['hbnb', 'rebuild-ratings'])
+        self.assertIn('Rebuilt rating aggregates for 1 places', result.output)
+        db.session.refresh(self.place)
+        self.assertEqual((self.place.review_count, self.place.rating_average), (1, 4.0))
+
+    def test_top_rated(self):
+        """Test GET /api/v1/places/top-rated ordering and minimum review count"""
+        other = Place(title='Other', description='', price=50.0, latitude=0, longitude=0, owner_id=self.owner.id)
+        db.session.add(other)
+        db.session.commit()
+        self.add_reviews(self.place, 2)
+        HBnBFacade().create_review({'comment': 'Great', 'rating': 5, 'place_id': other.id,
+                                    'user_id': self.reviewers[0].id})
+
+        items = self.client.get('/api/v1/places/top-rated').get_json()['items']
+        self.assertEqual([(p['title'], p['rating_average']) for p in items], [('Other', 5.0), ('Loft', 1.5)])
+        items = self.client.get('/api/v1/places/top-rated?min_reviews=2').get_json()['items']
+        self.assertEqual([p['title'] for p in items], ['Loft'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Tests for the on-demand request profiler
+"""
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from app import create_app, db
+from app.models.user import User
+from app.services.profiler import ProfilingMiddleware, StackSampler, collapsed, summary
+from config import TestingConfig, config
+
+
+class TestProfiler(unittest.TestCase):
+    """Test cases for ProfilingMiddleware"""
+
+    def setUp(self):
+        """Set up a profiling app writing into a temporary directory"""
+        self.directory = tempfile.mkdtemp()
+        directory = self.directory
+
+        class ProfilerConfig(TestingConfig):
+            PROFILER_ENABLED = True
+            PROFILER_DIR = directory
+
+        config['test_profiler'] = ProfilerConfig
+        self.app = create_app('test_profiler')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.session.add(User.from_plaintext('Ada', 'Admin', 'ada@example.com', 'secret123', is_admin=True))
+        db.session.add(User.from_plaintext('Reg', 'User', 'reg@example.com', 'secret123'))
+        db.session.commit()
+
+    def tearDown(self):
+        """Release the application context and the profile directory"""
+        db.session.remove()
+        self.ctx.pop()
+        del config['test_profiler']
+        shutil.rmtree(self.directory)
+
+    def headers(self, email):
+        response = self.client.post('/api/v1/auth/login', json={'email': email, 'password': 'secret123'})
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}", 'X-HBnB-Profile': '1'}
+
+    def test_admin_header_writes_a_profile(self):
+        """Test that an admin's request is profiled into .folded and .txt files"""
+        # The profile is written once the server closes the response body
+        with self.client.get('/api/v1/places/', headers=self.headers('ada@example.com')) as response:
+            self.assertEqual(response.status_code, 200)
+            profile_id = response.headers['X-HBnB-Profile']
+        with open(os.path.join(self.directory, profile_id + '.txt')) as report:
+            self.assertTrue(report.readline().startswith('GET /api/v1/places/ 200 OK in '))
+        with open(os.path.join(self.directory, profile_id + '.folded')) as folded:
+            for line in folded:
+                self.assertRegex(line, r'^[^;\n]+(;[^;\n]+)* \d+$')
+
+    def test_other_requests_are_not_profiled(self):
+        """Test that the header alone, or from a non-admin, does nothing"""
+        self.client.get('/api/v1/places/', headers={'X-HBnB-Profile': '1'}).close()
+        with self.client.get('/api/v1/places/', headers=self.headers('reg@example.com')) as response:
+            self.assertNotIn('X-HBnB-Profile', response.headers)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_sample_rate(self):
+        """Test that a sample rate of 1 profiles every request"""
+        self.app.wsgi_app.sample_rate = 1.0
+        with self.client.get('/api/v1/places/') as response:
+            self.assertIn('X-HBnB-Profile', response.headers)
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+    def test_disabled_by_default(self):
+        """Test that the middleware is only installed when enabled"""
+        self.assertIsInstance(self.app.wsgi_app, ProfilingMiddleware)
+        self.assertNotIsInstance(create_app('testing').wsgi_app, ProfilingMiddleware)
+
+
+class TestStackSampler(unittest.TestCase):
+    """Test cases for StackSampler and its output formats"""
+
+    def test_samples_the_busy_function(self):
+        """Test that a busy loop dominates the self samples"""
+        def spin(seconds):
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                pass
+
+        sampler = StackSampler(threading.get_ident(), 0.001)
+        sampler.start()
+        spin(0.1)
+        samples = sampler.stop()
+        self.assertGreater(sum(samples.values()), 5)
+        top = re.search(r'self.*\n\s+\d+\s+[\d.]+\s+(.+)', summary(samples, 'spin', 5)).group(1)
+        self.assertTrue(top.startswith('spin ('), top)
+        self.assertTrue(all(line.split(' ')[0] for line in collapsed(samples)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+Tests for the per-request SQL instrumentation
+"""
+import json
+import re
+import unittest
+from app import create_app, db
+from app.models.place import Place
+from app.models.user import User
+from app.services.query_stats import QueryBudgetExceeded, QueryBudgetWarning, QueryStats, fingerprint
+
+
+def query_count(response):
+    """Number of queries reported by a response's Server-Timing header"""
+    return int(re.search(r'desc="(\d+) queries"', response.headers['Server-Timing']).group(1))
+
+
+class TestQueryStats(unittest.TestCase):
+    """Test cases for Server-Timing, N+1 logging and query budgets"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database and a few owners"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.owners = [User(first_name='Olive', last_name='Owner', email=f'owner{i}@example.com',
+                            password_hash='x') for i in range(10)]
+        db.session.add_all(self.owners)
+        db.session.commit()
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def add_places(self, count):
+        db.session.add_all([Place(title=f'Place {i}', description='', price=50.0, latitude=0, longitude=0,
+                                  owner_id=self.owners[i % len(self.owners)].id) for i in range(count)])
+        db.session.commit()
+
+    def test_place_listing_query_count_is_flat(self):
+        """Test that listing places costs the same however many owners appear"""
+        self.add_places(2)
+        few = query_count(self.client.get('/api/v1/places/'))
+        self.add_places(10)
+        response = self.client.get('/api/v1/places/')
+        self.assertEqual(len(response.get_json()['items']), 12)
+        self.assertEqual(query_count(response), few)
+        self.assertRegex(response.headers['Server-Timing'], r'^db;dur=\d+\.\d\d;desc=')
+
+    def test_over_budget_raises_or_warns(self):
+        """Test both budget modes on a route with a budget of one query"""
+        self.add_places(3)
+        self.app.config['SQL_QUERY_BUDGETS'] = {'GET /api/v1/places/': 1}
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/api/v1/places/')
+        self.app.config['SQL_QUERY_BUDGET_MODE'] = 'warn'
+        with self.assertWarns(QueryBudgetWarning):
+            self.assertEqual(self.client.get('/api/v1/places/').status_code, 200)
+
+    def test_request_log_line(self):
+        """Test the structured log line emitted per request"""
+        with self.assertLogs('app.services.query_stats', 'INFO') as logs:
+            self.client.get('/api/v1/places/?limit=5')
+        entry = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((entry['route'], entry['status'], entry['repeated']), ('GET /api/v1/places/', 200, []))
+        self.assertGreater(entry['queries'], 0)
+
+    def test_repeated_statements_are_fingerprinted(self):
+        """Test that statements differing only in values share a fingerprint"""
+        stats = QueryStats()
+        for user_id in range(6):
+            stats.record(f"SELECT * FROM users WHERE id = '{user_id}' AND age > {user_id}", 0.001)
+        stats.record('SELECT * FROM places WHERE id IN (?, ?, ?)', 0.001)
+        self.assertEqual(stats.repeated(5), [('SELECT * FROM users WHERE id = ? AND age > ?', 6)])
+        self.assertEqual(fingerprint('SELECT 1 FROM t WHERE id IN (?,\n ?)'), 'SELECT ? FROM t WHERE id IN (?+)')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Tests for read/write routing to read replicas
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from app.services.facade import HBnBFacade
+from config import TestingConfig, config
+
+
+class TestReadReplicas(unittest.TestCase):
+    """Test cases for RoutingSession and the SQLite replication stand-in"""
+
+    def setUp(self):
+        """Set up an app on a SQLite primary with two lagging replicas"""
+        self.directory = tempfile.mkdtemp()
+        path = lambda name: 'sqlite:///' + os.path.join(self.directory, name)
+
+        class ReplicaConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = path('primary.db')
+            SQLALCHEMY_READ_REPLICAS = [path('replica0.db'), path('replica1.db')]
+            REPLICA_SYNC_ON_COMMIT = False
+            CACHE_TYPE = 'null'
+
+        config['test_replicas'] = ReplicaConfig
+        self.app = create_app('test_replicas')
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.replicas = self.app.extensions['hbnb_replicas']
+        self.replica_queries = 0
+        for engine in self.replicas.engines:
+            event.listen(engine, 'before_cursor_execute', self.count_replica_query)
+        self.facade = HBnBFacade()
+        self.user_id = self.add_user('olive@example.com')
+
+    def tearDown(self):
+        """Release the application context and the database files"""
+        db.session.remove()
+        for engine in [db.engine] + self.replicas.engines:
+            engine.dispose()
+        self.ctx.pop()
+        del config['test_replicas']
+        shutil.rmtree(self.directory)
+
+    def count_replica_query(self, *args):
+        self.replica_queries += 1
+
+    def add_user(self, email):
+        user = User.from_plaintext('Olive', 'Owner', email, 'secret123')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        db.session.remove()
+        return user_id
+
+    def test_reads_go_to_a_replica(self):
+        """Test that repository reads hit a replica, which lags until synced"""
+        self.assertIsNone(self.facade.get_user(self.user_id))
+        self.assertGreater(self.replica_queries, 0)
+        db.session.remove()
+        self.replicas.sync()
+        self.assertEqual(self.facade.get_user(self.user_id).email, 'olive@example.com')
+        self.assertEqual(len(self.facade.get_all_users()), 1)
+
+    def test_session_reads_its_own_writes(self):
+        """Test that a session stays on the primary once it has written"""
+        self.facade.create_amenity({'name': 'WiFi'})
+        self.assertEqual(self.facade.get_user(self.user_id).first_name, 'Olive')
+        self.assertEqual(len(self.facade.get_all_amenities()), 1)
+        self.assertEqual(self.replica_queries, 0)
+
+    def test_unit_of_work_reads_the_primary(self):
+        """Test that reads inside a transaction go to the primary"""
+        with self.facade.transaction():
+            self.assertIsNotNone(self.facade.get_user(self.user_id))
+        self.assertEqual(self.replica_queries, 0)
+
+    def test_writes_load_rows_from_the_primary(self):
+        """Test that updates and deletes read their target from the primary"""
+        user = self.facade.update_user(self.user_id, {'last_name': 'Oak'})
+        self.assertEqual(user.last_name, 'Oak')
+        self.assertEqual(self.replica_queries, 0)
+        db.session.remove()
+
+        # A replica copy already in the session is refreshed before writing
+        self.replicas.sync()
+        with db.engine.begin() as connection:
+            connection.execute(User.__table__.update().values(first_name='Ada'))
+        self.assertEqual(self.facade.get_user(self.user_id).first_name, 'Olive')
+        user = self.facade.update_user(self.user_id, {'last_name': 'Elm'})
+        self.assertEqual((user.first_name, user.last_name), ('Ada', 'Elm'))
+
+    def test_sync_on_commit(self):
+        """Test that the replication stand-in copies committed writes"""
+        self.replicas.sync_on_commit = True
+        user_id = self.add_user('ada@example.com')
+        self.assertEqual(self.facade.get_user(user_id).email, 'ada@example.com')
+        self.assertGreater(self.replica_queries, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
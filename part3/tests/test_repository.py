@@ -0,0 +1,37 @@
+#!/usr/bin/python3
+"""
+Tests for the in-memory repository
+"""
+import unittest
+from app import create_app
+from app.models.amenity import Amenity
+from app.persistence.repository import InMemoryRepository
+
+
+class TestInMemoryRepository(unittest.TestCase):
+    """Test cases for InMemoryRepository writes"""
+
+    def setUp(self):
+        """Set up an app context, which BaseModel.save needs to commit"""
+        self.app = create_app('testing')
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.repo = InMemoryRepository()
+
+    def tearDown(self):
+        """Release the application context"""
+        self.ctx.pop()
+
+    def test_update_and_delete(self):
+        """Test that update changes the stored instance and delete removes it"""
+        amenity = Amenity(name='WiFi')
+        self.repo.add(amenity)
+        self.repo.update(amenity.id, {'name': 'Fibre'})
+        self.assertEqual(self.repo.get(amenity.id).name, 'Fibre')
+        self.assertIsNone(self.repo.update('missing', {'name': 'Pool'}))
+        self.repo.delete(amenity.id)
+        self.assertIsNone(self.repo.get(amenity.id))
+
+
+if __name__ == '__main__':
+    unittest.main()
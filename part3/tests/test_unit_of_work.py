@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Tests for the facade unit of work
+"""
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.services.facade import HBnBFacade
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """Test cases for facade.transaction()"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database"""
+        self.app = create_app('testing')
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.facade = HBnBFacade()
+        self.user = User.from_plaintext('Olive', 'Owner', 'olive@example.com', 'secret123')
+        db.session.add(self.user)
+        db.session.commit()
+        self.user_id = self.user.id
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def test_writes_commit_once(self):
+        """Test that several facade writes share one commit"""
+        with mock.patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            with self.facade.transaction():
+                amenity = self.facade.create_amenity({'name': 'WiFi'})
+                self.facade.create_place({'title': 'Loft', 'description': '', 'price': 80.0, 'latitude': 48.85,
+                                          'longitude': 2.35, 'owner_id': self.user.id})
+                self.facade.update_amenity(amenity.id, {'name': 'Fast WiFi'})
+                self.assertEqual(commit.call_count, 0)
+        self.assertEqual(commit.call_count, 1)
+        amenity_id = amenity.id
+        db.session.remove()
+        self.assertEqual(self.facade.get_amenity(amenity_id).name, 'Fast WiFi')
+
+    def test_error_rolls_back_everything(self):
+        """Test that an exception discards every write of the block"""
+        with self.assertRaises(RuntimeError):
+            with self.facade.transaction():
+                self.facade.create_amenity({'name': 'WiFi'})
+                self.facade.update_user(self.user_id, {'first_name': 'Changed'})
+                raise RuntimeError('boom')
+        db.session.remove()
+        self.assertEqual(Amenity.query.count(), 0)
+        self.assertEqual(self.facade.get_user(self.user_id).first_name, 'Olive')
+
+    def test_nested_blocks_join_the_outer_one(self):
+        """Test that an inner block commits only with the outermost one"""
+        with mock.patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            with self.facade.transaction():
+                with self.facade.transaction():
+                    self.facade.create_amenity({'name': 'WiFi'})
+                self.assertEqual(commit.call_count, 0)
+        self.assertEqual(commit.call_count, 1)
+
+    def test_cache_invalidated_after_commit(self):
+        """Test that cached entities are refreshed once the block commits"""
+        self.facade.get_user(self.user_id)
+        db.session.remove()
+        with self.facade.transaction():
+            self.facade.update_user(self.user_id, {'first_name': 'Renamed'})
+        db.session.remove()
+        self.assertEqual(self.facade.get_user(self.user_id).first_name, 'Renamed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""
+Tests for upgrading a database created by an earlier release
+"""
+import unittest
+from sqlalchemy import inspect, text
+from app import create_app, db
+from app.utils import geo
+
+# The schema shipped before geohash, rating aggregates and place amenities
+OLD_SCHEMA = (
+    """CREATE TABLE users (first_name VARCHAR(50) NOT NULL, last_name VARCHAR(50) NOT NULL,
+       email VARCHAR(255) NOT NULL, password_hash VARCHAR(128) NOT NULL, is_admin BOOLEAN NOT NULL,
+       id VARCHAR(36) NOT NULL, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL,
+       PRIMARY KEY (id), UNIQUE (email))""",
+    """CREATE TABLE amenities (name VARCHAR(50) NOT NULL, id VARCHAR(36) NOT NULL,
+       created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL, PRIMARY KEY (id), UNIQUE (name))""",
+    """CREATE TABLE places (title VARCHAR(100) NOT NULL, description TEXT, price FLOAT NOT NULL,
+       latitude FLOAT NOT NULL, longitude FLOAT NOT NULL, owner_id VARCHAR(36) NOT NULL,
+       id VARCHAR(36) NOT NULL, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL,
+       PRIMARY KEY (id), FOREIGN KEY(owner_id) REFERENCES users (id))""",
+    """CREATE TABLE reviews (text TEXT NOT NULL, rating INTEGER NOT NULL, place_id VARCHAR(36) NOT NULL,
+       user_id VARCHAR(36) NOT NULL, id VARCHAR(36) NOT NULL, created_at DATETIME NOT NULL,
+       updated_at DATETIME NOT NULL, PRIMARY KEY (id), FOREIGN KEY(place_id) REFERENCES places (id),
+       FOREIGN KEY(user_id) REFERENCES users (id))""",
+    """INSERT INTO users VALUES ('Ada', 'Admin', 'ada@example.com', 'x', 1, 'u1',
+       '2024-01-01 00:00:00', '2024-01-01 00:00:00')""",
+    """INSERT INTO places VALUES ('Loft', NULL, 80.0, 48.85, 2.35, 'u1', 'p1',
+       '2024-01-01 00:00:00', '2024-01-01 00:00:00')""",
+    """INSERT INTO reviews VALUES ('Great', 5, 'p1', 'u1', 'r1', '2024-01-02 00:00:00', '2024-01-02 00:00:00')""",
+    """INSERT INTO reviews VALUES ('Fine', 3, 'p1', 'u1', 'r2', '2024-01-03 00:00:00', '2024-01-03 00:00:00')""",
+)
+
+
+class TestUpgradeDatabase(unittest.TestCase):
+    """Test cases for `flask hbnb upgrade-db`"""
+
+    def setUp(self):
+        """Replace the fresh schema with the old one and some rows"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.drop_all()
+        for statement in OLD_SCHEMA:
+            db.session.execute(text(statement))
+        db.session.commit()
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def upgrade(self):
+        result = self.app.test_cli_runner().invoke(args=['hbnb', 'upgrade-db'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        return result.output
+
+    def test_adds_columns_indexes_and_backfills(self):
+        """Test that the old tables gain the new columns, indexes and values"""
+        output = self.upgrade()
+        self.assertIn('places.geohash', output)
+        self.assertIn('places.review_count', output)
+        schema = inspect(db.engine)
+        self.assertIn('place_amenities', schema.get_table_names())
+        self.assertIn('ix_places_rating_average_review_count', {index['name'] for index in schema.get_indexes('places')})
+        self.assertIn('ix_reviews_place_id_rating', {index['name'] for index in schema.get_indexes('reviews')})
+        row = db.session.execute(text('SELECT geohash, review_count, rating_average, rating_count_5 '
+                                      'FROM places')).one()
+        self.assertEqual(tuple(row), (geo.encode(48.85, 2.35), 2, 4.0, 1))
+
+    def test_place_queries_work_after_upgrade(self):
+        """Test that the place endpoints read the upgraded table"""
+        self.upgrade()
+        response = self.client.get('/api/v1/places/p1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['review_count'], 2)
+        self.assertEqual(response.get_json()['rating_average'], 4.0)
+
+    def test_running_twice_is_harmless(self):
+        """Test that a second upgrade adds nothing"""
+        self.upgrade()
+        self.assertIn('Added columns: none', self.upgrade())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+"""
+Tests for the user endpoints
+"""
+import json
+import tempfile
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.models.user import User
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+from app.utils.password_hasher import get_password_hasher
+
+
+class TestBatchUserLookup(unittest.TestCase):
+    """Test cases for GET /api/v1/users/?ids= and UserRepository.get_many"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database and a few users"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.users = [User(first_name=f'User{i}', last_name='Test', email=f'user{i}@example.com',
+                           password_hash='x') for i in range(7)]
+        db.session.add_all(self.users)
+        db.session.commit()
+        self.ids = [user.id for user in self.users]
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def test_get_many_preserves_order_across_chunks(self):
+        """Test request order and missing ids when the lookup is split in chunks"""
+        requested = [self.ids[5], 'nope', self.ids[0], self.ids[3], self.ids[5]]
+        with mock.patch('app.persistence.repository.IN_QUERY_CHUNK_SIZE', 2):
+            users, missing = UserRepository().get_many(requested)
+        self.assertEqual([user.id for user in users], [self.ids[5], self.ids[0], self.ids[3]])
+        self.assertEqual(missing, ['nope'])
+
+    def test_batch_endpoint(self):
+        """Test the ids query parameter of the users list endpoint"""
+        response = self.client.get(f'/api/v1/users/?ids={self.ids[2]},{self.ids[1]},unknown')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([user['id'] for user in data['items']], [self.ids[2], self.ids[1]])
+        self.assertEqual(data['missing'], ['unknown'])
+        self.assertNotIn('password_hash', data['items'][0])
+
+    def test_batch_endpoint_rejects_empty_list(self):
+        """Test that an empty ids parameter is a client error"""
+        response = self.client.get('/api/v1/users/?ids=,')
+        self.assertEqual(response.status_code, 400)
+
+
+class TestUserCredentials(unittest.TestCase):
+    """Test cases for the single-hash credential pipeline and bulk import"""
+
+    def setUp(self):
+        """Set up an app with an in-memory database"""
+        self.app = create_app('testing')
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.facade = HBnBFacade()
+        self.hasher = get_password_hasher()
+
+    def tearDown(self):
+        """Release the application context"""
+        db.session.remove()
+        self.ctx.pop()
+
+    def test_from_plaintext_hashes_once(self):
+        """Test that a plaintext password goes through the hasher exactly once"""
+        with mock.patch.object(self.hasher, 'hash', wraps=self.hasher.hash) as hash_:
+            user = self.facade.create_user({'first_name': 'Ada', 'last_name': 'Plain',
+                                            'email': 'ada@example.com', 'password': 'secret123'})
+        self.assertEqual(hash_.call_count, 1)
+        self.assertTrue(user.check_password('secret123'))
+
+    def test_from_hash_keeps_hash(self):
+        """Test that a precomputed hash is stored as is"""
+        password_hash = self.hasher.hash('secret123')
+        with mock.patch.object(self.hasher, 'hash') as hash_:
+            user = self.facade.create_user({'first_name': 'Bo', 'last_name': 'Hash',
+                                            'email': 'bo@example.com', 'password_hash': password_hash})
+        hash_.assert_not_called()
+        self.assertEqual(user.password_hash, password_hash)
+        self.assertTrue(user.check_password('secret123'))
+        with self.assertRaises(ValueError):
+            User.from_hash('Bo', 'Hash', 'bo2@example.com', 'secret123')
+
+    def test_import_users(self):
+        """Test a bulk import with one batched hash call and per-row errors"""
+        db.session.add(User.from_plaintext('Old', 'User', 'old@example.com', 'secret123'))
+        db.session.commit()
+        rows = [{'first_name': f'User{i}', 'last_name': 'Bulk', 'email': f'bulk{i}@example.com',
+                 'password': f'secret{i:03d}'} for i in range(5)]
+        rows += [
+            {'first_name': 'Dup', 'last_name': 'Row', 'email': 'BULK0@example.com', 'password': 'secret123'},
+            {'first_name': 'Old', 'last_name': 'User', 'email': 'old@example.com', 'password': 'secret123'},
+            {'first_name': 'No', 'last_name': 'Password', 'email': 'nopass@example.com'},
+            {'first_name': 'Pre', 'last_name': 'Hashed', 'email': 'pre@example.com',
+             'password_hash': self.hasher.hash('secret999')},
+        ]
+        with mock.patch.object(self.hasher, 'hash_many', wraps=self.hasher.hash_many) as hash_many:
+            users, errors = self.facade.import_users(rows)
+        hash_many.assert_called_once()
+        self.assertEqual(len(hash_many.call_args.args[0]), 5)
+        self.assertEqual(len(users), 6)
+        self.assertEqual([index for index, _ in errors], [5, 6, 7])
+        self.assertTrue(self.facade.get_user_by_email('bulk3@example.com').check_password('secret003'))
+        self.assertTrue(self.facade.get_user_by_email('pre@example.com').check_password('secret999'))
+
+    def test_import_users_reports_malformed_rows(self):
+        """Test that rows of the wrong shape are per-row errors, not a crash"""
+        rows = [
+            ['not', 'an', 'object'],
+            {'first_name': 'Num', 'last_name': 'Email', 'email': 12345, 'password': 'secret123'},
+            {'first_name': 'Num', 'last_name': 'Password', 'email': 'num@example.com', 'password': 12345678},
+            {'first_name': 'Good', 'last_name': 'Row', 'email': 'good@example.com', 'password': 'secret123'},
+        ]
+        users, errors = self.facade.import_users(rows)
+        self.assertEqual([user.email for user in users], ['good@example.com'])
+        self.assertEqual(errors, [(0, 'Row must be an object'), (1, 'email must be a string'),
+                                  (2, 'password must be a string')])
+
+    def test_import_users_command(self):
+        """Test the hbnb import-users CLI command"""
+        rows = [{'first_name': 'Cli', 'last_name': 'User', 'email': 'cli@example.com', 'password': 'secret123'}]
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as handle:
+            json.dump(rows, handle)
+            handle.flush()
+            result = self.app.test_cli_runner().invoke(args=['hbnb', 'import-users', handle.name])
+        self.assertIn('Imported 1 users', result.output)
+        self.assertIsNotNone(self.facade.get_user_by_email('cli@example.com'))
+
+
+if __name__ == '__main__':
+    unittest.main()
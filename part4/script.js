@@ -62,29 +62,73 @@ async function loginUser(email, password) {
 }
 
 // Task 3: Index page functionality
-async function fetchPlaces() {
+// List endpoints return one page, { items, next_cursor }; pass the cursor back for the next one
+async function fetchPage(url, what, cursor) {
+  const pageUrl = cursor ? `${url}${url.includes("?") ? "&" : "?"}cursor=${encodeURIComponent(cursor)}` : url;
+  const headers = { "Content-Type": "application/json", ...getAuthHeaders() };
+  const res = await fetch(pageUrl, { headers });
+  
+  if (!res.ok) {
+    throw new Error(`Failed to ${what}: ${res.statusText}`);
+  }
+  
+  return await res.json();
+}
+
+// Show a "Load more" button after the container while there is a next page
+function setupLoadMore(container, nextCursor, loadPage) {
+  let button = container.nextElementSibling;
+  if (!button || !button.classList.contains("load-more")) {
+    button = document.createElement("button");
+    button.type = "button";
+    button.className = "load-more";
+    button.textContent = "Load more";
+    container.after(button);
+  }
+  button.style.display = nextCursor ? "" : "none";
+  button.disabled = false;
+  button.onclick = async () => {
+    button.disabled = true;
+    await loadPage(nextCursor);
+  };
+}
+
+async function fetchPlaces(cursor) {
   try {
-    const url = `${API_BASE}/v1/places/`;
-    const headers = { "Content-Type": "application/json", ...getAuthHeaders() };
-    const res = await fetch(url, { headers });
-    
-    if (!res.ok) {
-      throw new Error(`Failed to fetch places: ${res.statusText}`);
-    }
-    
-    const places = await res.json();
-    return places;
+    return await fetchPage(`${API_BASE}/v1/places/`, "fetch places", cursor);
   } catch (error) {
     console.error("Error fetching places:", error);
-    return [];
+    return { items: [], next_cursor: null };
+  }
+}
+
+async function searchPlaces(filters, cursor) {
+  try {
+    const query = new URLSearchParams(filters).toString();
+    return await fetchPage(`${API_BASE}/v1/places/search?${query}`, "search places", cursor);
+  } catch (error) {
+    console.error("Error searching places:", error);
+    return { items: [], next_cursor: null };
   }
 }
 
-function displayPlaces(places) {
+// Load one page of places, replacing the list for the first page and appending after it
+async function showPlaces(maxPrice, cursor) {
+  const page = maxPrice ? await searchPlaces({ max_price: maxPrice }, cursor) : await fetchPlaces(cursor);
+  displayPlaces(page.items, Boolean(cursor));
+  const placesContainer = document.getElementById("places");
+  if (placesContainer) {
+    setupLoadMore(placesContainer, page.next_cursor, next => showPlaces(maxPrice, next));
+  }
+}
+
+function displayPlaces(places, append = false) {
   const placesContainer = document.getElementById("places");
   if (!placesContainer) return;
   
-  placesContainer.innerHTML = "";
+  if (!append) {
+    placesContainer.innerHTML = "";
+  }
   
   places.forEach(place => {
     const placeCard = document.createElement("article");
@@ -98,7 +142,7 @@ function displayPlaces(places) {
   });
 }
 
-function setupPriceFilter(places) {
+function setupPriceFilter() {
   const priceFilter = document.getElementById("price-filter");
   if (!priceFilter) return;
   
@@ -114,20 +158,9 @@ function setupPriceFilter(places) {
     priceFilter.appendChild(option);
   });
   
+  // Filtering happens server-side so the full catalog never reaches the browser
   priceFilter.addEventListener("change", (event) => {
-    const maxPrice = event.target.value ? parseFloat(event.target.value) : Infinity;
-    const placeCards = document.querySelectorAll(".place-card");
-    
-    placeCards.forEach(card => {
-      const priceText = card.querySelector("p").textContent;
-      const price = parseFloat(priceText.match(/\$(\d+)/)[1]);
-      
-      if (price <= maxPrice) {
-        card.style.display = "block";
-      } else {
-        card.style.display = "none";
-      }
-    });
+    showPlaces(event.target.value);
   });
 }
 
@@ -147,7 +180,7 @@ function checkAuthentication() {
 // Task 4: Place details functionality
 async function fetchPlaceDetails(placeId) {
   try {
-    const url = `${API_BASE}/v1/places/${placeId}`;
+    const url = `${API_BASE}/v1/places/${placeId}/detail`;
     const headers = { "Content-Type": "application/json", ...getAuthHeaders() };
     const res = await fetch(url, { headers });
     
@@ -162,43 +195,23 @@ async function fetchPlaceDetails(placeId) {
   }
 }
 
-async function fetchPlaceReviews(placeId) {
+// Authors come embedded in the page, so rendering it needs no per-review user lookups
+async function fetchPlaceReviews(placeId, cursor) {
   try {
-    const url = `${API_BASE}/v1/reviews/`;
-    const headers = { "Content-Type": "application/json", ...getAuthHeaders() };
-    const res = await fetch(url, { headers });
-    
-    if (!res.ok) {
-      throw new Error(`Failed to fetch reviews: ${res.statusText}`);
-    }
-    
-    const allReviews = await res.json();
-    // Filter reviews for this specific place
-    return allReviews.filter(review => review.place_id === placeId);
+    return await fetchPage(`${API_BASE}/v1/places/${placeId}/reviews?embed=author`, "fetch reviews", cursor);
   } catch (error) {
     console.error("Error fetching reviews:", error);
-    return [];
+    return { items: [], next_cursor: null };
   }
 }
 
-async function fetchUserDetails(userId) {
-  try {
-    const url = `${API_BASE}/v1/users/${userId}`;
-    const headers = { "Content-Type": "application/json", ...getAuthHeaders() };
-    const res = await fetch(url, { headers });
-    
-    if (!res.ok) {
-      return { first_name: "Unknown", last_name: "User" };
-    }
-    
-    return await res.json();
-  } catch (error) {
-    console.error("Error fetching user details:", error);
-    return { first_name: "Unknown", last_name: "User" };
-  }
+async function showMoreReviews(placeId, cursor) {
+  const page = await fetchPlaceReviews(placeId, cursor);
+  displayReviews(page.items, true);
+  setupLoadMore(document.getElementById("reviews"), page.next_cursor, next => showMoreReviews(placeId, next));
 }
 
-async function displayPlaceDetails(place) {
+function displayPlaceDetails(place) {
   if (!place) {
     document.getElementById("place-name").textContent = "Place not found";
     return;
@@ -208,28 +221,44 @@ async function displayPlaceDetails(place) {
   document.getElementById("place-price").textContent = `$${place.price || 0} / night`;
   document.getElementById("place-description").textContent = place.description || "No description available.";
   
-  // Fetch and display host details
-  if (place.owner_id) {
-    const host = await fetchUserDetails(place.owner_id);
-    document.getElementById("place-host").textContent = `${host.first_name} ${host.last_name}`;
+  // Host, amenities and the first page of reviews come embedded in the detail response
+  if (place.owner) {
+    document.getElementById("place-host").textContent = `${place.owner.first_name} ${place.owner.last_name}`;
   } else {
     document.getElementById("place-host").textContent = "Unknown";
   }
   
-  // Fetch and display reviews
-  const reviews = await fetchPlaceReviews(place.id);
-  displayReviews(reviews);
+  const amenitiesContainer = document.getElementById("amenities");
+  if (amenitiesContainer && place.amenities) {
+    amenitiesContainer.innerHTML = "";
+    place.amenities.forEach(amenity => {
+      const badge = document.createElement("span");
+      badge.className = "badge";
+      badge.textContent = amenity.name;
+      amenitiesContainer.appendChild(badge);
+    });
+  }
+  
+  // The detail response embeds the first page of reviews; later pages load on demand
+  const reviews = place.reviews || { items: [], next_cursor: null };
+  displayReviews(reviews.items);
+  const reviewsSection = document.getElementById("reviews");
+  if (reviewsSection) {
+    setupLoadMore(reviewsSection, reviews.next_cursor, next => showMoreReviews(place.id, next));
+  }
 }
 
-function displayReviews(reviews) {
+function displayReviews(reviews, append = false) {
   const reviewsSection = document.getElementById("reviews");
   if (!reviewsSection) return;
   
   // Clear existing reviews
-  const existingReviews = reviewsSection.querySelectorAll(".review-card");
-  existingReviews.forEach(review => review.remove());
+  if (!append) {
+    const existingReviews = reviewsSection.querySelectorAll(".review-card");
+    existingReviews.forEach(review => review.remove());
+  }
   
-  if (reviews.length === 0) {
+  if (reviews.length === 0 && !append) {
     const noReviewsMsg = document.createElement("p");
     noReviewsMsg.textContent = "No reviews yet. Be the first to review this place!";
     noReviewsMsg.style.margin = "20px";
@@ -239,12 +268,12 @@ function displayReviews(reviews) {
   }
   
   // Display each review
-  reviews.forEach(async (review) => {
+  reviews.forEach(review => {
     const reviewCard = document.createElement("article");
     reviewCard.className = "review-card";
     
-    // Fetch user details for the review
-    const user = await fetchUserDetails(review.user_id);
+    // Every review page is fetched with its authors embedded
+    const user = review.author || { first_name: "Unknown", last_name: "User" };
     
     reviewCard.innerHTML = `
       <h4>${review.title || "Review"}</h4>
@@ -374,10 +403,8 @@ onDomReady(() => {
     case "":
       // Task 3: Index page
       checkAuthentication();
-      fetchPlaces().then(places => {
-        displayPlaces(places);
-        setupPriceFilter(places);
-      });
+      showPlaces();
+      setupPriceFilter();
       break;
       
     case "login.html":